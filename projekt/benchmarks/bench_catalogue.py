@@ -0,0 +1,71 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_catalogue [liczba filmów]
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from storage.catalogue_file import BinaryCatalogue, compile_catalogue
+from utils.trigram_index import TrigramIndex
+
+N = 1_000_000
+PAGE = 100
+LOOKUPS = 1_000
+
+
+def write_file(path: str, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(n):
+            movie = {"title": f"Film {i}", "director": "Reżyser", "year": 1950 + i % 75,
+                     "genre": "Dramat", "description": "Opis filmu " * 10,
+                     "comments": [{"user": "admin", "comment": "Dobry", "date": "2024-01-01"}] if i % 10 == 0 else []}
+            f.write(("," if i else "") + json.dumps(movie, ensure_ascii=False, indent=2))
+        f.write("\n]")
+
+
+def measure(label: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms   szczyt pamięci {peak / 2**20:8.1f} MB")
+    return result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    rows = random.Random(1).sample(range(n), min(LOOKUPS, n))
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "movies.json")
+        write_file(json_path, n)
+        compiled = measure("kompilacja do .moviecat (jednorazowo)", lambda: compile_catalogue(json_path))
+        print(f"JSON: {os.path.getsize(json_path) / 2**20:.1f} MB, "
+              f".moviecat: {os.path.getsize(compiled) / 2**20:.1f} MB, {n} filmów\n")
+
+        # dotychczas: cały katalog w pamięci jako lista słowników
+        def json_load():
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        movies = measure("json.load (start)", json_load)
+        measure("lista: pierwsza strona etykiet", lambda: [f"{m['title']} ({m['year']})" for m in movies[:PAGE]])
+        measure(f"lista: {len(rows)} losowych rekordów", lambda: [movies[i]["description"] for i in rows])
+        del movies
+
+        catalogue = measure("BinaryCatalogue (start)", lambda: BinaryCatalogue(compiled))
+        measure("mmap: pierwsza strona etykiet", lambda: [catalogue.label(i) for i in range(min(PAGE, n))])
+        measure(f"mmap: {len(rows)} losowych rekordów", lambda: [catalogue[i]["description"] for i in rows])
+        measure("mmap: wszystkie etykiety", lambda: sum(1 for i in range(n) if catalogue.label(i)))
+        # aktualność zapisanego indeksu trigramów przy starcie
+        measure("skrót: dekodowanie wszystkich rekordów", lambda: TrigramIndex.compute_fingerprint(catalogue))
+        measure("skrót: bajty rekordów (fingerprint)", catalogue.fingerprint)
+        catalogue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_charts
+import time
+from typing import Callable, List
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from managers.movieManager import MovieManager
+from models.movie import Movie
+from utils.charts import Chart, GenreChart, RatingsChart, StatusChart, TopRatedChart
+from utils.stats_aggregator import StatsAggregator
+
+N = 40
+UPDATES = 50
+GENRES = ["Dramat", "Komedia", "Sci-Fi", "Thriller", "Animacja"]
+
+
+def make_manager(n: int) -> MovieManager:
+    manager = MovieManager()
+    for i in range(n):
+        manager.append_movie(Movie(f"Film {i}", "Reżyser", 2000 + i % 20, GENRES[i % len(GENRES)],
+                                   "Obejrzano" if i % 3 else "Do obejrzenia", 1 + i % 10, ""))
+    return manager
+
+
+# dotychczasowe podejście: nowa figura przez pyplot przy każdej aktualizacji
+def rebuild_ratings(stats: StatsAggregator) -> Figure:
+    watched = stats.collection.watched_rated()
+    fig, ax = plt.subplots()
+    ax.barh([m.title for m in watched], [float(m.rating) for m in watched], color="#4CAF50")
+    ax.set_xlabel("Ocena")
+    ax.set_title("Oceny obejrzanych filmów")
+    plt.close(fig)
+    return fig
+
+
+def rebuild_genres(stats: StatsAggregator) -> Figure:
+    count = stats.genre_counts()
+    fig, ax = plt.subplots()
+    ax.pie(count.values(), labels=count.keys(), autopct="%1.1f%%", startangle=140)
+    ax.set_title("Filmy wg gatunku")
+    plt.close(fig)
+    return fig
+
+
+def rebuild_status(stats: StatsAggregator) -> Figure:
+    fig, ax = plt.subplots()
+    ax.bar(["Obejrzane", "Do obejrzenia"], [stats.watched_count(), stats.unwatched_count()],
+           color=["#2196F3", "#FFC107"])
+    ax.set_title("Status filmów")
+    ax.set_ylabel("Liczba filmów")
+    plt.close(fig)
+    return fig
+
+
+def rebuild_top(stats: StatsAggregator) -> Figure:
+    lines = [f"{i + 1}. {m.title} ({m.year}) – {m.rating}/10" for i, m in enumerate(stats.top_rated(3))]
+    fig, ax = plt.subplots(figsize=(6, 3))
+    ax.text(0.5, 0.5, "Top 3 filmy:\n" + "\n".join(lines), ha="center", va="center", fontsize=12,
+            wrap=True, transform=ax.transAxes)
+    ax.axis("off")
+    plt.tight_layout()
+    plt.close(fig)
+    return fig
+
+
+def mutate(manager: MovieManager, step: int) -> None:
+    # zmiana oceny nie zmienia zestawu tytułów ani gatunków - typowa edycja w GUI
+    movie = manager.movies[(step * 7) % len(manager.movies)]
+    manager.update_rating(movie.id, 1 + (step * 3) % 10)
+
+
+def bench(label: str, manager: MovieManager, draw: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    for step in range(UPDATES):
+        mutate(manager, step)
+        draw(step)
+    elapsed = (time.perf_counter() - start) / UPDATES
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms/aktualizację")
+    return elapsed
+
+
+def main() -> None:
+    manager = make_manager(N)
+    stats = manager.stats
+    cases = [
+        ("oceny", rebuild_ratings, RatingsChart),
+        ("gatunki", rebuild_genres, GenreChart),
+        ("status", rebuild_status, StatusChart),
+        ("top 3", rebuild_top, TopRatedChart),
+    ]
+    for name, rebuild, chart_class in cases:
+        def run_rebuild(_step: int) -> None:
+            FigureCanvasAgg(rebuild(stats)).draw()
+
+        charts: List[Chart] = []
+        for blit in (False, True):
+            chart = chart_class(blit=blit)
+            FigureCanvasAgg(chart.figure)
+            chart.update(stats).draw()
+            charts.append(chart)
+
+        old = bench(f"{name} - nowa figura", manager, run_rebuild)
+        reuse = bench(f"{name} - ta sama figura", manager, lambda _step: charts[0].update(stats).draw())
+        blit = bench(f"{name} - ta sama figura + blit", manager, lambda _step: charts[1].update(stats).draw())
+        print(f"przyspieszenie: {old / reuse:.1f}x (z blit: {old / blit:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
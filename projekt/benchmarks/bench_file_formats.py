@@ -0,0 +1,57 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_file_formats [liczba filmów]
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from models.movie import Movie
+from utils.file_operations import FileOperations
+
+N = 200_000
+GENRES = ["Akcja", "Dramat", "Komedia", "Sci-Fi", "Horror"]
+
+
+def make_movies(n: int) -> List[Movie]:
+    movies = []
+    for i in range(n):
+        status = "Obejrzano" if i % 3 else "Do obejrzenia"
+        rating = (i % 10) + 0.5 if i % 4 else None
+        movie = Movie(f"Film {i}", f"Reżyser {i % 500}", 1950 + i % 70, GENRES[i % len(GENRES)], status,
+                      rating, "Opis filmu " * 5, "2024-01-01" if i % 3 else "")
+        if i % 20 == 0:
+            movie.add_comment("admin", "Świetny film")
+        movies.append(movie)
+    return movies
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    movies = make_movies(n)
+    print(f"{n} filmów\n")
+    print(f"{'format':<28} {'rozmiar':>10} {'zapis':>9} {'odczyt':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = [
+            # dotychczasowy zapis: JSON z wcięciami, odczyt całej tablicy i Movie.from_dict
+            ("JSON (indent=2)", "movies.json", FileOperations.save_to_json,
+             lambda path: [Movie.from_dict(data) for data in FileOperations.load_from_json(path)]),
+            ("JSON Lines", "movies.jsonl", FileOperations.save_to_json_lines,
+             lambda path: list(FileOperations.iter_movies_from_json_lines(path))),
+            ("binarny (długość + rekord)", "movies.movies", FileOperations.save_to_binary,
+             lambda path: list(FileOperations.iter_movies_from_binary(path))),
+        ]
+        for label, name, save, load in formats:
+            path = os.path.join(tmp, name)
+            write = timed(lambda: save(movies, path))
+            read = timed(lambda: load(path))
+            print(f"{label:<28} {os.path.getsize(path) / 2**20:8.1f} MB {write:8.2f}s {read:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
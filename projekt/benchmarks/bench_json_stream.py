@@ -0,0 +1,59 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_json_stream
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from utils.json_stream import iter_json_array
+
+N = 200_000
+
+
+def write_file(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(N):
+            movie = {"id": f"id-{i}", "title": f"Film {i}", "director": "Reżyser", "year": 2000,
+                     "genre": "Dramat", "status": "Do obejrzenia", "rating": None,
+                     "description": "Opis filmu " * 10, "watch_date": "", "comments": []}
+            f.write(("," if i else "") + json.dumps(movie, ensure_ascii=False, indent=2))
+        f.write("\n]")
+
+
+def measure(label: str, func) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36} {elapsed:7.2f} s   szczyt pamięci {peak / 2**20:8.1f} MB   wynik: {result}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "movies.json")
+        write_file(path)
+        print(f"plik: {os.path.getsize(path) / 2**20:.1f} MB, {N} rekordów")
+
+        def full_load():
+            with open(path, "r", encoding="utf-8") as f:
+                return len(json.load(f))
+
+        def streamed_count():
+            return sum(1 for _ in iter_json_array(path))
+
+        def streamed_early_exit():
+            for i, record in enumerate(iter_json_array(path)):
+                if record["id"] == "id-1000":
+                    return i
+            return None
+
+        measure("json.load", full_load)
+        measure("iter_json_array (cały plik)", streamed_count)
+        measure("iter_json_array (przerwanie)", streamed_early_exit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_models [liczba filmów]
+# Każdy wariant działa w osobnym procesie, bo szczytowe RSS mierzy się dla całego procesu.
+import json
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+from models.movie import Movie
+
+GENRES = ["Akcja", "Dramat", "Komedia", "Sci-Fi", "Horror", "Thriller", "Animacja"]
+STATUSES = ["Obejrzano", "Do obejrzenia"]
+
+
+class LegacyMovie:
+    # dotychczasowy model: atrybuty w __dict__, bez współdzielenia napisów, lista komentarzy zawsze tworzona
+    def __init__(self, title, director, year, genre, status, rating, description, watch_date=None) -> None:
+        self.id = str(uuid.uuid4())
+        self.title = title
+        self.director = director
+        self.year = year
+        self.genre = genre
+        self.status = status
+        self.rating = float(rating) if rating else rating
+        self.description = description
+        self.watch_date = watch_date or ""
+        self.comments: List[Dict[str, str]] = []
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LegacyMovie":
+        movie = cls(data["title"], data.get("director"), data.get("year", ""), data.get("genre", ""),
+                    data.get("status", ""), data.get("rating", ""), data.get("description", ""),
+                    data.get("watch_date", ""))
+        movie.id = data["id"]
+        movie.comments = data.get("comments", [])
+        return movie
+
+
+def records(n: int):
+    # każdy rekord parsowany osobno, jak przy wczytywaniu z pliku - napisy nie są współdzielone
+    for i in range(n):
+        yield json.loads(json.dumps({
+            "id": str(uuid.UUID(int=i)), "title": f"Film {i}", "director": f"Reżyser {i % 2000}",
+            "year": 1950 + i % 70, "genre": GENRES[i % len(GENRES)], "status": STATUSES[i % 2],
+            "rating": (i % 10) + 0.5 if i % 3 else None, "description": "",
+            "watch_date": "", "comments": []
+        }))
+
+
+def run_variant(variant: str, n: int) -> None:
+    model = Movie if variant == "slotted" else LegacyMovie
+    start = time.perf_counter()
+    movies = [model.from_dict(data) for data in records(n)]
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{variant:<8} {len(movies)} filmów   szczytowe RSS {peak_mb:8.1f} MB   czas {elapsed:6.1f} s")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for variant in ("legacy", "slotted"):
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_models", "--variant", variant, str(n)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
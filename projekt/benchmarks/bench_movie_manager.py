@@ -0,0 +1,78 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_movie_manager
+import time
+from typing import List, Optional
+
+from managers.movieManager import MovieManager
+from models.movie import Movie
+
+N = 100_000
+LOOKUPS = 1_000
+
+
+def make_movies(n: int) -> List[Movie]:
+    movies = []
+    for i in range(n):
+        movie = Movie(f"Film {i}", f"Reżyser {i % 500}", 1950 + i % 70, "Dramat", "Do obejrzenia", None, "")
+        movie.id = f"id-{i}"
+        movies.append(movie)
+    return movies
+
+
+def linear_get_by_id(movies: List[Movie], id: str) -> Optional[Movie]:
+    for movie in movies:
+        if movie.id == id:
+            return movie
+    return None
+
+
+def linear_find_by_title(movies: List[Movie], title: str) -> Optional[Movie]:
+    for movie in movies:
+        if movie.title.lower() == title.lower():
+            return movie
+    return None
+
+
+def bench(label: str, func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    movies = make_movies(N)
+    manager = MovieManager()
+    bench(f"budowa indeksów ({N} filmów)", manager.load_movies, movies)
+
+    step = N // LOOKUPS
+    ids = [f"id-{i}" for i in range(0, N, step)]
+    titles = [f"film {i}" for i in range(0, N, step)]
+
+    def run_linear_ids():
+        for id in ids:
+            linear_get_by_id(movies, id)
+
+    def run_index_ids():
+        for id in ids:
+            manager.get_movie_by_id(id)
+
+    def run_linear_titles():
+        for title in titles:
+            linear_find_by_title(movies, title)
+
+    def run_index_titles():
+        for title in titles:
+            manager.find_movie_by_title(title)
+
+    linear = bench(f"{LOOKUPS}x id - skan liniowy", run_linear_ids)
+    indexed = bench(f"{LOOKUPS}x id - indeks", run_index_ids)
+    print(f"przyspieszenie: {linear / indexed:.0f}x")
+
+    linear = bench(f"{LOOKUPS}x tytuł - skan liniowy", run_linear_titles)
+    indexed = bench(f"{LOOKUPS}x tytuł - indeks", run_index_titles)
+    print(f"przyspieszenie: {linear / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Uruchomienie (z katalogu projekt): python -m benchmarks.bench_storage
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from models.movie import Movie
+from models.user import User
+from storage.base import StorageBackend
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SQLiteStorage
+
+USERS = 200
+MOVIES_PER_USER = 250
+SAVES = 100
+GENRES = ["Akcja", "Dramat", "Komedia", "Sci-Fi", "Horror"]
+
+
+def make_users() -> List[User]:
+    users = []
+    for u in range(USERS):
+        user = User(f"user{u}", "haslo")
+        for i in range(MOVIES_PER_USER):
+            status = "Obejrzano" if i % 3 else "Do obejrzenia"
+            rating = (i % 10) + 0.5 if i % 4 else None
+            user.movies.append(Movie(f"Film {u}-{i}", f"Reżyser {i % 50}", 1950 + i % 70,
+                                     GENRES[i % len(GENRES)], status, rating, "Opis filmu " * 5))
+        users.append(user)
+    return users
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(label: str, make_storage: Callable[[], StorageBackend], users: List[User], saves: int = SAVES) -> None:
+    storage = make_storage()
+    initial = timed(lambda: storage.save_users(users))
+    storage.close()
+
+    storage = make_storage()
+    loaded: List[User] = []
+    load = timed(lambda: loaded.extend(storage.load_users()))
+    user = loaded[0]
+    first_collection = timed(lambda: user.movies)
+
+    def save_many():
+        for movie in user.movies[:saves]:
+            movie.status = "Obejrzano"
+            storage.save_movie(user, movie)
+
+    save_time = timed(save_many)
+    query = timed(lambda: storage.query_movie_ids(user, genre="Akcja", order_by="rating", descending=True))
+    stats = timed(lambda: storage.movie_statistics(user))
+    storage.close()
+    print(f"{label:<16} zapis pełny {initial:9.1f} ms | wczytanie {load:8.1f} ms | "
+          f"kolekcja {first_collection:7.1f} ms | {saves}x zapis filmu {save_time:9.1f} ms | "
+          f"zapytanie {query:6.2f} ms | statystyki {stats:6.2f} ms")
+
+
+def main() -> None:
+    users = make_users()
+    print(f"{USERS} użytkowników x {MOVIES_PER_USER} filmów")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        # zwykły JSON przepisuje cały plik przy każdym zapisie - mierzymy tylko kilka zapisów
+        run("JSON", lambda: JsonStorage(tmp_dir / "plain.json"), users, saves=5)
+        run("JSON + dziennik", lambda: JsonStorage(tmp_dir / "journal.json", use_journal=True), users)
+        run("JSON + podział", lambda: JsonStorage(tmp_dir / "sharded.json", sharded=True), users)
+        run("SQLite", lambda: SQLiteStorage(tmp_dir / "movies.db"), users)
+
+
+if __name__ == "__main__":
+    main()
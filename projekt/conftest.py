@@ -0,0 +1,2 @@
+# pytest dodaje katalog z tym plikiem do sys.path - testy importują moduły (models, storage, utils)
+# tak jak main.py, niezależnie od katalogu, z którego są uruchamiane
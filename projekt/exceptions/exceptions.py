@@ -37,3 +37,15 @@ class InvalidRatingError(Exception):
 class MovieNotSelectedError(Exception):
     "No movie selected"
     pass
+
+class SearchCancelled(Exception):
+    "Search superseded by a newer query"
+    pass
+
+class ExportCancelled(Exception):
+    "Export cancelled by the user"
+    pass
+
+class ImportCancelled(Exception):
+    "Import cancelled by the user"
+    pass
@@ -1,19 +1,36 @@
-import json
 from datetime import date
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import (
-    QWidget, QListWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QWidget, QListWidget, QListView, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QLineEdit, QTextEdit, QMessageBox,
-    QComboBox, QTabWidget, QScrollArea, QGroupBox
+    QComboBox, QTabWidget, QScrollArea, QGroupBox, QProgressBar, QFileDialog, QProgressDialog
 )
 
 from pathlib import Path
 
-from exceptions.exceptions import MovieNotSelectedError
+from exceptions.exceptions import MovieNotSelectedError, WrongFileLoading
+from utils.compression import CODECS
 from utils.file_operations import FileOperations
 from managers.movieManager import MovieManager
-from utils.statistics import Statistics
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from utils.charts import GenreChart, RatingsChart, StatusChart, TopRatedChart
+from utils.events import MovieAdded, MovieChanged, MovieRemoved, MoviesAdded, MoviesReloaded
+from utils.search_engine import SearchEngine
+from storage.comment_log import catalogue_key
+from gui.gui_movie_models import (
+    SORT_RATING, SORT_TITLE, SORT_WATCH_DATE, SORT_YEAR, CatalogueListModel, MovieFilterProxyModel, MovieListModel
+)
+from gui.gui_catalogue_loader import CATALOGUE_PAGE_SIZE, CatalogueLoader
+from gui.gui_export import ExportJob
+from gui.gui_import import ImportJob
+from gui.gui_search import SearchController
+from gui.gui_stats_scheduler import RATINGS, GENRES, STATUS, TOP_RATED, ChartView, StatsRenderScheduler
+
+
+# pola, od których zależy indeks wyszukiwania i wpis w historii
+SEARCH_FIELDS = frozenset(SearchEngine.FIELD_WEIGHTS)
+HISTORY_FIELDS = frozenset(("title", "status", "watch_date"))
+SAMPLE_COMMENTS_PAGE = 20
 
 
 class MainAppWindow(QWidget):
@@ -30,7 +47,16 @@ class MainAppWindow(QWidget):
         layout.addWidget(self.tabs)
         self.setLayout(layout)
 
-        self.filtered_movies = self.user.movies.copy()
+        # zmiany kolekcji idą przez MovieManager, żeby indeksy i kolumny statystyk były aktualne
+        self.movie_manager.load_user(self.user)
+        # lista filmów: model nad kolekcją + filtr/sortowanie; widok tworzy tylko widoczne wiersze
+        self.movie_model = MovieListModel(self.movie_manager.collection, self.movie_manager.sorted_views)
+        self.movie_proxy = MovieFilterProxyModel()
+        self.movie_proxy.setSourceModel(self.movie_model)
+
+        self.user_search = SearchEngine()
+        self.user_search.index_movies(self.user.movies)
+        self.sample_search = SearchEngine()
 
         self.user_tab = QWidget()
         self.init_user_tab()
@@ -48,6 +74,39 @@ class MainAppWindow(QWidget):
         self.init_stats_tab()
         self.tabs.addTab(self.stats_tab, "Statystyki")
 
+        # kilka zdarzeń z jednej akcji (np. status + data) -> jedno przeliczenie wyszukiwania i wykresów
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self.refresh_after_changes)
+
+        # zmiany filmów przychodzą jako zdarzenia - odświeżamy tylko to, czego dotyczą
+        events = self.movie_manager.events
+        if events is not self.user_manager.events:
+            # osobne szyny - zmiany i tak muszą trafić do zapisu
+            self.user_manager.track_movies(events)
+        self._subscriptions = [
+            (MovieAdded, self.on_movie_added),
+            (MovieRemoved, self.on_movie_removed),
+            (MovieChanged, self.on_movie_changed),
+            (MoviesAdded, self.on_movies_added),
+            (MoviesReloaded, self.on_movies_reloaded),
+        ]
+        for event_type, handler in self._subscriptions:
+            events.subscribe(event_type, handler)
+
+    def closeEvent(self, event) -> None:
+        for event_type, handler in self._subscriptions:
+            self.movie_manager.events.unsubscribe(event_type, handler)
+        self.catalogue_loader.stop()
+        if self.export_job is not None:
+            self.export_job.cancel()
+        if self.import_job is not None:
+            self.import_job.cancel()
+        self.user_search_controller.shutdown()
+        self.sample_search_controller.shutdown()
+        super().closeEvent(event)
+
 
     def init_user_tab(self):
         main_layout = QHBoxLayout()
@@ -57,22 +116,28 @@ class MainAppWindow(QWidget):
 
         self.search_input_user = QLineEdit()
         self.search_input_user.setPlaceholderText("Szukaj w mojej kolekcji...")
-        self.search_input_user.textChanged.connect(self.search_user_movies)
+        # wyszukiwanie w tle po krótkiej przerwie w pisaniu; zawęża poprzednie wyniki
+        self.user_search_controller = SearchController(
+            self.search_input_user, self.find_user_movies, self.movie_proxy.set_filter, parent=self
+        )
         left_column.addWidget(self.search_input_user)
 
 
         self.sort_combo_user = QComboBox()
         self.sort_combo_user.addItems(
             ["Sortuj wg: Tytuł A-Z", "Tytuł Z-A", "Rok (rosnąco)", "Rok (malejąco)", "Ocena (rosnąco)",
-             "Ocena (malejąco)"])
+             "Ocena (malejąco)", "Data obejrzenia (najnowsze)", "Data obejrzenia (najstarsze)"])
         self.sort_combo_user.currentIndexChanged.connect(self.sort_user_movies)
         left_column.addWidget(self.sort_combo_user)
         # --------------------
 
-        self.movie_list = QListWidget()
-        self.movie_list.itemClicked.connect(self.show_movie_details)
+        self.movie_list = QListView()
+        self.movie_list.setModel(self.movie_proxy)
+        self.movie_list.setUniformItemSizes(True)
+        self.movie_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.movie_list.clicked.connect(self.show_movie_details)
         self.movie_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 font-size: 13px;
                 padding: 5px;
             }
@@ -144,9 +209,9 @@ class MainAppWindow(QWidget):
             }""")
         right_layout.addWidget(self.edit_film_button)
 
-        self.export_txt_button = QPushButton("📄 Eksportuj do TXT")
-        self.export_txt_button.clicked.connect(self.export_movies_to_txt)
-        self.export_txt_button.setStyleSheet("""
+        self.export_button = QPushButton("📄 Eksportuj filmy")
+        self.export_button.clicked.connect(self.export_movies)
+        self.export_button.setStyleSheet("""
                     QPushButton {
                         background-color: #AB47BC;
                         color: white;
@@ -158,7 +223,25 @@ class MainAppWindow(QWidget):
                         QPushButton:hover {
                         background-color: #9C27B0;
                     }""")
-        right_layout.addWidget(self.export_txt_button)
+        right_layout.addWidget(self.export_button)
+        self.export_job = None
+        self.import_job = None
+
+        self.import_button = QPushButton("📥 Importuj filmy")
+        self.import_button.clicked.connect(self.import_movies_from_file)
+        self.import_button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #26A69A;
+                        color: white;
+                        font-weight: bold;
+                        border: none;
+                        padding: 10px;
+                        border-radius: 5px;
+                        }
+                        QPushButton:hover {
+                        background-color: #00897B;
+                    }""")
+        right_layout.addWidget(self.import_button)
 
         self.delete_film_button = QPushButton("🗑️ Usuń film")
         self.delete_film_button.clicked.connect(self.delete_selected_movie)
@@ -178,7 +261,6 @@ class MainAppWindow(QWidget):
         right_layout.addWidget(self.delete_film_button)
 
         main_layout.addLayout(right_layout, 2)
-        self.load_user_movies()
 
     def init_history_tab(self) -> None:
         layout = QVBoxLayout()
@@ -213,32 +295,161 @@ class MainAppWindow(QWidget):
 
     def load_history(self) -> None:
         self.history_list.clear()
+        self._history_items = {}
         for movie in self.user.movies:
-            if movie.status == "Obejrzano" and movie.watch_date:
-                self.history_list.addItem(f"{movie.title} – {movie.watch_date}")
+            self.sync_history(movie)
+
+    def sync_history(self, movie, removed: bool = False) -> None:
+        # dodaje, poprawia albo usuwa jeden wpis historii zamiast budować listę od nowa
+        item = self._history_items.get(movie.id)
+        if removed or not (movie.status == "Obejrzano" and movie.watch_date):
+            if item is not None:
+                self.history_list.takeItem(self.history_list.row(item))
+                del self._history_items[movie.id]
+            return
+        text = f"{movie.title} – {movie.watch_date}"
+        if item is None:
+            self.history_list.addItem(text)
+            self._history_items[movie.id] = self.history_list.item(self.history_list.count() - 1)
+        else:
+            item.setText(text)
+
+    def on_movie_added(self, event: MovieAdded) -> None:
+        self.user_search.add_movie(event.movie)
+        self.sync_history(event.movie)
+        self._refresh_timer.start()
+
+    def on_movies_added(self, event: MoviesAdded) -> None:
+        self.user_search.index_movies(event.movies)
+        for movie in event.movies:
+            self.sync_history(movie)
+        self._refresh_timer.start()
+
+    def on_movie_removed(self, event: MovieRemoved) -> None:
+        self.user_search.remove_movie(event.movie)
+        self.sync_history(event.movie, removed=True)
+        self._refresh_timer.start()
+
+    def on_movie_changed(self, event: MovieChanged) -> None:
+        if SEARCH_FIELDS.intersection(event.fields):
+            self.user_search.update_movie(event.movie)
+        if HISTORY_FIELDS.intersection(event.fields):
+            self.sync_history(event.movie)
+        self._refresh_timer.start()
+
+    def on_movies_reloaded(self, event: MoviesReloaded) -> None:
+        # cała kolekcja od nowa - jedyny przypadek pełnego odświeżenia
+        self.user_search.clear()
+        self.user_search.index_movies(event.movies)
+        self.load_history()
+        self._refresh_timer.start()
 
-    def search_user_movies(self, text):
-        text = text.strip().lower()
-        self.filtered_movies = [movie for movie in self.user.movies if text in movie.title.lower()]
-        self.update_movie_list_widget()
+    def refresh_after_changes(self) -> None:
+        self.refresh_user_search()
+        self.update_stats()
 
-    def load_user_movies(self):
-        self.filtered_movies = self.user.movies.copy()
-        self.update_movie_list_widget()
+    def find_user_movies(self, text, within=None, cancelled=None):
+        return self.user_search.search(text, within=within, cancelled=cancelled)
+
+    def refresh_user_search(self) -> None:
+        # wyniki wyszukiwania zależą od treści filmów - po dodaniu/edycji liczymy je od nowa
+        self.user_search_controller.refresh()
+
+    def selected_movie(self):
+        index = self.movie_list.currentIndex()
+        if not index.isValid():
+            return None
+        return self.movie_proxy.item(index.row())
+
+    def export_filters(self) -> str:
+        # kompresja wg rozszerzenia pliku; .zst tylko z zainstalowanym pakietem zstandard
+        suffixes = [""] + [codec.suffix for codec in CODECS.values() if codec.suffix]
+        return ";;".join(
+            f"{kind.upper()}{f' ({suffix[1:]})' if suffix else ''} (*.{kind}{suffix})"
+            for kind in ("txt", "csv") for suffix in suffixes
+        )
 
-    def export_movies_to_txt(self) -> None:
-        try:
-            filename = f"moje_filmy_{self.user.username}.txt"
-            FileOperations.export_to_txt(self.user.movies, filename)
-            QMessageBox.information(self, "Sukces", f"Filmy wyeksportowano do pliku: {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd", f"Nie udało się wyeksportować: {str(e)}")
-
-    def show_movie_details(self, item):
-        index = self.movie_list.row(item)
-        if index < 0 or index >= len(self.filtered_movies):
+    def export_movies(self) -> None:
+        if self.export_job is not None and self.export_job.is_running():
+            QMessageBox.information(self, "Eksport", "Eksport jest już w toku.")
+            return
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Eksportuj filmy", f"moje_filmy_{self.user.username}.txt", self.export_filters()
+        )
+        if not filename:
             return
-        movie = self.filtered_movies[index]
+        is_csv = ".csv" in Path(filename).suffixes
+        exporter = FileOperations.export_to_csv if is_csv else FileOperations.export_to_txt
+        self.start_export(exporter, Path(filename))
+
+    def start_export(self, exporter, filename: Path) -> ExportJob:
+        # zapis w wątku w tle; okno postępu pojawia się tylko przy dłuższym eksporcie
+        job = self.export_job = ExportJob(exporter, self.user.movies, filename, parent=self)
+        dialog = QProgressDialog("Eksportowanie filmów...", "Anuluj", 0, max(len(job), 1), self)
+        dialog.setWindowTitle("Eksport")
+        dialog.setMinimumDuration(500)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(job.cancel)
+        job.progress.connect(dialog.setValue)
+        job.finished.connect(lambda path: self.on_export_finished(dialog, path))
+        job.failed.connect(lambda message: self.on_export_failed(dialog, message))
+        job.cancelled.connect(dialog.close)
+        job.start()
+        return job
+
+    def on_export_finished(self, dialog: QProgressDialog, path) -> None:
+        dialog.close()
+        QMessageBox.information(self, "Sukces", f"Filmy wyeksportowano do pliku: {path}")
+
+    def on_export_failed(self, dialog: QProgressDialog, message: str) -> None:
+        dialog.close()
+        QMessageBox.critical(self, "Błąd", f"Nie udało się wyeksportować: {message}")
+
+    def import_movies_from_file(self) -> None:
+        if self.import_job is not None and self.import_job.is_running():
+            QMessageBox.information(self, "Import", "Import jest już w toku.")
+            return
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Importuj filmy", "", "Filmy (*.csv *.json *.jsonl *.ndjson)"
+        )
+        if not filename:
+            return
+        self.start_import(filename)
+
+    def start_import(self, filename: str) -> ImportJob:
+        # plik czytany i sprawdzany w wątku w tle, do kolekcji trafia jedną paczką po zakończeniu
+        job = self.import_job = ImportJob(MovieManager.read_import_file, filename, parent=self)
+        dialog = QProgressDialog("Wczytywanie pliku...", "Anuluj", 0, 0, self)
+        dialog.setWindowTitle("Import")
+        dialog.setMinimumDuration(500)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(job.cancel)
+        job.progress.connect(lambda read: dialog.setLabelText(f"Wczytano rekordów: {read}"))
+        job.finished.connect(lambda movies, invalid: self.on_import_finished(dialog, movies, invalid))
+        job.failed.connect(lambda message: self.on_import_failed(dialog, message))
+        job.cancelled.connect(dialog.close)
+        job.start()
+        return job
+
+    def on_import_finished(self, dialog: QProgressDialog, movies, invalid: int) -> None:
+        dialog.close()
+        report = self.movie_manager.add_movies(movies)
+        QMessageBox.information(
+            self, "Import",
+            f"Dodano filmów: {report.added}\nPominięte duplikaty: {report.duplicates}\n"
+            f"Błędne rekordy: {report.invalid + invalid}"
+        )
+
+    def on_import_failed(self, dialog: QProgressDialog, message: str) -> None:
+        dialog.close()
+        QMessageBox.critical(self, "Błąd", f"Nie udało się zaimportować: {message}")
+
+    def show_movie_details(self, index):
+        if not index.isValid():
+            return
+        movie = self.movie_proxy.item(index.row())
 
         if movie.status.lower() == "watched":
             pass
@@ -256,7 +467,6 @@ class MainAppWindow(QWidget):
             f"</div>"
         )
         self.details_label.setText(text)
-        self.update_stats()
 
     def open_add_movie_dialog(self):
         from gui.gui_add_movie import AddMovieWindow
@@ -265,33 +475,24 @@ class MainAppWindow(QWidget):
         if dialog.exec():
             new_movie = dialog.get_movie()
             if new_movie:
-                self.user.movies.append(new_movie)
-                self.user_manager.save_users()
-                self.load_user_movies()
-                self.update_stats()
+                self.movie_manager.append_movie(new_movie)
 
     def open_edit_movie_dialog(self):
-        index = self.movie_list.currentRow()
+        movie = self.selected_movie()
         try:
-            if index == -1:
+            if movie is None:
                 raise MovieNotSelectedError()
         except MovieNotSelectedError:
             QMessageBox.warning(self, "Błąd", "Wybierz film do edycji.")
             return
 
-        movie = self.filtered_movies[index]
         from gui.gui_edit_movie import EditMovieWindow
 
         dialog = EditMovieWindow(self, movie)
         if dialog.exec():
             updated_movie = dialog.get_updated_movie()
 
-            original_index = self.user.movies.index(movie)
-            self.user.movies[original_index] = updated_movie
-
-            self.user_manager.save_users()
-            self.load_user_movies()
-            self.update_stats()
+            self.movie_manager.replace_movie(updated_movie)
 
     def init_sample_tab(self):
         main_layout = QVBoxLayout()
@@ -299,25 +500,39 @@ class MainAppWindow(QWidget):
 
         self.search_input_sample = QLineEdit()
         self.search_input_sample.setPlaceholderText("Szukaj w bazie filmów...")
-        self.search_input_sample.textChanged.connect(self.search_sample_movies)
+        self.sample_search_controller = SearchController(
+            self.search_input_sample, self.find_sample_movies, self.sample_proxy_filter, parent=self
+        )
         main_layout.addWidget(self.search_input_sample)
 
+        # katalog wczytuje się w tle - pasek znika, gdy indeks wyszukiwania jest gotowy
+        self.sample_progress = QProgressBar()
+        self.sample_progress.setRange(0, 0)
+        self.sample_progress.setFormat("Wczytywanie katalogu...")
+        self.sample_progress.setTextVisible(True)
+        main_layout.addWidget(self.sample_progress)
+
         content_layout = QHBoxLayout()
         main_layout.addLayout(content_layout)
 
-        self.sample_list = QListWidget()
-        self.sample_list.itemClicked.connect(self.show_sample_movie_details)
+        self.sample_list = QListView()
+        self.sample_list.setUniformItemSizes(True)
+        self.sample_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.sample_list.clicked.connect(self.show_sample_movie_details)
         content_layout.addWidget(self.sample_list, 1)
 
         right_panel = QVBoxLayout()
 
         self.sample_details_label = QLabel("Wybierz film z listy, by zobaczyć szczegóły.")
         self.sample_details_label.setWordWrap(True)
+        self.sample_details_label.linkActivated.connect(self.show_more_sample_comments)
         right_panel.addWidget(self.sample_details_label)
 
         self.sample_comment_edit = QTextEdit()
         self.add_comment_button = QPushButton("💬 Dodaj komentarz")
         self.add_comment_button.clicked.connect(self.add_sample_comment)
+        # komentarze trafiają do pliku komentarzy (CommentLog) - wystarczy, że katalog jest otwarty
+        self.add_comment_button.setEnabled(False)
         right_panel.addWidget(self.add_comment_button)
 
         right_panel.addWidget(self.sample_comment_edit)
@@ -326,6 +541,7 @@ class MainAppWindow(QWidget):
 
         self.add_sample_button = QPushButton("Dodaj wybrany film do moich")
         self.add_sample_button.clicked.connect(self.add_selected_sample)
+        self.add_sample_button.setEnabled(False)
         right_panel.addWidget(self.add_sample_button)
 
         content_layout.addLayout(right_panel, 2)
@@ -333,15 +549,58 @@ class MainAppWindow(QWidget):
         base_dir = Path(__file__).resolve().parent.parent
         self.sample_file = base_dir / "data" / "sample_movies.json"
 
-        with self.sample_file.open("r", encoding="utf-8") as f:
-            self.sample_movies = json.load(f)
+        self.sample_movies = []
+        self.sample_comments = None
+        self.sample_details_row = -1
+        self.sample_comments_shown = SAMPLE_COMMENTS_PAGE
+        self.sample_model = CatalogueListModel((), CATALOGUE_PAGE_SIZE)
+        self.sample_proxy = MovieFilterProxyModel()
+        self.sample_proxy.setSourceModel(self.sample_model)
+        self.sample_list.setModel(self.sample_proxy)
+
+        self.sample_trigrams = None
+        self.catalogue_loader = CatalogueLoader(self.sample_file, self.sample_search, CATALOGUE_PAGE_SIZE, parent=self)
+        self.catalogue_loader.opened.connect(self.on_catalogue_opened)
+        self.catalogue_loader.progress.connect(self.on_catalogue_progress)
+        self.catalogue_loader.finished.connect(self.on_catalogue_loaded)
+        self.catalogue_loader.failed.connect(self.on_catalogue_failed)
+        self.catalogue_loader.start()
+
+    def on_catalogue_opened(self, catalogue, comments) -> None:
+        # lista tytułów jest gotowa od razu, wyszukiwanie dochodzi w miarę indeksowania
+        self.sample_movies = catalogue
+        self.sample_comments = comments
+        self.sample_model.set_movies(catalogue)
+        self.add_comment_button.setEnabled(True)
+
+    def on_catalogue_progress(self, count: int) -> None:
+        self.sample_progress.setFormat(f"Indeksowanie katalogu... {count} filmów")
+        # wyniki wyszukiwania wpisanego w trakcie wczytywania uzupełniamy o nowe strony
+        self.sample_search_controller.refresh()
+
+    def on_catalogue_loaded(self, trigrams) -> None:
+        self.sample_trigrams = trigrams
+        self.sample_progress.hide()
+        self.add_sample_button.setEnabled(True)
+        self.sample_search_controller.refresh()
+
+    def on_catalogue_failed(self, message: str) -> None:
+        self.sample_progress.hide()
+        QMessageBox.critical(self, "Błąd", message)
+
+    def show_sample_movie_details(self, index):
+        if not index.isValid():
+            return
+        self.sample_details_row = self.sample_proxy.mapToSource(index).row()
+        self.sample_comments_shown = SAMPLE_COMMENTS_PAGE
+        self.render_sample_details()
 
-        for movie in self.sample_movies:
-            self.sample_list.addItem(f"{movie['title']} ({movie['year']})")
+    def show_more_sample_comments(self, _link: str = "") -> None:
+        self.sample_comments_shown += SAMPLE_COMMENTS_PAGE
+        self.render_sample_details()
 
-    def show_sample_movie_details(self, item):
-        index = self.sample_list.row(item)
-        movie = self.sample_movies[index]
+    def render_sample_details(self) -> None:
+        movie = self.sample_movies[self.sample_details_row]
 
         text = (
             f"<h3>{movie['title']} ({movie['year']})</h3>"
@@ -353,7 +612,12 @@ class MainAppWindow(QWidget):
             f"<b>Komentarze użytkowników:</b><br>"
         )
 
-        comments = movie.get("comments", [])
+        # z pliku komentarzy czytamy tylko pokazywaną część
+        try:
+            comments, total = self.sample_comments.page(movie, 0, self.sample_comments_shown)
+        except WrongFileLoading as e:
+            self.sample_details_label.setText(text + f"<i>{e}</i>")
+            return
         if comments:
             text += "<ul style='padding-left: 15px;'>"
             for c in comments:
@@ -362,26 +626,45 @@ class MainAppWindow(QWidget):
                 comment = c.get("comment", "")
                 text += f"<li><b>{user}</b> ({date}): {comment}</li>"
             text += "</ul>"
+            if total > len(comments):
+                text += f"<a href='more'>Pokaż kolejne komentarze ({total - len(comments)})</a>"
         else:
             text += "<i>Brak komentarzy.</i>"
 
         self.sample_details_label.setText(text)
 
-    def search_sample_movies(self, text):
-        text = text.strip().lower()
-        self.sample_list.clear()
-
-        for movie in self.sample_movies:
-            if text in movie["title"].lower():
-                self.sample_list.addItem(f"{movie['title']} ({movie['year']})")
+    def find_sample_movies(self, text, within=None, cancelled=None):
+        results = self.sample_search.search(text, within=within, cancelled=cancelled)
+
+        # dopisujemy wyniki przybliżone (literówki w tytule lub nazwisku reżysera);
+        # nie zawężają się razem z zapytaniem, więc zawsze liczone na całym indeksie
+        if len(text.strip()) >= 3 and self.sample_trigrams is not None:
+            found = set(results)
+            for index, _score in self.sample_trigrams.search(text):
+                if index not in found:
+                    results.append(index)
+        return results
+
+    def sample_proxy_filter(self, results) -> None:
+        # trafienia mogą leżeć na stronach, których widok jeszcze nie pobrał
+        if results:
+            self.sample_model.fetch_until(max(results))
+        self.sample_proxy.set_filter(results)
+
+    def selected_sample_index(self) -> int:
+        # numer filmu w katalogu (sample_movies) zaznaczonego na liście, -1 gdy brak
+        index = self.sample_list.currentIndex()
+        if not index.isValid():
+            return -1
+        return self.sample_proxy.mapToSource(index).row()
 
     def add_selected_sample(self):
-        index = self.sample_list.currentRow()
-        if index == -1:
+        sample_index = self.selected_sample_index()
+        if sample_index == -1:
             QMessageBox.warning(self, "Błąd", "Wybierz film z listy!")
             return
 
-        movie_data = self.sample_movies[index]
+        movie_data = self.sample_movies[sample_index]
 
         if any(m.title == movie_data["title"] and m.year == movie_data["year"] for m in self.user.movies):
             QMessageBox.information(self, "Uwaga", "Ten film już znajduje się na Twojej liście!")
@@ -389,16 +672,9 @@ class MainAppWindow(QWidget):
 
 
         comment_text = self.sample_comment_edit.toPlainText().strip()
-        if comment_text:
-            comment_entry = {
-                "user": self.user.username,
-                "comment": comment_text,
-                "date": str(date.today())
-            }
-            movie_data.setdefault("comments", []).append(comment_entry)
-
-            with self.sample_file.open("w", encoding="utf-8") as f:
-                json.dump(self.sample_movies, f, indent=2, ensure_ascii=False)
+        # nieudany zapis komentarza przerywa dodawanie - tekst zostaje w polu do ponownej próby
+        if comment_text and not self.store_sample_comment(sample_index, movie_data, comment_text):
+            return
 
         from models.movie import Movie
 
@@ -412,70 +688,64 @@ class MainAppWindow(QWidget):
             description=movie_data["description"],
             watch_date=movie_data.get("watch_date")
         )
-        movie.comments = movie_data.get("comments", [])
+        try:
+            movie.comments = self.sample_comments.page(movie_data)[0]
+        except WrongFileLoading as e:
+            QMessageBox.critical(self, "Błąd", str(e))
+            return
 
-        self.user.movies.append(movie)
-        self.user_manager.save_users()
-        self.load_user_movies()
+        self.movie_manager.append_movie(movie)
 
         QMessageBox.information(self, "Dodano", f"Film '{movie.title}' został dodany do Twojej listy.")
         self.sample_comment_edit.clear()
 
-        self.update_stats()
-
     def init_stats_tab(self):
         self.stats_tab_layout = QVBoxLayout()
         self.stats_tabs = QTabWidget()
         self.stats_tab.setLayout(self.stats_tab_layout)
         self.stats_tab_layout.addWidget(self.stats_tabs)
+        # wykresy rysowane leniwie: dopiero gdy ich zakładka jest widoczna i dane się zmieniły
+        self.stats_scheduler = StatsRenderScheduler(self.tabs, self.stats_tab, self.stats_tabs, self.movie_manager.stats)
 
         # Oceny obejrzanych
         self.ratings_widget = QWidget()
         self.ratings_layout = QVBoxLayout(self.ratings_widget)
-        self.canvas_ratings = FigureCanvas(Statistics.plot_ratings_per_movie(self.user))
+        self.canvas_ratings = ChartView()
         self.ratings_layout.addWidget(self.canvas_ratings)
+        self.stats_scheduler.register(RATINGS, self.ratings_widget, self.canvas_ratings, RatingsChart)
         self.stats_tabs.addTab(self.ratings_widget, "Oceny obejrzanych")
 
         # Gatunki
         self.genre_widget = QWidget()
         self.genre_layout = QVBoxLayout(self.genre_widget)
-        self.canvas_genre = FigureCanvas(Statistics.plot_movies_by_genre(self.user))
+        self.canvas_genre = ChartView()
         self.genre_layout.addWidget(self.canvas_genre)
+        self.stats_scheduler.register(GENRES, self.genre_widget, self.canvas_genre, GenreChart)
         self.stats_tabs.addTab(self.genre_widget, "Gatunki")
 
         # Nowy: Status obejrzenia
         self.status_widget = QWidget()
         self.status_layout = QVBoxLayout(self.status_widget)
-        self.canvas_status = FigureCanvas(Statistics.plot_watched_vs_unwatched(self.user))
+        self.canvas_status = ChartView()
         self.status_layout.addWidget(self.canvas_status)
+        self.stats_scheduler.register(STATUS, self.status_widget, self.canvas_status, StatusChart)
         self.stats_tabs.addTab(self.status_widget, "Obejrzane vs. nie")
 
         # Tekst: Najlepszy film
         self.best_widget = QWidget()
         self.best_layout = QVBoxLayout(self.best_widget)
-        self.canvas_best = FigureCanvas(Statistics.plot_top_rated_text(self.user))
+        self.canvas_best = ChartView()
         self.best_layout.addWidget(self.canvas_best)
+        self.stats_scheduler.register(TOP_RATED, self.best_widget, self.canvas_best, TopRatedChart)
         self.stats_tabs.addTab(self.best_widget, "Top 3 filmy")
 
     def update_stats(self):
-        self.canvas_ratings.figure = Statistics.plot_ratings_per_movie(self.user)
-        self.canvas_ratings.draw()
-
-        self.canvas_genre.figure = Statistics.plot_movies_by_genre(self.user)
-        self.canvas_genre.draw()
-
-        self.canvas_status.figure = Statistics.plot_watched_vs_unwatched(self.user)
-        self.canvas_status.draw()
-
-        self.canvas_best.figure = Statistics.plot_top_rated_text(self.user)
-        self.canvas_best.draw()
-
-        self.load_history()
+        self.stats_scheduler.render_visible()
 
     def delete_selected_movie(self):
-        index = self.movie_list.currentRow()
+        movie = self.selected_movie()
         try:
-            if index == -1:
+            if movie is None:
                 raise MovieNotSelectedError()
         except MovieNotSelectedError:
             QMessageBox.warning(self, "Błąd", "Nie wybrano żadnego filmu do usunięcia.")
@@ -489,16 +759,12 @@ class MainAppWindow(QWidget):
         )
 
         if confirm == QMessageBox.StandardButton.Yes:
-            movie = self.user.movies[index]
-            del self.user.movies[index]
-            self.user_manager.save_users()
-            self.load_user_movies()
+            self.movie_manager.delete_movie(movie.id)
             self.details_label.setText("Wybierz film z listy")
-            self.update_stats()
 
     def add_sample_comment(self):
-        index = self.sample_list.currentRow()
-        if index == -1:
+        sample_index = self.selected_sample_index()
+        if sample_index == -1:
             QMessageBox.warning(self, "Błąd", "Wybierz film, do którego chcesz dodać komentarz.")
             return
 
@@ -507,66 +773,62 @@ class MainAppWindow(QWidget):
             QMessageBox.warning(self, "Błąd", "Komentarz nie może być pusty.")
             return
 
-        movie_data = self.sample_movies[index]
+        if not self.store_sample_comment(sample_index, self.sample_movies[sample_index], comment_text):
+            return
+
+        self.sample_comment_edit.clear()
+        self.show_sample_movie_details(self.sample_list.currentIndex())
+        QMessageBox.information(self, "Sukces", "Komentarz został dodany.")
+
+    def store_sample_comment(self, sample_index: int, movie_data, comment_text: str) -> bool:
+        # komentarz trafia na koniec pliku komentarzy - katalog zostaje nietknięty
         comment_entry = {
             "user": self.user.username,
             "comment": comment_text,
             "date": str(date.today())
         }
-
-        movie_data.setdefault("comments", []).append(comment_entry)
-
-        with self.sample_file.open("w", encoding="utf-8") as f:
-            json.dump(self.sample_movies, f, indent=2, ensure_ascii=False)
-
-        self.sample_comment_edit.clear()
-        self.show_sample_movie_details(self.sample_list.item(index))
-        QMessageBox.information(self, "Sukces", "Komentarz został dodany.")
+        try:
+            self.sample_comments.append(catalogue_key(movie_data), comment_entry)
+            fields = SearchEngine.sample_fields(self.sample_comments.merged(movie_data))
+        except WrongFileLoading as e:
+            QMessageBox.critical(self, "Błąd", str(e))
+            return False
+        self.sample_search.update(sample_index, fields)
+        self.sample_search_controller.refresh()
+        return True
+
+    SORT_OPTIONS = {
+        "Tytuł A-Z": (SORT_TITLE, False),
+        "Tytuł Z-A": (SORT_TITLE, True),
+        "Rok (rosnąco)": (SORT_YEAR, False),
+        "Rok (malejąco)": (SORT_YEAR, True),
+        "Ocena (rosnąco)": (SORT_RATING, False),
+        "Ocena (malejąco)": (SORT_RATING, True),
+        "Data obejrzenia (najnowsze)": (SORT_WATCH_DATE, True),
+        "Data obejrzenia (najstarsze)": (SORT_WATCH_DATE, False),
+    }
 
     def sort_user_movies(self):
-        current = self.sort_combo_user.currentText()
-
-        if current == "Tytuł A-Z":
-            self.filtered_movies.sort(key=lambda m: m.title.lower())
-        elif current == "Tytuł Z-A":
-            self.filtered_movies.sort(key=lambda m: m.title.lower(), reverse=True)
-        elif current == "Rok (rosnąco)":
-            self.filtered_movies.sort(key=lambda m: m.year)
-        elif current == "Rok (malejąco)":
-            self.filtered_movies.sort(key=lambda m: m.year, reverse=True)
-        elif current == "Ocena (rosnąco)":
-            self.filtered_movies.sort(key=lambda m: float(m.rating) if m.rating is not None else -1)
-        elif current == "Ocena (malejąco)":
-            self.filtered_movies.sort(key=lambda m: float(m.rating) if m.rating is not None else -1, reverse=True)
-
-        self.update_movie_list_widget()
-
-    def update_movie_list_widget(self):
-        self.movie_list.clear()
-        for movie in self.filtered_movies:
-            self.movie_list.addItem(f"{movie.title} ({movie.year})")
+        option = self.SORT_OPTIONS.get(self.sort_combo_user.currentText())
+        if option is not None:
+            self.movie_proxy.set_sort(*option)
 
     def toggle_movie_status(self, link: str) -> None:
-        index = self.movie_list.currentRow()
+        movie = self.selected_movie()
         try:
-            if index == -1:
+            if movie is None:
                 raise MovieNotSelectedError()
         except MovieNotSelectedError:
             QMessageBox.warning(self, "Błąd", "Najpierw wybierz film z listy.")
             return
 
-        movie = self.user.movies[index]
-
         if movie.status == "Do obejrzenia":
-            movie.status = "Obejrzano"
-            movie.watch_date = date.today().isoformat()
+            self.movie_manager.update_status(movie.id, "Obejrzano")
+            self.movie_manager.update_watch_date(movie.id, date.today().isoformat())
         else:
-            movie.status = "Do obejrzenia"
-            movie.watch_date = ""
+            self.movie_manager.update_status(movie.id, "Do obejrzenia")
+            self.movie_manager.update_watch_date(movie.id, "")
 
-        self.user_manager.save_users()
-        self.load_user_movies()
-        self.show_movie_details(self.movie_list.item(index))
-        self.update_stats()
+        self.show_movie_details(self.movie_list.currentIndex())
 
 
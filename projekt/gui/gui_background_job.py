@@ -0,0 +1,107 @@
+import queue
+import threading
+from typing import Any, Optional, Tuple, Type
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+PROGRESS = "progress"
+FINISHED = "finished"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+# Wspólna część zadań w tle (ImportJob, ExportJob, CatalogueLoader): wątek roboczy wrzuca
+# komunikaty (rodzaj, wartość) do kolejki, a wątek GUI opróżnia ją timerem i emituje sygnały
+# już u siebie. (Sygnały emitowane bezpośrednio z wątku roboczego PySide6 obsługuje niestabilnie
+# przy tysiącach wywołań, kolejka tego unika i nie zalewa pętli zdarzeń.)
+# Podklasa implementuje _work (wątek roboczy) i deklaruje sygnał finished z własnymi argumentami.
+class BackgroundJob(QObject):
+    progress = Signal(int)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    thread_name: str = "background-job"
+    poll_ms: int = 50
+    # wyjątek, którym _work sygnalizuje przerwanie po cancel()
+    cancel_error: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.poll_ms)
+        self._timer.timeout.connect(self._drain)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._timer.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    # --- wątek roboczy ---
+
+    def _work(self) -> Any:
+        raise NotImplementedError
+
+    def _put(self, kind: str, value: Any) -> None:
+        self._queue.put((kind, value))
+
+    def _report_progress(self, done: int) -> None:
+        self._put(PROGRESS, done)
+
+    def _failure_message(self, error: Exception) -> str:
+        return str(error)
+
+    def _run(self) -> None:
+        try:
+            result = self._work()
+        except self.cancel_error:
+            self._put(CANCELLED, None)
+        except Exception as e:
+            # każdy błąd kończy zadanie - GUI nie może czekać na wątek, który już nie działa
+            self._put(FAILED, self._failure_message(e))
+        else:
+            self._put(FINISHED, result)
+
+    # --- wątek GUI ---
+
+    def _emit_finished(self, result: Any) -> None:
+        self.finished.emit(result)
+
+    def _emit_message(self, kind: str, value: Any) -> None:
+        # komunikaty pośrednie inne niż postęp (np. CatalogueLoader.opened) - w kolejności nadejścia
+        raise ValueError(f"Nieznany komunikat zadania: {kind}")
+
+    def _drain(self) -> None:
+        # z kilku komunikatów postępu emitowany jest tylko ostatni
+        progress = None
+        done = None
+        while done is None:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == PROGRESS:
+                progress = value
+            elif kind in (FINISHED, FAILED, CANCELLED):
+                done = (kind, value)
+            else:
+                self._emit_message(kind, value)
+
+        if progress is not None:
+            self.progress.emit(progress)
+        if done is not None:
+            self._timer.stop()
+            kind, value = done
+            if kind == FINISHED:
+                self._emit_finished(value)
+            elif kind == CANCELLED:
+                self.cancelled.emit()
+            else:
+                self.failed.emit(value)
@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Any, Optional
+
+from PySide6.QtCore import Signal
+
+from gui.gui_background_job import BackgroundJob
+from storage.catalogue_file import BinaryCatalogue
+from storage.comment_log import CommentLog, comment_log_path_for
+from utils.search_engine import SearchEngine
+from utils.trigram_index import TrigramIndex
+
+CATALOGUE_PAGE_SIZE = 100
+CATALOGUE_POLL_MS = 15
+
+_OPENED = "opened"
+
+
+# Otwiera katalog filmów w wątku w tle: skompilowany plik .moviecat (przy pierwszym
+# uruchomieniu albo po zmianie JSON-a kompilowany strumieniowo) i indeks komentarzy trafiają
+# do GUI od razu, a potem stronami powstaje indeks wyszukiwania (progress - liczba zaindeksowanych filmów).
+class CatalogueLoader(BackgroundJob):
+    opened = Signal(object, object)    # BinaryCatalogue, CommentLog - lista może się już pokazać
+    finished = Signal(object)          # TrigramIndex
+
+    thread_name = "catalogue-loader"
+    poll_ms = CATALOGUE_POLL_MS
+
+    def __init__(self, catalogue_file: Path, search: SearchEngine, page_size: int = CATALOGUE_PAGE_SIZE,
+                 parent=None) -> None:
+        self.catalogue_file = catalogue_file
+        self.search = search
+        self.page_size = page_size
+        super().__init__(parent)
+
+    def stop(self) -> None:
+        # zamknięcie okna - wynik nie jest już potrzebny, więc kolejka nie jest dalej opróżniana
+        self.cancel()
+        self._timer.stop()
+
+    # --- wątek roboczy ---
+
+    def _work(self) -> Optional[TrigramIndex]:
+        catalogue = BinaryCatalogue.open_for(self.catalogue_file)
+        comments = CommentLog(comment_log_path_for(self.catalogue_file))
+        self._put(_OPENED, (catalogue, comments))
+        for first in range(0, len(catalogue), self.page_size):
+            if self._cancel.is_set():
+                return None
+            for doc in range(first, min(first + self.page_size, len(catalogue))):
+                self.search.add(doc, SearchEngine.sample_fields(comments.merged(catalogue[doc])))
+            self._report_progress(min(first + self.page_size, len(catalogue)))
+        return TrigramIndex.load_or_build(self.catalogue_file, catalogue)
+
+    def _failure_message(self, error: Exception) -> str:
+        return f"Nie udało się wczytać katalogu filmów: {error}"
+
+    # --- wątek GUI ---
+
+    def _emit_message(self, kind: str, value: Any) -> None:
+        if kind != _OPENED:
+            super()._emit_message(kind, value)
+            return
+        self.opened.emit(*value)
@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Any, Callable, List
+
+from PySide6.QtCore import Signal
+
+from exceptions.exceptions import ExportCancelled
+from gui.gui_background_job import BackgroundJob
+from models.movie import Movie
+
+EXPORT_POLL_MS = 50
+
+# exporter(movies, filename, progress=..., cancelled=...) -> ścieżka zapisanego pliku
+Exporter = Callable[..., Path]
+
+
+# Eksport filmów w wątku w tle (np. FileOperations.export_to_csv). progress - liczba zapisanych
+# filmów; po cancel() wątek przerywa pracę przed kolejną paczką, plik tymczasowy jest usuwany.
+class ExportJob(BackgroundJob):
+    finished = Signal(object)          # ścieżka zapisanego pliku
+
+    thread_name = "export"
+    poll_ms = EXPORT_POLL_MS
+    cancel_error = (ExportCancelled,)
+
+    def __init__(self, exporter: Exporter, movies: List[Movie], filename: Path, parent=None, **options: Any) -> None:
+        self.exporter = exporter
+        # kopia listy - GUI może zmieniać kolekcję w trakcie eksportu
+        self.movies: List[Movie] = list(movies)
+        self.filename = filename
+        self.options = options
+        super().__init__(parent)
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def _work(self) -> Path:
+        return self.exporter(
+            self.movies, self.filename,
+            progress=self._report_progress,
+            cancelled=self._cancel.is_set,
+            **self.options
+        )
@@ -0,0 +1,34 @@
+from typing import Any, Callable, List, Tuple
+
+from PySide6.QtCore import Signal
+
+from exceptions.exceptions import ImportCancelled
+from gui.gui_background_job import BackgroundJob
+from models.movie import Movie
+
+IMPORT_POLL_MS = 50
+
+# reader(filename, progress=..., cancelled=...) -> (filmy, liczba odrzuconych rekordów)
+Reader = Callable[..., Tuple[List[Movie], int]]
+
+
+# Wczytanie i walidacja pliku importu w wątku w tle (np. MovieManager.read_import_file), jak ExportJob.
+# Do kolekcji filmy dodaje dopiero wątek GUI po sygnale finished - kolekcja i jej widoki
+# nie są zmieniane z wątku roboczego. progress - liczba przeczytanych rekordów.
+class ImportJob(BackgroundJob):
+    finished = Signal(object, int)     # poprawne filmy, liczba odrzuconych rekordów
+
+    thread_name = "import"
+    poll_ms = IMPORT_POLL_MS
+    cancel_error = (ImportCancelled,)
+
+    def __init__(self, reader: Reader, filename: str, parent=None) -> None:
+        self.reader = reader
+        self.filename = filename
+        super().__init__(parent)
+
+    def _work(self) -> Tuple[List[Movie], int]:
+        return self.reader(self.filename, progress=self._report_progress, cancelled=self._cancel.is_set)
+
+    def _emit_finished(self, result: Any) -> None:
+        self.finished.emit(*result)
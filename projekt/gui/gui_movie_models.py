@@ -0,0 +1,395 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PySide6.QtCore import QAbstractListModel, QAbstractProxyModel, QModelIndex, QPersistentModelIndex, Qt
+
+from models.movie import Movie
+from models.movie_collection import CollectionListener, MovieCollection, RowValues
+from models.sorted_views import SORT_RATING, SORT_TITLE, SORT_WATCH_DATE, SORT_YEAR, SortedViews
+
+ItemRole = Qt.ItemDataRole.UserRole + 1
+
+
+# Model listy "Moje filmy" nad MovieCollection. Zmiany kolekcji (także te wykonane przez
+# MovieManager poza GUI) zamieniają się na sygnały dla pojedynczych wierszy.
+class MovieListModel(QAbstractListModel, CollectionListener):
+    def __init__(self, collection: MovieCollection, views: Optional[SortedViews] = None, parent=None) -> None:
+        QAbstractListModel.__init__(self, parent)
+        self.collection: MovieCollection = collection
+        # widoki muszą obserwować kolekcję przed modelem - proxy czyta je po resecie modelu
+        self.views: SortedViews = views if views is not None else SortedViews(collection)
+        self._resetting: bool = False
+        collection.subscribe(self)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.collection)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        movie = self.collection.movies[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{movie.title} ({movie.year})"
+        if role == ItemRole:
+            return movie
+        return None
+
+    def item(self, row: int) -> Movie:
+        return self.collection.movies[row]
+
+    def row_id(self, row: int) -> str:
+        return self.collection.movies[row].id
+
+    def sorted_rows(self, mode: str) -> Tuple[np.ndarray, List[Any]]:
+        # wiersze w kolejności utrzymywanego widoku - bez sortowania
+        return self.views.rows(mode), self.views.view(mode).keys()
+
+    def sort_key(self, row: int, mode: str) -> Any:
+        return self.views.sort_key(mode, self.collection.movies[row])
+
+    # --- obserwator kolekcji ---
+
+    def collection_about_to_change(self, kind: str, row: int) -> None:
+        if kind == "insert":
+            self.beginInsertRows(QModelIndex(), row, row)
+        elif kind == "remove":
+            self.beginRemoveRows(QModelIndex(), row, row)
+        else:
+            self._resetting = True
+            self.beginResetModel()
+
+    def collection_changed(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        if old is None:
+            self.endInsertRows()
+        elif new is None:
+            self.endRemoveRows()
+        else:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def collection_reset(self, collection: MovieCollection) -> None:
+        # subscribe() też woła collection_reset - wtedy nie było beginResetModel
+        if self._resetting:
+            self._resetting = False
+            self.endResetModel()
+
+
+# Model katalogu: sekwencja rekordów (lista słowników albo BinaryCatalogue nad plikiem
+# .moviecat); identyfikatorem wiersza jest jego numer. Filmy pokazywane są stronami:
+# widok prosi o kolejną (fetchMore) przy przewijaniu.
+class CatalogueListModel(QAbstractListModel):
+    def __init__(self, movies: Sequence[Dict[str, Any]] = (), page_size: int = 100, parent=None) -> None:
+        super().__init__(parent)
+        self.movies: Sequence[Dict[str, Any]] = movies
+        self.page_size: int = page_size
+        self._shown: int = min(len(movies), page_size)
+        # widok (albo proxy) może zapytać o kolejną stronę w trakcie wstawiania poprzedniej
+        self._fetching: bool = False
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._shown
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._fetching and self._shown < len(self.movies)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not parent.isValid():
+            self.fetch_until(self._shown + self.page_size - 1)
+
+    def fetch_until(self, row: int) -> None:
+        # pokazuje wiersze do podanego włącznie (np. trafienia wyszukiwania spoza przewiniętych stron)
+        last = min(row, len(self.movies) - 1)
+        if last < self._shown or self._fetching:
+            return
+        self._fetching = True
+        try:
+            self.beginInsertRows(QModelIndex(), self._shown, last)
+            self._shown = last + 1
+            self.endInsertRows()
+        finally:
+            self._fetching = False
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            # skompilowany katalog podaje etykietę z indeksu, bez dekodowania całego rekordu
+            label = getattr(self.movies, "label", None)
+            if label is not None:
+                return label(index.row())
+            movie = self.movies[index.row()]
+            return f"{movie['title']} ({movie['year']})"
+        if role == ItemRole:
+            return self.movies[index.row()]
+        return None
+
+    def item(self, row: int) -> Dict[str, Any]:
+        return self.movies[row]
+
+    def row_id(self, row: int) -> int:
+        return row
+
+    def set_movies(self, movies: Sequence[Dict[str, Any]]) -> None:
+        # nowy katalog; od razu widać tylko pierwszą stronę, resztę przy przewijaniu
+        self.beginResetModel()
+        self.movies = movies
+        self._shown = min(len(movies), self.page_size)
+        self.endResetModel()
+
+    def item_changed(self, row: int) -> None:
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+
+# Filtr i sortowanie nad modelem źródłowym (MovieListModel / CatalogueListModel).
+# Kolejność sortowania bierzemy z widoków utrzymywanych przez źródło (sorted_rows), a pojedyncze
+# wstawienia, usunięcia i zmiany wierszy źródła dają pojedyncze sygnały wierszy (bisect).
+# Bez sortowania wyniki filtra są w kolejności rankingu wyszukiwarki.
+class MovieFilterProxyModel(QAbstractProxyModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._mode: Optional[str] = None
+        self._descending: bool = False
+        self._filter: Optional[Dict[Any, int]] = None
+        # _rows: wiersze źródła w kolejności rosnącej klucza; _keys: ich klucze (None = kolejność źródła)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._keys: Optional[List[Any]] = None
+        # _position: wiersz źródła -> pozycja w _rows (-1 = odfiltrowany)
+        self._position = np.zeros(0, dtype=np.int64)
+        self._pending_removal: Optional[int] = None
+        self._bulk_insert: Optional[str] = None
+        # w trakcie własnej zmiany nie pobieramy kolejnych stron źródła (widok pyta o nie w reakcji na sygnały)
+        self._changing: bool = False
+
+    # --- konfiguracja ---
+
+    def setSourceModel(self, model: QAbstractListModel) -> None:
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_model_reset)
+        self._rebuild()
+        self.endResetModel()
+
+    def set_filter(self, ranked_ids: Optional[Iterable[Any]]) -> None:
+        # ranked_ids - identyfikatory w kolejności trafności; None = bez filtra
+        self._changing = True
+        try:
+            self.beginResetModel()
+            self._filter = None if ranked_ids is None else {item_id: rank for rank, item_id in enumerate(ranked_ids)}
+            self._rebuild()
+            self.endResetModel()
+        finally:
+            self._changing = False
+
+    def set_sort(self, mode: Optional[str], descending: bool = False) -> None:
+        # zmiana kolejności bez resetu - zaznaczenie w widoku zostaje na tym samym filmie
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(index).row() for index in persistent]
+        self._mode = mode
+        self._descending = descending and mode is not None
+        self._rebuild()
+        self.changePersistentIndexList(
+            persistent, [self.mapFromSource(self.sourceModel().index(row, 0)) for row in sources]
+        )
+        self.layoutChanged.emit()
+
+    # --- klucze i przeliczanie ---
+
+    def _accepts(self, row: int) -> bool:
+        return self._filter is None or self.sourceModel().row_id(row) in self._filter
+
+    def _key(self, row: int) -> Any:
+        if self._mode is not None:
+            return self.sourceModel().sort_key(row, self._mode)
+        return self._filter[self.sourceModel().row_id(row)]
+
+    def _rebuild(self) -> None:
+        source = self.sourceModel()
+        count = source.rowCount() if source is not None else 0
+        if self._mode is not None and count:
+            rows, keys = source.sorted_rows(self._mode)
+            if self._filter is not None:
+                keep = [i for i, row in enumerate(rows.tolist()) if source.row_id(row) in self._filter]
+                rows, keys = rows[keep], [keys[i] for i in keep]
+            self._rows, self._keys = rows, keys
+        elif self._filter is not None:
+            rows = np.array([row for row in range(count) if source.row_id(row) in self._filter], dtype=np.int64)
+            keys = np.array([self._filter[source.row_id(row)] for row in rows], dtype=np.int64)
+            order = np.argsort(keys, kind="stable")
+            self._rows, self._keys = rows[order], keys[order].tolist()
+        else:
+            self._rows, self._keys = np.arange(count, dtype=np.int64), None
+        self._position = np.full(count, -1, dtype=np.int64)
+        self._position[self._rows] = np.arange(len(self._rows))
+
+    def _on_model_reset(self) -> None:
+        # widok prosi o kolejną stronę już przy sygnale modelReset - dopiero po zakończeniu resetu
+        self._changing = True
+        try:
+            self._rebuild()
+            self.endResetModel()
+        finally:
+            self._changing = False
+
+    def _view_row(self, position: int, size: Optional[int] = None) -> int:
+        size = len(self._rows) if size is None else size
+        return size - 1 - position if self._descending else position
+
+    def _insert_position(self, row: int) -> int:
+        if self._keys is None:
+            return int(np.searchsorted(self._rows, row))
+        return bisect_right(self._keys, self._key(row))
+
+    def _insert(self, row: int) -> None:
+        if not self._accepts(row):
+            return
+        position = self._insert_position(row)
+        view_row = len(self._rows) - position if self._descending else position
+        self.beginInsertRows(QModelIndex(), view_row, view_row)
+        self._rows = np.insert(self._rows, position, row)
+        if self._keys is not None:
+            self._keys.insert(position, self._key(row))
+        self._position[self._position >= position] += 1
+        self._position[row] = position
+        self.endInsertRows()
+
+    def _remove_position(self, position: int) -> None:
+        view_row = self._view_row(position)
+        self.beginRemoveRows(QModelIndex(), view_row, view_row)
+        self._drop_position(position)
+        self.endRemoveRows()
+
+    def _drop_position(self, position: int) -> None:
+        row = self._rows[position]
+        self._rows = np.delete(self._rows, position)
+        if self._keys is not None:
+            del self._keys[position]
+        self._position[row] = -1
+        self._position[self._position > position] -= 1
+
+    # --- sygnały modelu źródłowego ---
+
+    def _on_rows_about_to_be_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        # wiele wierszy naraz (np. kolejne strony katalogu): bez filtra i sortowania to ten sam
+        # zakres w widoku, w pozostałych przypadkach jedno przeliczenie zamiast wstawiania po kolei
+        if last == first:
+            self._bulk_insert = None
+        elif self._filter is None and self._mode is None:
+            self._bulk_insert = "range"
+            self.beginInsertRows(QModelIndex(), first, last)
+        else:
+            self._bulk_insert = "reset"
+            self.beginResetModel()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._bulk_insert is not None:
+            bulk, self._bulk_insert = self._bulk_insert, None
+            self._rebuild()
+            self._changing = True
+            try:
+                if bulk == "range":
+                    self.endInsertRows()
+                else:
+                    self.endResetModel()
+            finally:
+                self._changing = False
+            return
+        count = last - first + 1
+        # wiersze źródła za miejscem wstawienia przesuwają się
+        self._rows[self._rows >= first] += count
+        self._position = np.insert(self._position, first, np.full(count, -1, dtype=np.int64))
+        for row in range(first, last + 1):
+            self._insert(row)
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if first != last:
+            self.beginResetModel()
+            self._pending_removal = None
+            return
+        position = int(self._position[first])
+        self._pending_removal = position
+        if position >= 0:
+            self.beginRemoveRows(QModelIndex(), self._view_row(position), self._view_row(position))
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if first != last:
+            self._rebuild()
+            self.endResetModel()
+            return
+        position = self._pending_removal
+        self._pending_removal = None
+        if position is not None and position >= 0:
+            self._drop_position(position)
+        self._position = np.delete(self._position, first)
+        self._rows[self._rows > first] -= 1
+        if position is not None and position >= 0:
+            self.endRemoveRows()
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            position = int(self._position[row])
+            if position < 0:
+                continue
+            if self._keys is None or self._mode is None or self._keys[position] == self._key(row):
+                index = self.index(self._view_row(position), 0)
+                self.dataChanged.emit(index, index)
+            else:
+                # zmienił się klucz sortowania - wiersz przenosimy na nowe miejsce
+                self._remove_position(position)
+                self._insert(row)
+
+    # --- QAbstractProxyModel ---
+
+    def index(self, row: int, column: int = 0, parent=QModelIndex()) -> QModelIndex:
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, *args):
+        if not args:
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        source = self.sourceModel()
+        return not parent.isValid() and not self._changing and source is not None and source.canFetchMore(QModelIndex())
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if self.canFetchMore(parent):
+            self.sourceModel().fetchMore(QModelIndex())
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, proxy_index) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        position = self._view_row(proxy_index.row())
+        return self.sourceModel().index(int(self._rows[position]), 0)
+
+    def mapFromSource(self, source_index) -> QModelIndex:
+        if not source_index.isValid() or source_index.row() >= len(self._position):
+            return QModelIndex()
+        position = int(self._position[source_index.row()])
+        if position < 0:
+            return QModelIndex()
+        return self.index(self._view_row(position), 0)
+
+    def item(self, view_row: int) -> Any:
+        # obiekt (Movie albo słownik z katalogu) wyświetlany w danym wierszu widoku
+        return self.sourceModel().item(int(self._rows[self._view_row(view_row)]))
+
+    def view_row_of(self, source_row: int) -> int:
+        position = int(self._position[source_row])
+        return -1 if position < 0 else self._view_row(position)
@@ -0,0 +1,93 @@
+import queue
+from concurrent.futures import Future
+from typing import Callable, Hashable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QLineEdit
+
+from exceptions.exceptions import SearchCancelled
+from utils.search_pipeline import SearchFunction, SearchPipeline
+
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_POLL_MS = 20
+
+
+# Szukanie podczas pisania: zapytanie idzie do SearchPipeline dopiero, gdy użytkownik
+# przestanie pisać na debounce_ms; do widoku trafia tylko wynik ostatniego zapytania.
+class SearchController(QObject):
+    def __init__(self, line_edit: QLineEdit, search: SearchFunction,
+                 apply: Callable[[Optional[List[Hashable]]], None],
+                 debounce_ms: int = SEARCH_DEBOUNCE_MS, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.line_edit = line_edit
+        self.apply = apply
+        self.pipeline = SearchPipeline(search)
+        self._future: Optional[Future] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.search_now)
+
+        # wyniki z wątku wyszukiwania trafiają do kolejki, którą opróżnia timer w wątku GUI
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._poll = QTimer(self)
+        self._poll.setInterval(SEARCH_POLL_MS)
+        self._poll.timeout.connect(self._drain)
+
+        line_edit.textChanged.connect(self._on_text_changed)
+
+    @property
+    def debounce_ms(self) -> int:
+        return self._timer.interval()
+
+    @debounce_ms.setter
+    def debounce_ms(self, value: int) -> None:
+        self._timer.setInterval(value)
+
+    def _on_text_changed(self, text: str) -> None:
+        if not text.strip():
+            # puste pole - pełna lista od razu, bez czekania na wątek
+            self._timer.stop()
+            self._poll.stop()
+            self.pipeline.cancel()
+            self._future = None
+            self.apply(None)
+            return
+        self._timer.start()
+
+    def refresh(self) -> None:
+        # dane się zmieniły - bieżące zapytanie liczymy od nowa na całym indeksie
+        self.pipeline.invalidate()
+        if self.line_edit.text().strip():
+            self._timer.stop()
+            self.search_now()
+
+    def search_now(self) -> None:
+        future = self._future = self.pipeline.submit(self.line_edit.text())
+        # wywołanie w wątku wyszukiwania - tylko do kolejki
+        future.add_done_callback(self._results.put)
+        self._poll.start()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # czekamy tylko na ostatnie zapytanie - starsze i tak zostałyby pominięte
+            if future is self._future:
+                self._poll.stop()
+            self._on_finished(future)
+
+    def _on_finished(self, future: Future) -> None:
+        # starsze zapytania (anulowane albo zakończone po nowszym) pomijamy
+        if future is not self._future or future.cancelled() or isinstance(future.exception(), SearchCancelled):
+            return
+        self.apply(future.result())
+
+    def shutdown(self) -> None:
+        self._timer.stop()
+        self._poll.stop()
+        self.pipeline.cancel()
+        self.pipeline.shutdown()
@@ -0,0 +1,208 @@
+import queue
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Type
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QLabel, QSizePolicy, QTabWidget, QWidget
+
+from models.movie_collection import STATUS_WATCHED, CollectionListener, MovieCollection, RowValues
+from utils.chart_renderer import ChartRenderer, RenderedImage
+from utils.charts import Chart
+from utils.stats_aggregator import StatsAggregator
+
+# od czego zależy każdy wykres: po zmianie wiersza kolekcji sprawdzamy tylko te warunki
+RATINGS = "ratings"
+GENRES = "genres"
+STATUS = "status"
+TOP_RATED = "top_rated"
+
+RENDER_POLL_MS = 30
+RESIZE_DEBOUNCE_MS = 150
+
+
+def _watched_rated(values: Optional[RowValues]) -> bool:
+    return values is not None and values.status == STATUS_WATCHED and values.rating is not None
+
+
+def _rated(values: Optional[RowValues]) -> bool:
+    return values is not None and values.rating is not None
+
+
+def _genre(values: Optional[RowValues]) -> Optional[str]:
+    return values.genre if values is not None else None
+
+
+def _status(values: Optional[RowValues]) -> Optional[int]:
+    return values.status if values is not None else None
+
+
+# Wyświetla ostatni gotowy obraz wykresu; zmiana rozmiaru zleca nowy
+class ChartView(QLabel):
+    resized = Signal()
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.setMinimumSize(200, 150)
+
+    def show_image(self, image: RenderedImage) -> None:
+        # copy() - QImage nie może wskazywać na bufor bajtów, który zostanie zwolniony
+        qimage = QImage(image.rgba, image.width, image.height, QImage.Format.Format_RGBA8888).copy()
+        self.setPixmap(QPixmap.fromImage(qimage))
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.resized.emit()
+
+
+class _Entry:
+    def __init__(self, name: str, widget: QWidget, view: ChartView, chart_class: Type[Chart]) -> None:
+        self.name = name
+        self.widget = widget
+        self.view = view
+        self.chart_class = chart_class
+        self.dirty: bool = True
+        self.key: Optional[str] = None
+
+
+# Wykresy są oznaczane jako nieaktualne tylko przy zmianie danych, od których zależą,
+# i rysowane dopiero wtedy, gdy ich zakładka jest widoczna. Rysowanie odbywa się w puli
+# wątków ChartRenderer (wspólnej dla okien, więc pamięć podręczna obrazów przeżywa zmianę użytkownika).
+class StatsRenderScheduler(CollectionListener):
+    renderer: Optional[ChartRenderer] = None
+
+    def __init__(self, main_tabs: QTabWidget, stats_page: QWidget, stats_tabs: QTabWidget,
+                 stats: StatsAggregator) -> None:
+        self.main_tabs = main_tabs
+        self.stats_page = stats_page
+        self.stats_tabs = stats_tabs
+        self.stats = stats
+        self._charts: Dict[str, _Entry] = {}
+        if StatsRenderScheduler.renderer is None:
+            StatsRenderScheduler.renderer = ChartRenderer()
+        # wyniki z wątków renderujących trafiają do kolejki, którą opróżnia timer w wątku GUI
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending: int = 0
+        self._poll = QTimer(main_tabs)
+        self._poll.setInterval(RENDER_POLL_MS)
+        self._poll.timeout.connect(self._drain)
+        # seria zdarzeń zmiany rozmiaru (przeciąganie okna) kończy się jednym rysowaniem
+        self._resize = QTimer(main_tabs)
+        self._resize.setSingleShot(True)
+        self._resize.setInterval(RESIZE_DEBOUNCE_MS)
+        self._resize.timeout.connect(self._on_tab_changed)
+
+        # liczniki: wykonane rysowania oraz pominięte (wykres aktualny albo niewidoczny)
+        self.renders: int = 0
+        self.skipped_clean: int = 0
+        self.skipped_hidden: int = 0
+
+        main_tabs.currentChanged.connect(self._on_tab_changed)
+        stats_tabs.currentChanged.connect(self._on_tab_changed)
+        stats.collection.subscribe(self)
+
+    @property
+    def redraws_avoided(self) -> int:
+        return self.skipped_clean + self.skipped_hidden
+
+    def register(self, name: str, widget: QWidget, view: ChartView, chart_class: Type[Chart]) -> None:
+        entry = _Entry(name, widget, view, chart_class)
+        self._charts[name] = entry
+        view.resized.connect(lambda entry=entry: self._on_resized(entry))
+
+    # --- obserwator kolekcji ---
+
+    def collection_reset(self, collection: MovieCollection) -> None:
+        for entry in self._charts.values():
+            entry.dirty = True
+
+    def collection_changed(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        # zdarzenie oznacza zmianę filmu (także tytułu), więc wykres z tytułami
+        # przerysowujemy, gdy którykolwiek z wierszy jest na nim widoczny
+        if _watched_rated(old) or _watched_rated(new):
+            self.mark_dirty(RATINGS)
+        if _rated(old) or _rated(new):
+            self.mark_dirty(TOP_RATED)
+        if _genre(old) != _genre(new):
+            self.mark_dirty(GENRES)
+        if _status(old) != _status(new):
+            self.mark_dirty(STATUS)
+
+    def mark_dirty(self, *names: str) -> None:
+        for name in names or self._charts:
+            entry = self._charts.get(name)
+            if entry is not None:
+                entry.dirty = True
+
+    # --- rysowanie ---
+
+    def dirty_charts(self) -> List[str]:
+        return [name for name, entry in self._charts.items() if entry.dirty]
+
+    def _visible_chart(self) -> Optional[_Entry]:
+        if self.main_tabs.currentWidget() is not self.stats_page:
+            return None
+        current = self.stats_tabs.currentWidget()
+        for entry in self._charts.values():
+            if entry.widget is current:
+                return entry
+        return None
+
+    def _draw(self, entry: _Entry) -> None:
+        # dane liczymy w wątku GUI (tanie, z agregatów); rysowanie idzie do puli wątków
+        data = entry.chart_class.data(self.stats)
+        width, height = entry.view.width(), entry.view.height()
+        entry.key = self.renderer.cache_key(entry.chart_class, data, width, height)
+        entry.dirty = False
+        self.renders += 1
+        future = self.renderer.render(entry.chart_class, data, width, height)
+        name, key = entry.name, entry.key
+        self._pending += 1
+        self._poll.start()
+        # wywołanie w wątku puli (albo od razu, przy trafieniu w pamięć podręczną) - tylko do kolejki
+        future.add_done_callback(lambda f: self._results.put((name, key, f)))
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                name, key, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._on_rendered(name, key, future)
+        if not self._pending:
+            self._poll.stop()
+
+    def _on_rendered(self, name: str, key: str, future: Future) -> None:
+        entry = self._charts.get(name)
+        # wynik starszego zlecenia (np. sprzed zmiany rozmiaru) - nowszy obraz jest już w drodze
+        if entry is None or entry.key != key or future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Nie udało się narysować wykresu {name}: {error}")
+            return
+        entry.view.show_image(future.result())
+
+    def _on_resized(self, entry: _Entry) -> None:
+        entry.dirty = True
+        if entry is self._visible_chart():
+            self._resize.start()
+
+    def _on_tab_changed(self, _index: int = -1) -> None:
+        entry = self._visible_chart()
+        if entry is not None and entry.dirty:
+            self._draw(entry)
+
+    def render_visible(self) -> None:
+        # wcześniej każde wywołanie rysowało wszystkie wykresy - liczymy, ilu rysowań uniknięto
+        visible = self._visible_chart()
+        for entry in self._charts.values():
+            if not entry.dirty:
+                self.skipped_clean += 1
+            elif entry is not visible:
+                self.skipped_hidden += 1
+            else:
+                self._draw(entry)
@@ -1,3 +1,4 @@
+import atexit
 import sys
 from pathlib import Path
 from PySide6.QtWidgets import QApplication
@@ -6,15 +7,37 @@ from gui.gui import MainAppWindow
 from gui.gui_login import LoginWindow
 from managers.movieManager import MovieManager
 from managers.userManager import UserManager
+from storage.background_writer import BackgroundWriter
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SQLiteStorage
+from utils.events import EventBus
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
     BASE_DIR = Path(__file__).resolve().parent
     DATA_PATH = BASE_DIR / "data" / "users.json"
+    DB_PATH = BASE_DIR / "data" / "movies.db"
 
-    user_manager = UserManager(DATA_PATH)
-    movie_manager = MovieManager()
+    # baza SQLite jest używana, jeśli została utworzona (python -m storage.migration), a katalog
+    # users/ z plikiem na użytkownika - po python -m storage.migration --shards. Domyślny zostaje
+    # users.json z dziennikiem: edycja filmu to dopisanie jednej linii, a w katalogu users/
+    # każda zmiana przepisuje całą kolekcję użytkownika (opłaca się przy wielu kontach)
+    sharded = JsonStorage(DATA_PATH, sharded=True)
+    if DB_PATH.exists():
+        backend = SQLiteStorage(DB_PATH)
+    elif sharded.shards.exists():
+        backend = sharded
+    else:
+        backend = JsonStorage(DATA_PATH, use_journal=True)
+    # zapisy z GUI są scalane i wykonywane w tle, przy wyjściu kolejka jest opróżniana
+    storage = BackgroundWriter(backend)
+
+    # wspólna szyna: zmiany filmów z MovieManager zapisuje UserManager, a GUI odświeża tylko to, co się zmieniło
+    events = EventBus()
+    user_manager = UserManager(DATA_PATH, storage=storage, events=events)
+    movie_manager = MovieManager(events=events)
+    atexit.register(user_manager.close)
 
     login_dialog = LoginWindow(user_manager)
 
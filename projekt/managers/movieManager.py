@@ -1,23 +1,188 @@
 import json
 from datetime import date
-from typing import List, Optional, Tuple
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 
-from exceptions.exceptions import DuplicateMovieError, EmptyMovieListError, NotSuchAnId, WrongStatus
-from models.movie import Movie
+from exceptions.exceptions import (
+    DuplicateMovieError, EmptyMovieListError, ImportCancelled, InvalidRatingError, NotSuchAnId, WrongStatus
+)
+from models.movie import STATUSES, Movie
+from models.movie_collection import MovieCollection
+from models.sorted_views import SORT_RATING, SORT_TITLE, SortedViews
+from models.user import User
+from storage.base import year_value
+from utils.events import (
+    MOVIE_FIELDS, EventBus, MovieAdded, MovieChanged, MovieRemoved, MoviesAdded, MoviesReloaded
+)
+from utils.file_operations import FileOperations
+from utils.stats_aggregator import StatsAggregator
+
+IMPORT_BATCH_SIZE = 10_000
+
+
+class ImportReport(NamedTuple):
+    added: int
+    duplicates: int       # ten sam tytuł i rok co film na liście albo wcześniej w imporcie
+    invalid: int          # rekordy odrzucone przy walidacji (np. brak tytułu, zła ocena)
 
 
 class MovieManager:
-    def __init__(self) -> None:
-        self.movies: List[Movie] = []
+    def __init__(self, events: Optional[EventBus] = None) -> None:
+        # kolumny NumPy (rok, ocena, status, gatunek) dla statystyk - aktualizowane przy każdej zmianie
+        self.collection: MovieCollection = MovieCollection()
+        self.movies: List[Movie] = self.collection.movies
+        # agregaty (średnia, gatunki, statusy, ranking) aktualizowane przy każdej zmianie kolekcji
+        self.stats: StatsAggregator = StatsAggregator(self.collection)
+        # posortowane widoki (tytuł, rok, ocena, data obejrzenia) utrzymywane przy każdej zmianie
+        self.sorted_views: SortedViews = SortedViews(self.collection)
+        self.user: Optional[User] = None
+        # indeksy: id -> film, tytuł/reżyser (casefold) -> filmy
+        self._by_id: Dict[str, Movie] = {}
+        self._by_title: Dict[str, List[Movie]] = {}
+        self._by_director: Dict[str, List[Movie]] = {}
+        # zmiany kolekcji są publikowane jako zdarzenia (GUI, indeks wyszukiwania, zapis)
+        self.events: EventBus = events or EventBus()
+
+    def _changed(self, movie: Movie, *fields: str) -> None:
+        self.events.publish(MovieChanged(self.user, movie, fields))
+
+    @staticmethod
+    def _key(value: Optional[str]) -> str:
+        return (value or "").casefold()
+
+    @staticmethod
+    def _index_add(index: Dict[str, List[Movie]], key: str, movie: Movie) -> None:
+        index.setdefault(key, []).append(movie)
+
+    @staticmethod
+    def _index_remove(index: Dict[str, List[Movie]], key: str, movie: Movie) -> None:
+        bucket = index.get(key)
+        if not bucket:
+            return
+        for i, m in enumerate(bucket):
+            if m is movie:
+                del bucket[i]
+                break
+        if not bucket:
+            del index[key]
+
+    def _index_movie(self, movie: Movie) -> None:
+        self._by_id[movie.id] = movie
+        self._index_add(self._by_title, self._key(movie.title), movie)
+        self._index_add(self._by_director, self._key(movie.director), movie)
+
+    def _unindex_movie(self, movie: Movie) -> None:
+        self._by_id.pop(movie.id, None)
+        self._index_remove(self._by_title, self._key(movie.title), movie)
+        self._index_remove(self._by_director, self._key(movie.director), movie)
+
+    def _index_movies(self, movies: Iterable[Movie]) -> None:
+        # jak _index_movie dla wielu filmów, bez wywołań na każdy film
+        by_id, by_title, by_director = self._by_id, self._by_title, self._by_director
+        for movie in movies:
+            by_id[movie.id] = movie
+            by_title.setdefault((movie.title or "").casefold(), []).append(movie)
+            by_director.setdefault((movie.director or "").casefold(), []).append(movie)
+
+    def rebuild_indexes(self) -> None:
+        self._by_id = {}
+        self._by_title = {}
+        self._by_director = {}
+        self._index_movies(self.movies)
+
+    def load_movies(self, movies: List[Movie]) -> None:
+        # lista jest współdzielona (np. z user.movies), więc zmiany trafiają do użytkownika
+        self.movies = movies
+        self.collection.load(movies)
+        self.rebuild_indexes()
+        self.events.publish(MoviesReloaded(self.user, movies))
+
+    def load_user(self, user: User) -> None:
+        self.user = user
+        self.load_movies(user.movies)
 
     def add_movie(self, movie: Movie) -> None:
-        for m in self.movies:
-            if m.title.lower() == movie.title.lower():
-                raise DuplicateMovieError(f"Film '{movie.title}' już istnieje!")
+        # ta sama reguła co przy imporcie: duplikat to ten sam tytuł i rok
+        key = self._dedupe_key(movie)
+        if any(self._dedupe_key(other) == key for other in self._by_title.get(self._key(movie.title), [])):
+            raise DuplicateMovieError(f"Film '{movie.title}' ({movie.year}) już istnieje!")
 
         movie.status = "Do obejrzenia"
         movie.watch_date = None
-        self.movies.append(movie)
+        self.append_movie(movie)
+
+    @classmethod
+    def _dedupe_key(cls, movie: Movie) -> Tuple[str, Any]:
+        return cls._key(movie.title), year_value(movie.year)
+
+    @staticmethod
+    def read_records(records: Iterable[Union[Movie, Dict[str, Any]]], batch_size: int = IMPORT_BATCH_SIZE,
+                     progress: Optional[Callable[[int], None]] = None,
+                     cancelled: Optional[Callable[[], bool]] = None) -> Tuple[List[Movie], int]:
+        # walidacja rekordów z pliku -> (filmy, liczba odrzuconych). Nie dotyka kolekcji, więc może
+        # działać w wątku w tle; postęp i anulowanie sprawdzane po każdej paczce batch_size rekordów
+        movies: List[Movie] = []
+        invalid = 0
+        items = iter(records)
+        while True:
+            if cancelled is not None and cancelled():
+                raise ImportCancelled("Import anulowany")
+            batch = list(islice(items, batch_size))
+            if not batch:
+                break
+            for item in batch:
+                if not isinstance(item, Movie):
+                    try:
+                        item = Movie.from_record(item)
+                    except (ValueError, TypeError, AttributeError, InvalidRatingError, WrongStatus):
+                        invalid += 1
+                        continue
+                movies.append(item)
+            if progress is not None:
+                progress(len(movies) + invalid)
+        return movies, invalid
+
+    @staticmethod
+    def read_import_file(filename: str, **options: Any) -> Tuple[List[Movie], int]:
+        # CSV, JSON albo JSON Lines - plik czytany strumieniowo
+        return MovieManager.read_records(FileOperations.iter_records(filename), **options)
+
+    def add_movies(self, movies: Iterable[Union[Movie, Dict[str, Any]]]) -> ImportReport:
+        # import wielu filmów (obiekty Movie albo rekordy z pliku): duplikaty po tytule i roku
+        # odrzucane przez zbiór kluczy; kolekcja, indeksy i zapis - raz na cały import
+        movies, invalid = self.read_records(movies)
+        seen: Set[Tuple[str, Any]] = {self._dedupe_key(movie) for movie in self.movies}
+        accepted: List[Movie] = []
+        duplicates = 0
+        for movie in movies:
+            key = self._dedupe_key(movie)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            accepted.append(movie)
+
+        if accepted:
+            self.collection.extend(accepted)
+            self._index_movies(accepted)
+            self.events.publish(MoviesAdded(self.user, accepted))
+        return ImportReport(len(accepted), duplicates, invalid)
+
+    def import_file(self, filename: str) -> ImportReport:
+        return self.add_movies(FileOperations.iter_records(filename))
+
+    def append_movie(self, movie: Movie) -> None:
+        # bez sprawdzania duplikatów i resetu statusu - film dodany w GUI ma już ustawione pola
+        self.collection.append(movie)
+        self._index_movie(movie)
+        self.events.publish(MovieAdded(self.user, movie))
+
+    def replace_movie(self, movie: Movie) -> None:
+        old = self._get_for_update(movie.id, "filmu")
+        self._unindex_movie(old)
+        self.collection.replace_at(self.collection.row_of(old.id), movie)
+        self._index_movie(movie)
+        self._changed(movie, *MOVIE_FIELDS)
 
     def get_movies(self) -> List[Movie]:
         if not self.movies:
@@ -26,71 +191,79 @@ class MovieManager:
         return self.movies
 
     def get_movie_by_id(self, id: str) -> Movie:
-        for movie in self.movies:
-            if movie.id == id:
-                return movie
-        raise NotSuchAnId(f"Brak filmu o id: {id}")
+        movie = self._by_id.get(id)
+        if movie is None:
+            raise NotSuchAnId(f"Brak filmu o id: {id}")
+        return movie
 
     def delete_movie(self, id: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                self.movies.remove(movie)
-                return
-        raise NotSuchAnId(f"Nie można usunąć: film o ID {id} nie istnieje")
+        movie = self._by_id.get(id)
+        if movie is None:
+            raise NotSuchAnId(f"Nie można usunąć: film o ID {id} nie istnieje")
+        self._unindex_movie(movie)
+        self.collection.remove_at(self.collection.row_of(movie.id))
+        self.events.publish(MovieRemoved(self.user, movie))
+
+    def _get_for_update(self, id: str, action: str) -> Movie:
+        movie = self._by_id.get(id)
+        if movie is None:
+            raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji {action})")
+        return movie
 
     def update_title(self, id: str, new_title: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.title = new_title
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji tytułu)")
+        movie = self._get_for_update(id, "tytułu")
+        self._index_remove(self._by_title, self._key(movie.title), movie)
+        movie.title = new_title
+        self._index_add(self._by_title, self._key(movie.title), movie)
+        self.collection.refresh(movie)
+        self._changed(movie, "title")
 
     def update_director(self, id: str, new_director: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.director = new_director
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji reżysera)")
+        movie = self._get_for_update(id, "reżysera")
+        self._index_remove(self._by_director, self._key(movie.director), movie)
+        movie.director = new_director
+        self._index_add(self._by_director, self._key(movie.director), movie)
+        self._changed(movie, "director")
 
     def update_genre(self, id: str, new_genre: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.genre = new_genre
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji gatunku)")
+        movie = self._get_for_update(id, "gatunku")
+        movie.genre = new_genre
+        self.collection.refresh(movie)
+        self._changed(movie, "genre")
 
     def update_rating(self, id: str, new_rating: float) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.rating = new_rating
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji oceny)")
+        movie = self._get_for_update(id, "oceny")
+        movie.rating = new_rating
+        self.collection.refresh(movie)
+        self._changed(movie, "rating")
+
+    def update_status(self, id: str, new_status: str) -> None:
+        movie = self._get_for_update(id, "statusu")
+        movie.status = new_status
+        self.collection.refresh(movie)
+        self._changed(movie, "status")
 
     def update_watch_date(self, id: str, new_watch_date: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.watch_date = new_watch_date
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji daty obejrzenia)")
+        movie = self._get_for_update(id, "daty obejrzenia")
+        movie.watch_date = new_watch_date
+        self.collection.refresh(movie)
+        self._changed(movie, "watch_date")
 
     def update_description(self, id: str, new_description: str) -> None:
-        for movie in self.movies:
-            if movie.id == id:
-                movie.description = new_description
-                return
-        raise NotSuchAnId(f"Brak filmu o ID: {id} (próba aktualizacji opisu)")
+        movie = self._get_for_update(id, "opisu")
+        movie.description = new_description
+        self._changed(movie, "description")
 
     def find_movie_by_title(self, title: str) -> Optional[Movie]:
-        for movie in self.movies:
-            if movie.title == title:
-                return movie
-        return None
+        bucket = self._by_title.get(self._key(title))
+        return bucket[0] if bucket else None
 
     def find_movie_by_director(self, director: str) -> Optional[Movie]:
-        for movie in self.movies:
-            if movie.director == director:
-                return movie
-        return None
+        bucket = self._by_director.get(self._key(director))
+        return bucket[0] if bucket else None
+
+    def find_movies_by_director(self, director: str) -> List[Movie]:
+        return list(self._by_director.get(self._key(director), []))
 
     def filter_movies_by_genre(self, genre: str) -> List[Movie]:
         movies: List[Movie] = []
@@ -104,34 +277,38 @@ class MovieManager:
         if not movie:
             raise NotSuchAnId("Nie znaleziono filmu o podanym tytule")
         movie.add_comment(user, comment)
+        self._changed(movie, "comments")
+
+    def sorted_movies(self, mode: str, descending: bool = False) -> List[Movie]:
+        return self.sorted_views.ordered(mode, descending)
 
     def sort_movies_by_rating(self) -> List[Movie]:
-        return sorted(self.movies, key=lambda movie: movie.rating, reverse=True)
+        # najwyżej ocenione pierwsze, filmy bez oceny na końcu
+        return self.sorted_movies(SORT_RATING, descending=True)
 
     def sort_movies_by_title(self) -> List[Movie]:
-        return sorted(self.movies, key=lambda movie: movie.title)
+        return self.sorted_movies(SORT_TITLE)
 
     def get_watched_history(self) -> List[Tuple[str, Optional[str]]]:
         return [(m.title, m.watch_date) for m in self.movies if m.status == 'watched']
 
     def set_status(self, id: str, status: str) -> None:
-        valid_statuses = ["Obejrzano", "Do obejrzenia"]
-
-        if status not in valid_statuses:
+        if status not in STATUSES:
             raise WrongStatus(f"Zły status '{status}'. Musi być 'Obejrzano' lub 'Do obejrzenia'")
 
-        for movie in self.movies:
-            if movie.id == id:
-                if status == "Obejrzano":
-                    today = date.today().isoformat()
-                    movie.status = f"Obejrzano: {today}"
-                    movie.watch_date = today
-                else:
-                    movie.status = "Do obejrzenia"
-                    movie.watch_date = None
-                return
-
-        raise NotSuchAnId(f"Brak filmu o id: {id}")
+        movie = self._by_id.get(id)
+        if movie is None:
+            raise NotSuchAnId(f"Brak filmu o id: {id}")
+
+        if status == "Obejrzano":
+            today = date.today().isoformat()
+            movie.status = f"Obejrzano: {today}"
+            movie.watch_date = today
+        else:
+            movie.status = "Do obejrzenia"
+            movie.watch_date = None
+        self.collection.refresh(movie)
+        self._changed(movie, "status", "watch_date")
 
     def display_all_movies(self) -> None:
         if not self.movies:
@@ -139,7 +316,7 @@ class MovieManager:
             return
         for movie in self.movies:
             print(movie)
-            if movie.comments:
+            if movie.has_comments:
                 print("  Komentarze:")
                 for c in movie.comments:
                     print(f"    {c['user']}: {c['comment']}")
@@ -1,15 +1,26 @@
-import json
 import os
-from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from exceptions.exceptions import UserError, WrongStatus
+from models.movie import Movie
 from models.user import User
+from storage.base import StorageBackend
+from storage.json_storage import JsonStorage
+from utils.events import (
+    EventBus, MovieAdded, MovieChanged, MovieRemoved, MoviesAdded, UserAdded, UserChanged, UserRemoved
+)
 
 
 class UserManager:
-    def __init__(self, data_file: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        data_file: Optional[Path] = None,
+        use_journal: bool = False,
+        sharded: bool = False,
+        storage: Optional[StorageBackend] = None,
+        events: Optional[EventBus] = None
+    ) -> None:
         if data_file is None:
             base_dir = Path(__file__).resolve().parent.parent
             data_file = base_dir / "data" / "users.json"
@@ -17,6 +28,18 @@ class UserManager:
 
         self.users: List[User] = []
         self.current_user: Optional[User] = None
+        # indeksy: nazwa (casefold) -> konto, id -> konto; utrzymywane razem z listą users
+        self._by_username: Dict[str, User] = {}
+        self._by_id: Dict[str, User] = {}
+
+        self.storage: StorageBackend = storage or JsonStorage(data_file, use_journal=use_journal, sharded=sharded)
+
+        # zapis jest jednym z subskrybentów zdarzeń - kont (stąd) i filmów (MovieManager na tej samej szynie)
+        self.events: EventBus = events or EventBus()
+        self.events.subscribe(UserAdded, self._on_user_saved)
+        self.events.subscribe(UserChanged, self._on_user_saved)
+        self.events.subscribe(UserRemoved, self._on_user_removed)
+        self.track_movies(self.events)
 
         self._ensure_data_directory()
         self.load_users()
@@ -33,7 +56,9 @@ class UserManager:
 
         user = User(username, password, email)
         self.users.append(user)
-        self.save_users()
+        self._index_user(user)
+        self.events.publish(UserAdded(user))
+        self.flush()
         print(f"Uzytkownik {username} zarejestrowany")
         return user
 
@@ -47,7 +72,7 @@ class UserManager:
 
         user.update_last_login()
         self.current_user = user
-        self.save_users()
+        self.events.publish(UserChanged(user, ("last_login",)))
         print(f"Zalogowano, pomyslnie\n")
         print(f"Witaj {username}")
         return user
@@ -59,17 +84,31 @@ class UserManager:
         else:
             raise UserError("Brak zalogowanych uzytkownikow")
 
-    def find_user_by_username(self, username: str) -> Optional[User]:
+    def _index_user(self, user: User) -> None:
+        # przy powtórzonej nazwie w pliku wygrywa pierwsze konto (jak przy przeszukiwaniu listy)
+        self._by_username.setdefault(user.username.casefold(), user)
+        self._by_id.setdefault(user.id, user)
+
+    def _unindex_user(self, user: User) -> None:
+        if self._by_username.get(user.username.casefold()) is user:
+            del self._by_username[user.username.casefold()]
+        if self._by_id.get(user.id) is user:
+            del self._by_id[user.id]
+
+    def rebuild_indexes(self) -> None:
+        self._by_username = {}
+        self._by_id = {}
         for user in self.users:
-            if user.username.lower() == username.lower():
-                return user
-        return None
+            self._index_user(user)
+
+    def find_user_by_username(self, username: str) -> Optional[User]:
+        return self._by_username.get(username.casefold())
 
     def find_user_by_id(self, user_id: str) -> User:
-        for user in self.users:
-            if user.id == user_id:
-                return user
-        raise UserError(f"Uzytkownik {user_id} nie znaleziony")
+        user = self._by_id.get(user_id)
+        if user is None:
+            raise UserError(f"Uzytkownik {user_id} nie znaleziony")
+        return user
 
     def get_all_users(self) -> List[User]:
         if not self.users:
@@ -85,7 +124,9 @@ class UserManager:
             self.current_user = None
 
         self.users.remove(user)
-        self.save_users()
+        self._unindex_user(user)
+        self.events.publish(UserRemoved(user))
+        self.flush()
         print(f"Uzytkownik {username} pomyślnie usuniety")
 
     def change_password(self, username: str, old_password: str, new_password: str) -> None:
@@ -97,39 +138,67 @@ class UserManager:
             raise UserError(f"Złe haslo")
 
         user.password = new_password  # opcjonalnie zastosuj hash
-        self.save_users()
+        self.events.publish(UserChanged(user, ("password",)))
+        self.flush()
         print(f"Haslo zmienione dla uzytkownika {username}\n")
         print(f"Nowe haslo {new_password}")
 
     def is_logged_in(self) -> bool:
         return self.current_user is not None
 
+    def track_movies(self, events: EventBus) -> None:
+        # zapisuje zmiany filmów publikowane na podanej szynie (np. przez MovieManager z inną szyną)
+        events.subscribe(MovieAdded, self._on_movie_saved)
+        events.subscribe(MovieChanged, self._on_movie_saved)
+        events.subscribe(MovieRemoved, self._on_movie_removed)
+        events.subscribe(MoviesAdded, self._on_movies_added)
+
+    def _on_user_saved(self, event) -> None:
+        self.save_user(event.user)
+
+    def _on_user_removed(self, event: UserRemoved) -> None:
+        self.save_user_deletion(event.user)
+
+    def _on_movie_saved(self, event) -> None:
+        # MovieManager bez przypisanego użytkownika nie ma czego zapisywać
+        if event.user is not None:
+            self.save_movie(event.user, event.movie)
+
+    def _on_movies_added(self, event: MoviesAdded) -> None:
+        # import - wszystkie filmy w jednej paczce zapisu
+        if event.user is not None:
+            self.storage.save_movies(event.user, event.movies)
+
+    def _on_movie_removed(self, event: MovieRemoved) -> None:
+        if event.user is not None:
+            self.save_movie_deletion(event.user, event.movie.id)
+
+    def save_user(self, user: User) -> None:
+        self.storage.save_user(user)
+
+    def save_user_deletion(self, user: User) -> None:
+        self.storage.delete_user(user)
+
+    def save_movie(self, user: User, movie: Movie) -> None:
+        self.storage.save_movie(user, movie)
+
+    def save_movie_deletion(self, user: User, movie_id: str) -> None:
+        self.storage.delete_movie(user, movie_id)
+
     def save_users(self) -> None:
-        try:
-            user_data = []
-            for user in self.users:
-                data = user.to_dict()
-                for key in ["created_at", "last_login"]:
-                    if isinstance(data.get(key), datetime):
-                        data[key] = data[key].strftime("%Y-%m-%d %H:%M:%S")
-                user_data.append(data)
-
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(user_data, f, ensure_ascii=False, indent=2)
-            print(f"Zapisano {len(self.users)} użytkowników do pliku {self.data_file}")
-        except Exception as e:
-            print(f"Nie udało się zapisać użytkowników: {e}")
+        self.storage.save_users(self.users)
 
     def load_users(self) -> None:
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    user_data = json.load(f)
-                    self.users = [User.from_dict(data) for data in user_data]
-                print(f"Wczytano {len(self.users)} użytkowników z pliku {self.data_file}")
-            else:
-                print(f"Plik {self.data_file} nie istnieje, tworzenie nowej listy użytkowników")
-                self.users = []
+            self.users = self.storage.load_users()
         except Exception as e:
             print(f"Błąd podczas wczytywania użytkowników: {e}")
             self.users = []
+        self.rebuild_indexes()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # czeka, aż zmiany oczekujące w tle trafią na dysk
+        return self.storage.flush(timeout)
+
+    def close(self) -> None:
+        self.storage.close()
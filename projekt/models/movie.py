@@ -1,11 +1,38 @@
+import sys
 import uuid
 from datetime import date
 from typing import List, Dict, Any, Optional, Union
 
-from exceptions.exceptions import InvalidRatingError
+from exceptions.exceptions import InvalidRatingError, WrongStatus
+
+# statusy ustawiane przez MovieManager.set_status
+STATUSES = ("Obejrzano", "Do obejrzenia")
+
+
+class _Interned:
+    # pole kategoryczne (gatunek, status, reżyser) - ten sam napis współdzielony przez wszystkie filmy
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = f"_{name}"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.slot, sys.intern(value) if type(value) is str else value)
 
 
 class Movie:
+    __slots__ = (
+        "id", "title", "_director", "year", "_genre", "_status",
+        "rating", "description", "watch_date", "_comments"
+    )
+
+    director = _Interned()
+    genre = _Interned()
+    status = _Interned()
+
     def __init__(
         self,
         title: str,
@@ -15,7 +42,8 @@ class Movie:
         status: str,
         rating: Optional[float],
         description: str,
-        watch_date: Optional[str] = None
+        watch_date: Optional[str] = None,
+        movie_id: Optional[str] = None
     ) -> None:
         if not title:
             raise ValueError("Tytuł jest wymagany")
@@ -30,16 +58,31 @@ class Movie:
             except ValueError:
                 raise ValueError("Ocena musi być liczbą")
 
-        self.id: str = str(uuid.uuid4())
+        self.id: str = movie_id or str(uuid.uuid4())
         self.title: str = title
-        self.director: str = director
+        self.director = director
         self.year: Union[int, str] = year
-        self.genre: str = genre
-        self.status: str = status
+        self.genre = genre
+        self.status = status
         self.rating: Optional[float] = rating
         self.description: str = description
         self.watch_date: str = watch_date or (str(date.today()) if status == "obejrzany" else "")
-        self.comments: List[Dict[str, str]] = []
+        # lista komentarzy tworzona dopiero przy pierwszym użyciu - większość filmów nie ma komentarzy
+        self._comments: Optional[List[Dict[str, str]]] = None
+
+    @property
+    def comments(self) -> List[Dict[str, str]]:
+        if self._comments is None:
+            self._comments = []
+        return self._comments
+
+    @comments.setter
+    def comments(self, comments: Optional[List[Dict[str, str]]]) -> None:
+        self._comments = comments
+
+    @property
+    def has_comments(self) -> bool:
+        return bool(self._comments)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -52,7 +95,7 @@ class Movie:
             "rating": self.rating,
             "description": self.description,
             "watch_date": self.watch_date,
-            "comments": self.comments
+            "comments": self._comments if self._comments is not None else []
         }
 
     @classmethod
@@ -65,10 +108,40 @@ class Movie:
             data.get("status", ""),
             data.get("rating", ""),
             data.get("description", ""),
-            data.get("watch_date", "")
+            data.get("watch_date", ""),
+            movie_id=data["id"]
+        )
+        # pusta lista z pliku nie jest przechowywana - zostanie utworzona, gdy będzie potrzebna
+        movie.comments = data.get("comments") or None
+        return movie
+
+    @classmethod
+    def from_record(cls, data: Dict[str, Any]) -> "Movie":
+        # rekord z importu (CSV, JSON, JSON Lines): zawsze nowe id, brakujące pola puste.
+        # Status jak w MovieManager.set_status (albo "Obejrzano: <data>" z eksportu), rok - liczba
+        status = data.get("status") or "Do obejrzenia"
+        if status not in STATUSES and not (type(status) is str and status.startswith("Obejrzano: ")):
+            raise WrongStatus(f"Zły status '{status}'. Musi być 'Obejrzano' lub 'Do obejrzenia'")
+        year = data.get("year")
+        if year is None or year == "":
+            year = ""
+        elif type(year) is not int:
+            try:
+                year = int(str(year).strip())
+            except ValueError:
+                raise ValueError(f"Rok musi być liczbą: {year!r}")
+        rating = data.get("rating")
+        movie = cls(
+            data.get("title"),
+            data.get("director"),
+            year,
+            data.get("genre") or "",
+            status,
+            None if rating == "" else rating,
+            data.get("description") or "",
+            data.get("watch_date") or ""
         )
-        movie.id = data["id"]
-        movie.comments = data.get("comments", [])
+        movie.comments = data.get("comments") or None
         return movie
 
     def add_comment(self, user: str, comment: str) -> None:
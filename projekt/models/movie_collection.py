@@ -0,0 +1,261 @@
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from models.movie import Movie
+from storage.base import is_watched, rating_value, year_value
+
+NO_GENRE = -1
+STATUS_UNWATCHED = 0
+STATUS_WATCHED = 1
+
+
+def status_code(status: Optional[str]) -> int:
+    return STATUS_WATCHED if is_watched(status) else STATUS_UNWATCHED
+
+
+def _as_float(value: Optional[float]) -> float:
+    # brak wartości zapisujemy jako NaN, żeby kolumna mogła być typu float64
+    return np.nan if value is None else float(value)
+
+
+# Wartości jednego wiersza przekazywane obserwatorom kolekcji (np. StatsAggregator)
+class RowValues(NamedTuple):
+    movie: Movie
+    rating: Optional[float]
+    status: int
+    genre: Optional[str]
+
+
+# Obserwator kolekcji. collection_about_to_change dostaje rodzaj zmiany ("insert", "remove",
+# "reset") przed jej wykonaniem - potrzebne np. modelom Qt (beginInsertRows itd.).
+class CollectionListener:
+    def collection_about_to_change(self, kind: str, row: int) -> None:
+        pass
+
+    def collection_changed(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        pass
+
+    def collection_reset(self, collection: "MovieCollection") -> None:
+        pass
+
+
+# Kolumnowy widok kolekcji: obok listy obiektów Movie trzyma tablice NumPy
+# (rok, ocena, kod statusu, kod gatunku) ułożone w tej samej kolejności co lista.
+class MovieCollection:
+    INITIAL_CAPACITY: int = 64
+
+    def __init__(self, movies: Optional[List[Movie]] = None) -> None:
+        self.movies: List[Movie] = []
+        self.genres: List[str] = []
+        self._genre_codes: Dict[str, int] = {}
+        self._size: int = 0
+        # id filmu -> numer wiersza, żeby nie szukać filmu liniowo w liście
+        self._rows: Dict[str, int] = {}
+        self._listeners: List[CollectionListener] = []
+        self._allocate(self.INITIAL_CAPACITY)
+        if movies is not None:
+            self.load(movies)
+
+    def _allocate(self, capacity: int) -> None:
+        self._years = np.full(capacity, np.nan)
+        self._ratings = np.full(capacity, np.nan)
+        self._statuses = np.zeros(capacity, dtype=np.int8)
+        self._genre_ids = np.full(capacity, NO_GENRE, dtype=np.int32)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._years)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        old = (self._years, self._ratings, self._statuses, self._genre_ids)
+        self._allocate(capacity)
+        for new_array, old_array in zip((self._years, self._ratings, self._statuses, self._genre_ids), old):
+            new_array[:self._size] = old_array[:self._size]
+
+    def _genre_code(self, genre: Optional[str]) -> int:
+        if not genre:
+            return NO_GENRE
+        code = self._genre_codes.get(genre)
+        if code is None:
+            code = self._genre_codes[genre] = len(self.genres)
+            self.genres.append(genre)
+        return code
+
+    def _write_row(self, row: int, movie: Movie) -> None:
+        self._years[row] = _as_float(year_value(movie.year))
+        self._ratings[row] = _as_float(rating_value(movie.rating))
+        self._statuses[row] = status_code(movie.status)
+        self._genre_ids[row] = self._genre_code(movie.genre)
+
+    def _row_values(self, row: int) -> RowValues:
+        rating = self._ratings[row]
+        genre_id = int(self._genre_ids[row])
+        return RowValues(
+            self.movies[row],
+            None if np.isnan(rating) else float(rating),
+            int(self._statuses[row]),
+            None if genre_id == NO_GENRE else self.genres[genre_id]
+        )
+
+    def _notify_before(self, kind: str, row: int) -> None:
+        for listener in self._listeners:
+            listener.collection_about_to_change(kind, row)
+
+    def _notify(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        for listener in self._listeners:
+            listener.collection_changed(old, new, row)
+
+    def subscribe(self, listener: CollectionListener) -> None:
+        self._listeners.append(listener)
+        listener.collection_reset(self)
+
+    def unsubscribe(self, listener: CollectionListener) -> None:
+        self._listeners.remove(listener)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def row_of(self, movie_id: str) -> int:
+        return self._rows[movie_id]
+
+    def _index_rows(self, start: int) -> None:
+        rows = self._rows
+        for row in range(start, self._size):
+            rows[self.movies[row].id] = row
+
+    # --- synchronizacja z listą filmów ---
+
+    def load(self, movies: List[Movie]) -> None:
+        # lista jest współdzielona (np. z user.movies) - kolumny budujemy od nowa
+        self._notify_before("reset", -1)
+        self.movies = movies
+        self.genres = []
+        self._genre_codes = {}
+        self._size = size = len(movies)
+        self._allocate(max(self.INITIAL_CAPACITY, size))
+        self._years[:size] = [_as_float(year_value(m.year)) for m in movies]
+        self._ratings[:size] = [_as_float(rating_value(m.rating)) for m in movies]
+        self._statuses[:size] = [status_code(m.status) for m in movies]
+        self._genre_ids[:size] = [self._genre_code(m.genre) for m in movies]
+        self._rows = {}
+        self._index_rows(0)
+        for listener in self._listeners:
+            listener.collection_reset(self)
+
+    def append(self, movie: Movie) -> None:
+        row = self._size
+        self._notify_before("insert", row)
+        self._grow(row + 1)
+        self.movies.append(movie)
+        self._write_row(row, movie)
+        self._rows[movie.id] = row
+        self._size += 1
+        self._notify(None, self._row_values(row), row)
+
+    def extend(self, movies: List[Movie]) -> None:
+        # dopisanie wielu filmów naraz (import) - kolumny wypełniane w całości, obserwatorzy
+        # przebudowują stan raz, jak przy wczytaniu kolekcji
+        if not movies:
+            return
+        self._notify_before("reset", -1)
+        start = self._size
+        end = start + len(movies)
+        self._grow(end)
+        self.movies.extend(movies)
+        self._years[start:end] = [_as_float(year_value(m.year)) for m in movies]
+        self._ratings[start:end] = [_as_float(rating_value(m.rating)) for m in movies]
+        self._statuses[start:end] = [status_code(m.status) for m in movies]
+        self._genre_ids[start:end] = [self._genre_code(m.genre) for m in movies]
+        self._size = end
+        self._index_rows(start)
+        for listener in self._listeners:
+            listener.collection_reset(self)
+
+    def remove_at(self, row: int) -> Movie:
+        old = self._row_values(row)
+        self._notify_before("remove", row)
+        movie = self.movies.pop(row)
+        end = self._size
+        for array in (self._years, self._ratings, self._statuses, self._genre_ids):
+            array[row:end - 1] = array[row + 1:end]
+        self._size -= 1
+        del self._rows[movie.id]
+        # wiersze za usuniętym przesuwają się o jeden
+        self._index_rows(row)
+        self._notify(old, None, row)
+        return movie
+
+    def replace_at(self, row: int, movie: Movie) -> None:
+        old = self._row_values(row)
+        del self._rows[self.movies[row].id]
+        self.movies[row] = movie
+        self._rows[movie.id] = row
+        self._write_row(row, movie)
+        self._notify(old, self._row_values(row), row)
+
+    def refresh(self, movie: Movie) -> None:
+        # po zmianie pól filmu w miejscu
+        row = self._rows[movie.id]
+        old = self._row_values(row)
+        self._write_row(row, movie)
+        self._notify(old, self._row_values(row), row)
+
+    # --- kolumny (widoki bez kopiowania) ---
+
+    @property
+    def years(self) -> np.ndarray:
+        return self._years[:self._size]
+
+    @property
+    def ratings(self) -> np.ndarray:
+        return self._ratings[:self._size]
+
+    @property
+    def statuses(self) -> np.ndarray:
+        return self._statuses[:self._size]
+
+    @property
+    def genre_ids(self) -> np.ndarray:
+        return self._genre_ids[:self._size]
+
+    # --- agregaty liczone wektorowo ---
+
+    def rated_mask(self) -> np.ndarray:
+        return ~np.isnan(self.ratings)
+
+    def watched_mask(self) -> np.ndarray:
+        return self.statuses == STATUS_WATCHED
+
+    def average_rating(self) -> Optional[float]:
+        ratings = self.ratings[self.rated_mask()]
+        if ratings.size == 0:
+            return None
+        return float(ratings.mean())
+
+    def watched_count(self) -> int:
+        return int(np.count_nonzero(self.watched_mask()))
+
+    def unwatched_count(self) -> int:
+        return self._size - self.watched_count()
+
+    def genre_counts(self) -> Dict[str, int]:
+        ids = self.genre_ids
+        counts = np.bincount(ids[ids != NO_GENRE], minlength=len(self.genres))
+        return {genre: int(counts[code]) for code, genre in enumerate(self.genres) if counts[code]}
+
+    def top_rated(self, n: int = 3) -> List[Movie]:
+        rows = np.flatnonzero(self.rated_mask())
+        if rows.size == 0:
+            return []
+        # stabilne sortowanie malejąco - przy remisie wygrywa film wcześniej na liście
+        order = np.argsort(-self.ratings[rows], kind="stable")[:n]
+        return [self.movies[row] for row in rows[order]]
+
+    def watched_rated(self) -> List[Movie]:
+        rows = np.flatnonzero(self.watched_mask() & self.rated_mask())
+        return [self.movies[row] for row in rows]
+
+    def select(self, mask: np.ndarray) -> List[Movie]:
+        return [self.movies[row] for row in np.flatnonzero(mask)]
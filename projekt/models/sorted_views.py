@@ -0,0 +1,158 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.movie import Movie
+from models.movie_collection import CollectionListener, MovieCollection, RowValues
+from storage.base import rating_value, year_value
+
+SORT_TITLE = "title"
+SORT_YEAR = "year"
+SORT_RATING = "rating"
+SORT_WATCH_DATE = "watch_date"
+
+
+# znormalizowane klucze liczone raz na film; brak wartości trafia na początek porządku rosnącego
+def title_key(movie: Movie) -> str:
+    return (movie.title or "").casefold()
+
+
+def year_key(movie: Movie) -> float:
+    year = year_value(movie.year)
+    return 0.0 if year is None else float(year)
+
+
+def rating_key(movie: Movie) -> float:
+    rating = rating_value(movie.rating)
+    return -1.0 if rating is None else rating
+
+
+def watch_date_key(movie: Movie) -> str:
+    # daty w formacie ISO - porządek napisów jest porządkiem dat
+    return str(getattr(movie, "watch_date", None) or "")
+
+
+SORT_KEYS: Dict[str, Callable[[Movie], Any]] = {
+    SORT_TITLE: title_key,
+    SORT_YEAR: year_key,
+    SORT_RATING: rating_key,
+    SORT_WATCH_DATE: watch_date_key,
+}
+
+
+# Filmy posortowane rosnąco wg jednego klucza. Wpis to (klucz, numer kolejny), więc remisy
+# zachowują kolejność dodania, a każdy wpis jest unikalny i można go znaleźć przez bisect.
+class SortedView:
+    def __init__(self) -> None:
+        self._entries: List[Tuple[Any, int]] = []
+        self.movies: List[Movie] = []
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def __iter__(self) -> Iterator[Movie]:
+        return iter(self.movies)
+
+    def keys(self) -> List[Any]:
+        return [key for key, _order in self._entries]
+
+    def orders(self) -> List[int]:
+        return [order for _key, order in self._entries]
+
+    def ordered(self, descending: bool = False) -> List[Movie]:
+        return self.movies[::-1] if descending else list(self.movies)
+
+    def load(self, keys: List[Any], movies: List[Movie]) -> None:
+        # numer kolejny = pozycja na liście; sortowanie stabilne po samym kluczu daje ten sam
+        # porządek co po (klucz, numer), a porównuje proste wartości zamiast krotek
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._entries = [(keys[i], i) for i in order]
+        self.movies = [movies[i] for i in order]
+
+    def insert(self, entry: Tuple[Any, int], movie: Movie) -> int:
+        position = bisect_right(self._entries, entry)
+        self._entries.insert(position, entry)
+        self.movies.insert(position, movie)
+        return position
+
+    def remove(self, entry: Tuple[Any, int]) -> int:
+        position = bisect_left(self._entries, entry)
+        del self._entries[position]
+        del self.movies[position]
+        return position
+
+
+# Posortowane widoki kolekcji dla każdego klucza sortowania, utrzymywane przy każdej zmianie:
+# wstawienie i zmiana filmu to wyszukiwanie binarne w każdym widoku, a zmiana porządku
+# (także odwrócenie) nie wymaga sortowania. Klucze filmu są pamiętane, więc stary wpis
+# znajdujemy także po zmianie pól obiektu w miejscu.
+class SortedViews(CollectionListener):
+    def __init__(self, collection: MovieCollection, keys: Optional[Dict[str, Callable[[Movie], Any]]] = None) -> None:
+        self.key_functions: Dict[str, Callable[[Movie], Any]] = dict(keys or SORT_KEYS)
+        self.views: Dict[str, SortedView] = {mode: SortedView() for mode in self.key_functions}
+        # id(film) -> (numer kolejny, klucze w kolejności key_functions)
+        self._cached: Dict[int, Tuple[int, Tuple[Any, ...]]] = {}
+        self._counter: int = 0
+        # numer kolejny filmu w każdym wierszu kolekcji - pozwala zamienić widok na wiersze bez słownika
+        self._row_orders: List[int] = []
+        collection.subscribe(self)
+
+    def view(self, mode: str) -> SortedView:
+        return self.views[mode]
+
+    def ordered(self, mode: str, descending: bool = False) -> List[Movie]:
+        return self.views[mode].ordered(descending)
+
+    def rows(self, mode: str) -> np.ndarray:
+        # wiersze kolekcji w kolejności widoku (rosnąco)
+        inverse = np.empty(self._counter, dtype=np.int64)
+        inverse[np.array(self._row_orders, dtype=np.int64)] = np.arange(len(self._row_orders), dtype=np.int64)
+        return inverse[np.array(self.views[mode].orders(), dtype=np.int64)]
+
+    def sort_key(self, mode: str, movie: Movie) -> Any:
+        # klucz bieżącego stanu filmu (np. po zmianie pól, zanim widoki dostaną powiadomienie)
+        return self.key_functions[mode](movie)
+
+    def _keys(self, movie: Movie) -> Tuple[Any, ...]:
+        return tuple(key(movie) for key in self.key_functions.values())
+
+    def _add(self, movie: Movie, order: Optional[int] = None) -> int:
+        if order is None:
+            order = self._counter
+            self._counter += 1
+        keys = self._keys(movie)
+        self._cached[id(movie)] = (order, keys)
+        for view, key in zip(self.views.values(), keys):
+            view.insert((key, order), movie)
+        return order
+
+    def _drop(self, movie: Movie) -> int:
+        order, keys = self._cached.pop(id(movie))
+        for view, key in zip(self.views.values(), keys):
+            view.remove((key, order))
+        return order
+
+    # --- obserwator kolekcji ---
+
+    def collection_reset(self, collection: MovieCollection) -> None:
+        movies = collection.movies
+        # klucze liczone kolumnami (jedna funkcja na cały przebieg) - szybciej przy dużych kolekcjach
+        columns = [[key(movie) for movie in movies] for key in self.key_functions.values()]
+        self._cached = dict(zip(map(id, movies), zip(range(len(movies)), zip(*columns))))
+        self._counter = len(movies)
+        self._row_orders = list(range(len(movies)))
+        for view, keys in zip(self.views.values(), columns):
+            view.load(keys, movies)
+
+    def collection_changed(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        if old is not None and new is not None:
+            if old.movie is new.movie and self._cached[id(new.movie)][1] == self._keys(new.movie):
+                return
+            # edycja - film zachowuje swoje miejsce wśród remisów
+            self._add(new.movie, self._drop(old.movie))
+        elif old is not None:
+            self._drop(old.movie)
+            del self._row_orders[row]
+        elif new is not None:
+            self._row_orders.insert(row, self._add(new.movie))
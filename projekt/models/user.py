@@ -1,10 +1,12 @@
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
 from models.movie import Movie
 
 class User:
+    __slots__ = ("id", "username", "password", "email", "created_at", "last_login", "_movies", "_movie_loader")
+
     def __init__(self, username: str, password: str, email: str = "") -> None:
         if not username:
             raise ValueError("Nazwa uzytkownika wymagana")
@@ -19,7 +21,29 @@ class User:
         self.email: str = email
         self.created_at: datetime = datetime.now()
         self.last_login: str = self.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        self.movies: List[Movie] = []
+        self._movie_loader: Optional[Callable[[], List[Movie]]] = None
+        self.movies = []
+
+    @property
+    def movies(self) -> List[Movie]:
+        # kolekcja wczytywana leniwie - dopiero przy pierwszym odwołaniu (np. po zalogowaniu)
+        if self._movies is None:
+            loader, self._movie_loader = self._movie_loader, None
+            self._movies = loader() if loader else []
+        return self._movies
+
+    @movies.setter
+    def movies(self, movies: List[Movie]) -> None:
+        self._movies = movies
+        self._movie_loader = None
+
+    @property
+    def movies_loaded(self) -> bool:
+        return self._movies is not None
+
+    def set_movie_loader(self, loader: Callable[[], List[Movie]]) -> None:
+        self._movies = None
+        self._movie_loader = loader
 
     def check_password(self, password: str) -> bool:
         return self.password == password
@@ -27,25 +51,32 @@ class User:
     def update_last_login(self) -> None:
         self.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def to_dict(self, include_movies: bool = True) -> Dict[str, Any]:
+        data = {
             "id": self.id,
             "username": self.username,
             "password": self.password,
             "email": self.email,
             "created_at": str(self.created_at),
             "last_login": self.last_login,
-            "movies": [movie.to_dict() for movie in self.movies]
         }
+        if include_movies:
+            data["movies"] = [movie.to_dict() for movie in self.movies]
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "User":
         user = cls.__new__(cls)
+        user._movie_loader = None
         user.id = data["id"]
         user.username = data["username"]
         user.password = data["password"]
         user.email = data.get("email", "")
         user.created_at = data.get("created_at", "")
         user.last_login = data.get("last_login")
-        user.movies = [Movie.from_dict(m) for m in data.get("movies", [])]
+        if "movies" in data:
+            user.movies = [Movie.from_dict(m) for m in data["movies"]]
+        else:
+            # rekord bez filmów (np. indeks kont) - kolekcja niewczytana, zob. movies_loaded
+            user._movies = None
         return user
@@ -0,0 +1,212 @@
+import threading
+import time
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.movie import Movie
+from models.user import User
+from storage.base import StorageBackend
+
+
+# Opakowuje dowolny backend: zapisy z GUI tylko oznaczają stan jako zmieniony,
+# a wątek w tle scala je i zapisuje po krótkim czasie bez kolejnych zmian.
+class BackgroundWriter(StorageBackend):
+    def __init__(self, backend: StorageBackend, delay: float = 0.5, max_delay: float = 5.0) -> None:
+        self.backend: StorageBackend = backend
+        self.delay: float = delay
+        self.max_delay: float = max_delay
+
+        self._condition = threading.Condition()
+        # oczekujące zmiany to wyłącznie kopie i rekordy - wątek zapisujący nie czyta obiektów,
+        # które GUI może w tym czasie zmieniać
+        self._full_save: Optional[List[Dict[str, Any]]] = None
+        self._users: Dict[str, User] = {}
+        self._deleted_users: Dict[str, User] = {}
+        self._movies: Dict[Tuple[str, str], Tuple[User, Movie]] = {}
+        self._deleted_movies: Dict[Tuple[str, str], User] = {}
+        # nowe filmy z importu: (użytkownik, rekordy filmów) - jedna pozycja na całą paczkę
+        self._movie_batches: List[Tuple[User, List[Dict[str, Any]]]] = []
+        self._first_change: float = 0.0
+        self._last_change: float = 0.0
+        self._flush_requested: bool = False
+        self._writing: bool = False
+        self._stopping: bool = False
+
+        # liczniki do podglądu, ile zapisów udało się scalić
+        self.requested_writes: int = 0
+        self.performed_writes: int = 0
+
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+
+    # --- operacje z GUI: tylko oznaczenie zmian ---
+
+    def _mark_dirty(self) -> None:
+        now = time.monotonic()
+        if not self._has_pending():
+            self._first_change = now
+        self._last_change = now
+        self.requested_writes += 1
+        self._condition.notify_all()
+
+    def _has_pending(self) -> bool:
+        return bool(self._full_save is not None or self._users or self._deleted_users
+                    or self._movies or self._deleted_movies or self._movie_batches)
+
+    @staticmethod
+    def _account(user: User) -> User:
+        # kopia samego konta, bez kolekcji filmów - z użytkownika przy filmach backend czyta tylko id
+        return User.from_dict(user.to_dict(include_movies=False))
+
+    def save_users(self, users: List[User]) -> None:
+        # niewczytane kolekcje zostają bez filmów w rekordzie - backend nie przepisuje ich kopii na dysku
+        data = [user.to_dict(include_movies=user.movies_loaded) for user in users]
+        with self._condition:
+            # pełny zapis obejmuje wszystkie oczekujące zmiany
+            self._full_save = data
+            self._users.clear()
+            self._deleted_users.clear()
+            self._movies.clear()
+            self._deleted_movies.clear()
+            self._movie_batches.clear()
+            self._mark_dirty()
+
+    def save_user(self, user: User) -> None:
+        account = self._account(user)
+        with self._condition:
+            self._deleted_users.pop(user.id, None)
+            self._users[user.id] = account
+            self._mark_dirty()
+
+    def delete_user(self, user: User) -> None:
+        account = self._account(user)
+        with self._condition:
+            self._users.pop(user.id, None)
+            for key in [key for key in self._movies if key[0] == user.id]:
+                del self._movies[key]
+            for key in [key for key in self._deleted_movies if key[0] == user.id]:
+                del self._deleted_movies[key]
+            self._movie_batches = [batch for batch in self._movie_batches if batch[0].id != user.id]
+            self._deleted_users[user.id] = account
+            self._mark_dirty()
+
+    def save_movie(self, user: User, movie: Movie) -> None:
+        snapshot = Movie.from_dict(movie.to_dict())
+        account = self._account(user)
+        with self._condition:
+            key = (user.id, movie.id)
+            self._deleted_movies.pop(key, None)
+            self._movies[key] = (account, snapshot)
+            self._mark_dirty()
+
+    def save_movies(self, user: User, movies: Iterable[Movie]) -> None:
+        # import: jedna paczka zamiast wpisu na każdy film; same rekordy (bez kopii Movie)
+        # powstają tutaj, obiekty Movie odtwarza już wątek zapisujący
+        records = [movie.to_dict() for movie in movies]
+        if not records:
+            return
+        account = self._account(user)
+        with self._condition:
+            self._movie_batches.append((account, records))
+            self._mark_dirty()
+
+    def delete_movie(self, user: User, movie_id: str) -> None:
+        account = self._account(user)
+        with self._condition:
+            key = (user.id, movie_id)
+            self._movies.pop(key, None)
+            self._deleted_movies[key] = account
+            self._mark_dirty()
+
+    def load_users(self) -> List[User]:
+        self.flush()
+        return self.backend.load_users()
+
+    # --- zapytania widzą dane dopiero po zapisie, więc najpierw opróżniamy kolejkę ---
+
+    def query_movie_ids(self, user: User, genre: Optional[str] = None, status: Optional[str] = None,
+                        order_by: str = "title", descending: bool = False) -> List[str]:
+        self.flush()
+        return self.backend.query_movie_ids(user, genre, status, order_by, descending)
+
+    def movie_statistics(self, user: User, top_n: int = 3) -> Dict[str, Any]:
+        self.flush()
+        return self.backend.movie_statistics(user, top_n)
+
+    # --- trwałość ---
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            if not self._has_pending() and not self._writing:
+                return True
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._has_pending() and not self._writing, timeout)
+
+    def close(self) -> None:
+        with self._condition:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.backend.close()
+
+    # --- wątek zapisujący ---
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._has_pending() or self._stopping)
+                if not self._has_pending():
+                    return
+
+                # czekamy, aż zmiany ucichną (ale nie dłużej niż max_delay od pierwszej)
+                while not (self._flush_requested or self._stopping):
+                    deadline = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = (self._full_save, self._users, self._deleted_users, self._movie_batches,
+                         self._movies, self._deleted_movies)
+                self._full_save = None
+                self._users, self._deleted_users = {}, {}
+                self._movie_batches = []
+                self._movies, self._deleted_movies = {}, {}
+                self._flush_requested = False
+                self._writing = True
+
+            try:
+                self._write(*batch)
+            except Exception as e:
+                print(f"Nie udało się zapisać zmian w tle: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self.performed_writes += 1
+                    self._condition.notify_all()
+
+    def _write(
+        self,
+        full_save: Optional[List[Dict[str, Any]]],
+        users: Dict[str, User],
+        deleted_users: Dict[str, User],
+        movie_batches: List[Tuple[User, List[Dict[str, Any]]]],
+        movies: Dict[Tuple[str, str], Tuple[User, Movie]],
+        deleted_movies: Dict[Tuple[str, str], User]
+    ) -> None:
+        if full_save is not None:
+            self.backend.save_users([User.from_dict(data) for data in full_save])
+            # zmiany zgłoszone po pełnym zapisie (ten sam okres scalania) idą za nim
+            if not (users or deleted_users or movie_batches or movies or deleted_movies):
+                return
+        # filmy z paczek importu przed pojedynczymi zapisami - późniejsza edycja filmu wygrywa
+        imported = ((user, Movie.from_dict(data)) for user, records in movie_batches for data in records)
+        self.backend.write_batch(
+            users.values(),
+            chain(imported, movies.values()),
+            [(user, movie_id) for (_, movie_id), user in deleted_movies.items()],
+            deleted_users.values()
+        )
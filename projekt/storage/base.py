@@ -0,0 +1,145 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.movie import Movie
+from models.user import User
+
+SORT_KEYS = ("title", "year", "rating", "watch_date")
+
+
+def is_watched(status: Optional[str]) -> bool:
+    return (status or "").lower().startswith("obejrzano")
+
+
+def year_value(year: Any) -> Optional[int]:
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return None
+
+
+def rating_value(rating: Any) -> Optional[float]:
+    if rating is None or rating == "":
+        return None
+    try:
+        return float(rating)
+    except (TypeError, ValueError):
+        return None
+
+
+# load_users zwraca listę, którą UserManager modyfikuje w miejscu - backend może trzymać do niej referencję
+class StorageBackend(ABC):
+    @abstractmethod
+    def load_users(self) -> List[User]:
+        pass
+
+    @abstractmethod
+    def save_users(self, users: List[User]) -> None:
+        pass
+
+    @abstractmethod
+    def save_user(self, user: User) -> None:
+        pass
+
+    @abstractmethod
+    def delete_user(self, user: User) -> None:
+        pass
+
+    @abstractmethod
+    def save_movie(self, user: User, movie: Movie) -> None:
+        pass
+
+    @abstractmethod
+    def delete_movie(self, user: User, movie_id: str) -> None:
+        pass
+
+    def save_movies(self, user: User, movies: Iterable[Movie]) -> None:
+        # wiele nowych filmów jednego użytkownika (import) - jedna paczka zapisu
+        self.write_batch((), ((user, movie) for movie in movies), (), ())
+
+    def write_batch(
+        self,
+        users: Iterable[User],
+        movies: Iterable[Tuple[User, Movie]],
+        deleted_movies: Iterable[Tuple[User, str]],
+        deleted_users: Iterable[User]
+    ) -> None:
+        # kolejność: najpierw konta (film wymaga istniejącego użytkownika), na końcu usunięcia kont
+        for user in users:
+            self.save_user(user)
+        for user, movie in movies:
+            self.save_movie(user, movie)
+        for user, movie_id in deleted_movies:
+            self.delete_movie(user, movie_id)
+        for user in deleted_users:
+            self.delete_user(user)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # backendy synchroniczne zapisują od razu - nie ma na co czekać
+        return True
+
+    def close(self) -> None:
+        pass
+
+    # --- zapytania; domyślnie liczone w Pythonie na wczytanej kolekcji ---
+
+    def query_movie_ids(
+        self,
+        user: User,
+        genre: Optional[str] = None,
+        status: Optional[str] = None,
+        order_by: str = "title",
+        descending: bool = False
+    ) -> List[str]:
+        return query_movie_ids(user.movies, genre, status, order_by, descending)
+
+    def movie_statistics(self, user: User, top_n: int = 3) -> Dict[str, Any]:
+        return movie_statistics(user.movies, top_n)
+
+
+def query_movie_ids(
+    movies: List[Movie],
+    genre: Optional[str] = None,
+    status: Optional[str] = None,
+    order_by: str = "title",
+    descending: bool = False
+) -> List[str]:
+    if order_by not in SORT_KEYS:
+        raise ValueError(f"Nieznany klucz sortowania: {order_by}")
+
+    movies = [
+        m for m in movies
+        if (genre is None or m.genre == genre)
+        and (status is None or (m.status or "").startswith(status))
+    ]
+
+    if order_by == "title":
+        key = lambda m: (m.title or "").casefold()
+    elif order_by == "year":
+        key = lambda m: year_value(m.year)
+    elif order_by == "rating":
+        key = lambda m: rating_value(m.rating)
+    else:
+        key = lambda m: m.watch_date or None
+
+    # puste wartości zawsze na końcu, niezależnie od kierunku sortowania
+    present = [m for m in movies if key(m) is not None]
+    missing = [m for m in movies if key(m) is None]
+    present.sort(key=key, reverse=descending)
+    return [m.id for m in present + missing]
+
+
+def movie_statistics(movies: List[Movie], top_n: int = 3) -> Dict[str, Any]:
+    rated = [(rating_value(m.rating), m) for m in movies]
+    rated = [(r, m) for r, m in rated if r is not None]
+    watched = sum(1 for m in movies if is_watched(m.status))
+    top = sorted(rated, key=lambda pair: pair[0], reverse=True)[:top_n]
+    return {
+        "count": len(movies),
+        "average_rating": sum(r for r, _ in rated) / len(rated) if rated else None,
+        "genres": dict(Counter(m.genre for m in movies if m.genre)),
+        "watched": watched,
+        "unwatched": len(movies) - watched,
+        "top_rated": [m.id for _, m in top],
+    }
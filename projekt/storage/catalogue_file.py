@@ -0,0 +1,169 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from exceptions.exceptions import WrongFileLoading
+from utils.json_stream import iter_json_array
+
+# Skompilowany katalog filmów (plik .moviecat):
+#   nagłówek | rekordy (JSON w UTF-8, jeden po drugim) | tytuły (UTF-8) | indeks
+# Indeks ma stałą szerokość wpisu, więc i-ty film znajdujemy bez przeglądania pliku.
+# Lista potrzebuje tylko indeksu i tytułów - rekordów (opisy, komentarze) nie dotyka.
+MAGIC = b"MOVIECAT"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQ")   # magic, wersja, zarezerwowane, liczba filmów, offsety: rekordy, tytuły, indeks
+ENTRY = struct.Struct("<QIQIi")       # offset rekordu, długość rekordu, offset tytułu, długość tytułu, rok
+NO_YEAR = -(2 ** 31)
+
+
+def compiled_path_for(catalogue_path: Union[str, Path]) -> Path:
+    catalogue_path = Path(catalogue_path)
+    return catalogue_path.with_name(catalogue_path.stem + ".moviecat")
+
+
+def _year(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return NO_YEAR
+
+
+def write_catalogue(filename: Union[str, Path], movies: Iterable[Dict[str, Any]]) -> int:
+    # zapis strumieniowy: w pamięci są tylko wpisy indeksu i tytuły, rekordy idą prosto do pliku
+    tmp_file = f"{filename}.tmp"
+    entries = bytearray()
+    titles = bytearray()
+    count = 0
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            offset = HEADER.size
+            for movie in movies:
+                record = json.dumps(movie, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                title = str(movie.get("title", "")).encode("utf-8")
+                entries += ENTRY.pack(offset, len(record), len(titles), len(title), _year(movie.get("year")))
+                titles += title
+                f.write(record)
+                offset += len(record)
+                count += 1
+            titles_offset = offset
+            f.write(titles)
+            index_offset = titles_offset + len(titles)
+            f.write(entries)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, count, HEADER.size, titles_offset, index_offset))
+        os.replace(tmp_file, filename)
+    except OSError as e:
+        raise WrongFileLoading(f"Błąd podczas zapisywania katalogu: {e}")
+    return count
+
+
+def compile_catalogue(json_file: Union[str, Path], compiled_file: Optional[Union[str, Path]] = None) -> Path:
+    compiled_file = Path(compiled_file) if compiled_file is not None else compiled_path_for(json_file)
+    try:
+        write_catalogue(compiled_file, iter_json_array(json_file))
+    except json.JSONDecodeError as e:
+        raise WrongFileLoading(f"Nieprawidłowy format JSON: {e}")
+    return compiled_file
+
+
+# Katalog tylko do odczytu, czytany przez mmap. Tytuł i rok pochodzą z indeksu,
+# pełny rekord jest dekodowany dopiero przy odwołaniu do konkretnego filmu.
+class BinaryCatalogue:
+    def __init__(self, filename: Union[str, Path]) -> None:
+        self.filename = Path(filename)
+        try:
+            self._file = open(filename, "rb")
+        except OSError as e:
+            raise WrongFileLoading(f"Nie udało się otworzyć katalogu: {e}")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _reserved, count, records, titles, index = HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error) as e:
+            self._file.close()
+            raise WrongFileLoading(f"Uszkodzony plik katalogu: {e}")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise WrongFileLoading("Nieobsługiwany format katalogu")
+        self._count: int = count
+        self._records: int = records
+        self._titles: int = titles
+        self._index: int = index
+
+    @classmethod
+    def open_for(cls, json_file: Union[str, Path]) -> "BinaryCatalogue":
+        # kompiluje katalog, gdy nie ma wersji binarnej albo plik JSON jest nowszy
+        json_file = Path(json_file)
+        compiled = compiled_path_for(json_file)
+        if not compiled.exists() or (json_file.exists() and compiled.stat().st_mtime < json_file.stat().st_mtime):
+            compile_catalogue(json_file, compiled)
+        return cls(compiled)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def fingerprint(self) -> str:
+        # skrót surowych bajtów rekordów - zmienia się razem z treścią katalogu (także reżyserami,
+        # których nie ma w indeksie), a nie wymaga ponownego dekodowania JSON każdego filmu
+        with memoryview(self._map) as view, view[self._records:self._titles] as records:
+            return hashlib.sha1(records).hexdigest()
+
+    def _entry(self, i: int):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return ENTRY.unpack_from(self._map, self._index + i * ENTRY.size)
+
+    def title(self, i: int) -> str:
+        _offset, _length, title_offset, title_length, _year = self._entry(i)
+        start = self._titles + title_offset
+        return self._map[start:start + title_length].decode("utf-8")
+
+    def year(self, i: int) -> Optional[int]:
+        year = self._entry(i)[4]
+        return None if year == NO_YEAR else year
+
+    def label(self, i: int) -> str:
+        _offset, _length, title_offset, title_length, year = self._entry(i)
+        start = self._titles + title_offset
+        title = self._map[start:start + title_length].decode("utf-8")
+        return f"{title} ({'' if year == NO_YEAR else year})"
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        offset, length = self._entry(i)[:2]
+        return json.loads(self._map[offset:offset + length].decode("utf-8"))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._count):
+            yield self[i]
+
+    def titles(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self.title(i)
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "BinaryCatalogue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    # Uruchomienie (z katalogu projekt): python -m storage.catalogue_file [katalog.json] [wynik.moviecat]
+    import sys
+
+    base_dir = Path(__file__).resolve().parent.parent
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / "data" / "sample_movies.json"
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    compiled = compile_catalogue(source, target)
+    with BinaryCatalogue(compiled) as catalogue:
+        print(f"Zapisano {len(catalogue)} filmów do {compiled} ({compiled.stat().st_size / 2**10:.1f} KB)")
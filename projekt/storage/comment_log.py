@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from exceptions.exceptions import WrongFileLoading
+
+
+def catalogue_key(movie: Dict[str, Any]) -> str:
+    # film w katalogu nie ma własnego id - tytuł i rok przetrwają przebudowę i zmianę kolejności katalogu
+    return f"{str(movie.get('title', '')).casefold()}|{movie.get('year', '')}"
+
+
+def comment_log_path_for(catalogue_path: Union[str, Path]) -> Path:
+    catalogue_path = Path(catalogue_path)
+    return catalogue_path.with_name(catalogue_path.stem + ".comments.jsonl")
+
+
+# Komentarze do filmów katalogu w osobnym pliku dopisywanym na końcu (JSON Lines):
+#   {"movie": klucz filmu, "user": ..., "comment": ..., "date": ...}
+# W pamięci jest tylko indeks: klucz filmu -> offsety jego wierszy. Dodanie komentarza to
+# jeden zapis na końcu pliku, a strona komentarzy czyta z dysku tylko swoje wiersze.
+class CommentLog:
+    def __init__(self, filename: Union[str, Path]) -> None:
+        self.filename = Path(filename)
+        self._offsets: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        # ostatni wiersz bez końca linii (przerwany zapis) - kolejny wpis zaczynamy od nowej linii
+        self._broken_tail: bool = False
+        self._scan()
+
+    def _scan(self) -> None:
+        if not self.filename.exists():
+            return
+        try:
+            with open(self.filename, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        self._broken_tail = True
+                        break
+                    try:
+                        self._offsets.setdefault(json.loads(line)["movie"], []).append(offset)
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                    offset += len(line)
+        except OSError as e:
+            raise WrongFileLoading(f"Nie udało się wczytać komentarzy katalogu: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(offsets) for offsets in self._offsets.values())
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._offsets.get(key, ()))
+
+    def comments(self, key: str, start: int = 0, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        with self._lock:
+            offsets = self._offsets.get(key, [])
+            offsets = offsets[start:] if limit is None else offsets[start:start + limit]
+        if not offsets:
+            return []
+        page = []
+        try:
+            with open(self.filename, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    entry = json.loads(f.readline())
+                    del entry["movie"]
+                    page.append(entry)
+        except OSError as e:
+            raise WrongFileLoading(f"Nie udało się wczytać komentarzy katalogu: {e}")
+        return page
+
+    def append(self, key: str, entry: Dict[str, str]) -> None:
+        line = json.dumps({"movie": key, **entry}, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            try:
+                with open(self.filename, "ab") as f:
+                    if self._broken_tail:
+                        f.write(b"\n")
+                        self._broken_tail = False
+                    offset = f.tell()
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                raise WrongFileLoading(f"Błąd podczas zapisywania komentarza: {e}")
+            self._offsets.setdefault(key, []).append(offset)
+
+    def page(self, movie: Dict[str, Any], start: int = 0,
+             limit: Optional[int] = None) -> Tuple[List[Dict[str, str]], int]:
+        # komentarze zapisane jeszcze w samym katalogu idą przed komentarzami z pliku
+        embedded = movie.get("comments") or []
+        key = catalogue_key(movie)
+        total = len(embedded) + self.count(key)
+        end = total if limit is None else min(total, start + limit)
+        entries = list(embedded[start:end])
+        if end > len(embedded):
+            first = max(start, len(embedded))
+            entries += self.comments(key, first - len(embedded), end - first)
+        return entries, total
+
+    def merged(self, movie: Dict[str, Any]) -> Dict[str, Any]:
+        # rekord ze wszystkimi komentarzami (do indeksu wyszukiwania albo kopii na listę użytkownika)
+        if not self.count(catalogue_key(movie)):
+            return movie
+        return dict(movie, comments=self.page(movie)[0])
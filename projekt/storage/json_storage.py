@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from exceptions.exceptions import WrongFileLoading
+from models.movie import Movie
+from models.user import User
+from storage.base import StorageBackend
+from utils.journal import Journal
+from utils.json_stream import iter_json_array
+from utils.user_shards import UserShardStore
+
+
+class JsonStorage(StorageBackend):
+    # po przekroczeniu tego rozmiaru dziennik jest scalany z plikiem users.json w tle
+    JOURNAL_COMPACT_THRESHOLD: int = 1024 * 1024
+
+    def __init__(self, data_file: Union[str, Path], use_journal: bool = False, sharded: bool = False) -> None:
+        if use_journal and sharded:
+            raise ValueError("Tryb dziennika i tryb podziału na pliki użytkowników wykluczają się")
+        self.data_file: Path = Path(data_file)
+        self.journal: Optional[Journal] = Journal(f"{data_file}.journal") if use_journal else None
+        # data/users.json -> katalog data/users/ z indeksem i kolekcjami użytkowników
+        self.shards: Optional[UserShardStore] = UserShardStore(self.data_file.with_suffix("")) if sharded else None
+        self._journal_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    # --- zapis przyrostowy: zmiany jako rekordy dziennika, bez sięgania do obiektów User ---
+
+    def save_user(self, user: User) -> None:
+        self.write_batch((user,), (), (), ())
+
+    def delete_user(self, user: User) -> None:
+        self.write_batch((), (), (), (user,))
+
+    def save_movie(self, user: User, movie: Movie) -> None:
+        self.write_batch((), ((user, movie),), (), ())
+
+    def delete_movie(self, user: User, movie_id: str) -> None:
+        self.write_batch((), (), ((user, movie_id),), ())
+
+    def write_batch(
+        self,
+        users: Iterable[User],
+        movies: Iterable[Tuple[User, Movie]],
+        deleted_movies: Iterable[Tuple[User, str]],
+        deleted_users: Iterable[User]
+    ) -> None:
+        # kolejność jak w StorageBackend; z użytkowników przy filmach czytane jest tylko id
+        records = [{"op": "user", "data": user.to_dict(include_movies=False)} for user in users]
+        records += [{"op": "movie", "user_id": user.id, "data": movie.to_dict()} for user, movie in movies]
+        records += [{"op": "movie_delete", "user_id": user.id, "id": movie_id} for user, movie_id in deleted_movies]
+        records += [{"op": "user_delete", "id": user.id} for user in deleted_users]
+        if not records:
+            return
+        if self.journal is not None:
+            # cała paczka to jeden zapis do dziennika (jedno fsync)
+            self._append_journal(*records)
+        elif self.shards is not None:
+            self._apply_to_shards(records)
+        else:
+            # bez dziennika paczka jest nakładana na plik users.json - jeden zapis pliku
+            try:
+                with self._journal_lock:
+                    user_data = self._read_snapshot()
+                    self._apply_journal(user_data, records)
+                    self._write_snapshot(user_data)
+            except Exception as e:
+                print(f"Nie udało się zapisać zmian: {e}")
+
+    def _apply_to_shards(self, records: List[Dict[str, Any]]) -> None:
+        # indeks i plik kolekcji każdego użytkownika czytane i zapisywane co najwyżej raz na paczkę
+        account_ops = [record for record in records if record["op"] in ("user", "user_delete")]
+        deleted = {record["id"] for record in records if record["op"] == "user_delete"}
+        movie_ops: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            if record["op"] in ("movie", "movie_delete") and record["user_id"] not in deleted:
+                movie_ops.setdefault(record["user_id"], []).append(record)
+
+        try:
+            if account_ops:
+                index = self.shards.read_index() if self.shards.exists() else []
+                self._apply_journal(index, account_ops)
+                self.shards.write_index([{k: v for k, v in data.items() if k != "movies"} for data in index])
+            for user_id in deleted:
+                self.shards.delete_movies(user_id)
+            for user_id, ops in movie_ops.items():
+                shard = [{"id": user_id, "movies": self.shards.read_movie_data(user_id)}]
+                self._apply_journal(shard, ops)
+                self.shards.write_movie_data(user_id, shard[0]["movies"])
+        except (OSError, WrongFileLoading) as e:
+            print(f"Nie udało się zapisać zmian w katalogu {self.shards.directory}: {e}")
+
+    def _append_journal(self, *records: Dict[str, Any]) -> None:
+        try:
+            with self._journal_lock:
+                size = self.journal.append_many(records)
+        except OSError as e:
+            print(f"Nie udało się zapisać zmiany do dziennika: {e}")
+            return
+        if size >= self.JOURNAL_COMPACT_THRESHOLD:
+            self.compact_journal()
+
+    def compact_journal(self, wait: bool = False) -> None:
+        if self.journal is None:
+            return
+        with self._journal_lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            if self.journal.rotate() is None:
+                return
+            self._compaction_thread = threading.Thread(target=self._compact, name="journal-compaction")
+            self._compaction_thread.start()
+        if wait:
+            self.wait_for_compaction()
+
+    def wait_for_compaction(self) -> None:
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+
+    def close(self) -> None:
+        self.wait_for_compaction()
+
+    def _compact(self) -> None:
+        # scala stary plik users.json z odłożonym dziennikiem - działa wyłącznie na plikach,
+        # więc nie dotyka obiektów modyfikowanych w tym czasie przez GUI
+        try:
+            user_data = self._read_snapshot()
+            self._apply_journal(user_data, Journal.read(self.journal.rotated_path))
+            self._write_snapshot(user_data)
+            os.remove(self.journal.rotated_path)
+            print(f"Scalono dziennik z plikiem {self.data_file}")
+        except Exception as e:
+            print(f"Nie udało się scalić dziennika: {e}")
+
+    @staticmethod
+    def _apply_journal(user_data: List[Dict[str, Any]], records: Iterable[Dict[str, Any]]) -> None:
+        by_id: Dict[str, Dict[str, Any]] = {data["id"]: data for data in user_data}
+        # id filmu -> pozycja na liście użytkownika, budowane przy pierwszym rekordzie filmu danego użytkownika
+        positions: Dict[str, Dict[str, int]] = {}
+
+        for record in records:
+            op = record.get("op")
+            if op == "user":
+                data = record["data"]
+                existing = by_id.get(data["id"])
+                if existing is None:
+                    existing = dict(data, movies=[])
+                    user_data.append(existing)
+                    by_id[data["id"]] = existing
+                else:
+                    existing.update(data)
+            elif op == "user_delete":
+                existing = by_id.pop(record["id"], None)
+                positions.pop(record["id"], None)
+                if existing is not None:
+                    user_data.remove(existing)
+            elif op == "movie":
+                existing = by_id.get(record["user_id"])
+                if existing is None:
+                    continue
+                movies = existing.setdefault("movies", [])
+                index = positions.get(record["user_id"])
+                if index is None:
+                    index = positions[record["user_id"]] = {m["id"]: i for i, m in enumerate(movies)}
+                movie = record["data"]
+                position = index.get(movie["id"])
+                if position is None:
+                    index[movie["id"]] = len(movies)
+                    movies.append(movie)
+                else:
+                    movies[position] = movie
+            elif op == "movie_delete":
+                existing = by_id.get(record["user_id"])
+                if existing is not None:
+                    existing["movies"] = [m for m in existing.get("movies", []) if m["id"] != record["id"]]
+                    positions.pop(record["user_id"], None)
+
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.data_file):
+            return []
+        return list(iter_json_array(self.data_file))
+
+    def iter_users(self) -> Iterator[User]:
+        # użytkownicy z pliku users.json tworzeni po jednym, bez parsowania całego pliku naraz
+        if os.path.exists(self.data_file):
+            for data in iter_json_array(self.data_file):
+                yield User.from_dict(data)
+
+    def _write_snapshot(self, user_data: List[Dict[str, Any]]) -> None:
+        tmp_file = f"{self.data_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(user_data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.data_file)
+
+    def save_users(self, users: List[User]) -> None:
+        if self.shards is not None:
+            # zapisujemy tylko kolekcje, które zostały wczytane - pozostałe są na dysku bez zmian
+            try:
+                self.shards.write_index([user.to_dict(include_movies=False) for user in users])
+                for user in users:
+                    if user.movies_loaded:
+                        self.shards.write_movies(user.id, user.movies)
+            except OSError as e:
+                print(f"Nie udało się zapisać użytkowników do katalogu {self.shards.directory}: {e}")
+                return
+            print(f"Zapisano {len(users)} użytkowników do katalogu {self.shards.directory}")
+            return
+
+        try:
+            user_data = []
+            for user in users:
+                data = user.to_dict()
+                for key in ["created_at", "last_login"]:
+                    if isinstance(data.get(key), datetime):
+                        data[key] = data[key].strftime("%Y-%m-%d %H:%M:%S")
+                user_data.append(data)
+
+            self.wait_for_compaction()
+            with self._journal_lock:
+                self._write_snapshot(user_data)
+                # pełny zapis zawiera już wszystkie zmiany z dziennika
+                if self.journal is not None:
+                    self.journal.clear()
+            print(f"Zapisano {len(users)} użytkowników do pliku {self.data_file}")
+        except Exception as e:
+            print(f"Nie udało się zapisać użytkowników: {e}")
+
+    def load_users(self) -> List[User]:
+        if self.shards is not None:
+            return self._load_shard_index()
+
+        if not os.path.exists(self.data_file):
+            print(f"Plik {self.data_file} nie istnieje, tworzenie nowej listy użytkowników")
+
+        pending = list(self.journal.pending_files()) if self.journal is not None else []
+        if pending:
+            user_data = self._read_snapshot()
+            for path in pending:
+                self._apply_journal(user_data, Journal.read(path))
+            users = [User.from_dict(data) for data in user_data]
+        else:
+            users = list(self.iter_users())
+        print(f"Wczytano {len(users)} użytkowników z pliku {self.data_file}")
+
+        if self.journal is not None and self.journal.rotated_path.exists():
+            # przerwane kompaktowanie z poprzedniego uruchomienia - kończymy je teraz
+            self._compact()
+        return users
+
+    def _load_shard_index(self) -> List[User]:
+        if not self.shards.exists() and os.path.exists(self.data_file):
+            # jednorazowe przeniesienie - razem ze zmianami z dziennika, jeśli plik był używany w tym trybie
+            print(f"Przenoszenie danych z pliku {self.data_file} do katalogu {self.shards.directory}")
+            user_data = self._read_snapshot()
+            for path in Journal(f"{self.data_file}.journal").pending_files():
+                self._apply_journal(user_data, Journal.read(path))
+            self.shards.migrate(user_data)
+
+        users = []
+        if self.shards.exists():
+            for data in self.shards.read_index():
+                user = User.from_dict(data)
+                user.set_movie_loader(lambda user_id=user.id: self.shards.read_movies(user_id))
+                users.append(user)
+        print(f"Wczytano {len(users)} użytkowników z katalogu {self.shards.directory}")
+        return users
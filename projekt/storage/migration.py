@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+from typing import Union
+
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SQLiteStorage
+
+
+def migrate_json_to_sqlite(users_file: Union[str, Path], db_file: Union[str, Path]) -> SQLiteStorage:
+    # jednorazowe przeniesienie users.json (wraz z dziennikiem, jeśli istnieje) do bazy SQLite.
+    # Katalog sample_movies.json zostaje w pliku - GUI czyta go przez BinaryCatalogue i CommentLog
+    users = JsonStorage(users_file, use_journal=True).load_users()
+    storage = SQLiteStorage(db_file)
+    storage.save_users(users)
+    return storage
+
+
+def migrate_json_to_shards(users_file: Union[str, Path]) -> JsonStorage:
+    # jednorazowy podział users.json (wraz z dziennikiem) na katalog users/: indeks kont i plik filmów
+    # każdego użytkownika. Przeniesienie wykonuje load_users, gdy katalogu jeszcze nie ma.
+    storage = JsonStorage(users_file, sharded=True)
+    storage.load_users()
+    return storage
+
+
+if __name__ == "__main__":
+    # Uruchomienie (z katalogu projekt): python -m storage.migration [--shards]
+    base_dir = Path(__file__).resolve().parent.parent
+    data_dir = base_dir / "data"
+    if "--shards" in sys.argv[1:]:
+        migrate_json_to_shards(data_dir / "users.json").close()
+    else:
+        migrate_json_to_sqlite(data_dir / "users.json", data_dir / "movies.db").close()
@@ -0,0 +1,290 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from models.movie import Movie
+from models.user import User
+from storage.base import SORT_KEYS, StorageBackend, rating_value, year_value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    username_key TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    email TEXT NOT NULL DEFAULT '',
+    created_at TEXT,
+    last_login TEXT
+);
+
+CREATE TABLE IF NOT EXISTS movies (
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    director TEXT,
+    year INTEGER,
+    genre TEXT,
+    status TEXT,
+    rating REAL,
+    description TEXT,
+    watch_date TEXT,
+    PRIMARY KEY (user_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_movies_id ON movies(id);
+CREATE INDEX IF NOT EXISTS idx_movies_user_position ON movies(user_id, position);
+CREATE INDEX IF NOT EXISTS idx_movies_user_title ON movies(user_id, title_key);
+CREATE INDEX IF NOT EXISTS idx_movies_user_genre ON movies(user_id, genre);
+CREATE INDEX IF NOT EXISTS idx_movies_user_year ON movies(user_id, year);
+CREATE INDEX IF NOT EXISTS idx_movies_user_status ON movies(user_id, status);
+CREATE INDEX IF NOT EXISTS idx_movies_user_rating ON movies(user_id, rating);
+
+CREATE TABLE IF NOT EXISTS comments (
+    user_id TEXT NOT NULL,
+    movie_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    author TEXT,
+    comment TEXT,
+    date TEXT,
+    PRIMARY KEY (user_id, movie_id, position),
+    FOREIGN KEY (user_id, movie_id) REFERENCES movies(user_id, id) ON DELETE CASCADE
+);
+"""
+
+MOVIE_COLUMNS = "id, title, director, year, genre, status, rating, description, watch_date"
+
+ORDER_COLUMNS = {
+    "title": "title_key",
+    "year": "year",
+    "rating": "rating",
+    "watch_date": "NULLIF(watch_date, '')",
+}
+
+
+class SQLiteStorage(StorageBackend):
+    def __init__(self, db_file: Union[str, Path]) -> None:
+        self.db_file: Path = Path(db_file)
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+    # --- użytkownicy ---
+
+    @staticmethod
+    def _user_row(user: User) -> tuple:
+        return (user.id, user.username, user.username.casefold(), user.password, user.email,
+                str(user.created_at), user.last_login)
+
+    def load_users(self) -> List[User]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, username, password, email, created_at, last_login FROM users ORDER BY rowid"
+            ).fetchall()
+        users = []
+        for row in rows:
+            user = User.from_dict(dict(row))
+            user.set_movie_loader(lambda user_id=user.id: self.load_movies(user_id))
+            users.append(user)
+        print(f"Wczytano {len(users)} użytkowników z bazy {self.db_file}")
+        return users
+
+    def save_user(self, user: User) -> None:
+        with self._lock, self.connection:
+            self._upsert_user(user)
+
+    def _upsert_user(self, user: User) -> None:
+        self.connection.execute(
+            "INSERT INTO users (id, username, username_key, password, email, created_at, last_login) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET username = excluded.username, username_key = excluded.username_key, "
+            "password = excluded.password, email = excluded.email, last_login = excluded.last_login",
+            self._user_row(user)
+        )
+
+    def delete_user(self, user: User) -> None:
+        with self._lock, self.connection:
+            self._delete_user(user)
+
+    def _delete_user(self, user: User) -> None:
+        self.connection.execute("DELETE FROM users WHERE id = ?", (user.id,))
+
+    def save_users(self, users: List[User]) -> None:
+        with self._lock, self.connection:
+            ids = [user.id for user in users]
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM keep_ids")
+            self.connection.executemany("INSERT INTO keep_ids VALUES (?)", ((i,) for i in ids))
+            self.connection.execute("DELETE FROM users WHERE id NOT IN (SELECT id FROM keep_ids)")
+            for user in users:
+                self._upsert_user(user)
+                # niewczytane kolekcje są w bazie aktualne - nie ma potrzeby ich przepisywać
+                if user.movies_loaded:
+                    self._replace_movies(user.id, user.movies)
+        print(f"Zapisano {len(users)} użytkowników do bazy {self.db_file}")
+
+    # --- filmy ---
+
+    def load_movies(self, user_id: str) -> List[Movie]:
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT {MOVIE_COLUMNS} FROM movies WHERE user_id = ? ORDER BY position", (user_id,)
+            ).fetchall()
+            comments = self._load_comments(user_id)
+        movies = []
+        for row in rows:
+            data = dict(row)
+            data["comments"] = comments.get(data["id"], [])
+            movies.append(Movie.from_dict(data))
+        return movies
+
+    def _load_comments(self, user_id: str) -> Dict[str, List[Dict[str, str]]]:
+        result: Dict[str, List[Dict[str, str]]] = {}
+        for row in self.connection.execute(
+            "SELECT movie_id, author, comment, date FROM comments WHERE user_id = ? ORDER BY movie_id, position",
+            (user_id,)
+        ):
+            entry = {"user": row["author"], "comment": row["comment"]}
+            if row["date"] is not None:
+                entry["date"] = row["date"]
+            result.setdefault(row["movie_id"], []).append(entry)
+        return result
+
+    @staticmethod
+    def _movie_row(user_id: str, movie: Movie, position: int) -> tuple:
+        year = year_value(movie.year)
+        return (user_id, movie.id, position, movie.title, movie.title.casefold(), movie.director,
+                year if year is not None else (movie.year or None), movie.genre, movie.status,
+                rating_value(movie.rating), movie.description, movie.watch_date)
+
+    def _write_comments(self, user_id: str, movie: Movie) -> None:
+        self.connection.execute("DELETE FROM comments WHERE user_id = ? AND movie_id = ?", (user_id, movie.id))
+        self.connection.executemany(
+            "INSERT INTO comments (user_id, movie_id, position, author, comment, date) VALUES (?, ?, ?, ?, ?, ?)",
+            ((user_id, movie.id, i, c.get("user"), c.get("comment"), c.get("date"))
+             for i, c in enumerate(movie.comments if movie.has_comments else []))
+        )
+
+    def _replace_movies(self, user_id: str, movies: Iterable[Movie]) -> None:
+        self.connection.execute("DELETE FROM movies WHERE user_id = ?", (user_id,))
+        for position, movie in enumerate(movies):
+            self._insert_movie(user_id, movie, position)
+
+    def _insert_movie(self, user_id: str, movie: Movie, position: int) -> None:
+        self.connection.execute(
+            "INSERT INTO movies (user_id, id, position, title, title_key, director, year, genre, status, rating, "
+            "description, watch_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._movie_row(user_id, movie, position)
+        )
+        if movie.has_comments:
+            self._write_comments(user_id, movie)
+
+    def save_movie(self, user: User, movie: Movie) -> None:
+        with self._lock, self.connection:
+            self._upsert_movie(user, movie)
+
+    def _upsert_movie(self, user: User, movie: Movie) -> None:
+        row = self.connection.execute(
+            "SELECT position FROM movies WHERE user_id = ? AND id = ?", (user.id, movie.id)
+        ).fetchone()
+        if row is None:
+            position = self.connection.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM movies WHERE user_id = ?", (user.id,)
+            ).fetchone()[0]
+            self._insert_movie(user.id, movie, position)
+            return
+        self.connection.execute(
+            "UPDATE movies SET title = ?, title_key = ?, director = ?, year = ?, genre = ?, status = ?, "
+            "rating = ?, description = ?, watch_date = ? WHERE user_id = ? AND id = ?",
+            self._movie_row(user.id, movie, row["position"])[3:] + (user.id, movie.id)
+        )
+        self._write_comments(user.id, movie)
+
+    def delete_movie(self, user: User, movie_id: str) -> None:
+        with self._lock, self.connection:
+            self._delete_movie(user, movie_id)
+
+    def _delete_movie(self, user: User, movie_id: str) -> None:
+        self.connection.execute("DELETE FROM movies WHERE user_id = ? AND id = ?", (user.id, movie_id))
+
+    def write_batch(
+        self,
+        users: Iterable[User],
+        movies: Iterable[Tuple[User, Movie]],
+        deleted_movies: Iterable[Tuple[User, str]],
+        deleted_users: Iterable[User]
+    ) -> None:
+        # cała paczka zmian w jednej transakcji - publiczne metody zatwierdzają każdą zmianę osobno,
+        # więc tu wołane są pomocnicze metody bez commita (kolejność jak w StorageBackend.write_batch)
+        with self._lock, self.connection:
+            for user in users:
+                self._upsert_user(user)
+            for user, movie in movies:
+                self._upsert_movie(user, movie)
+            for user, movie_id in deleted_movies:
+                self._delete_movie(user, movie_id)
+            for user in deleted_users:
+                self._delete_user(user)
+
+    # --- zapytania wykonywane w SQL ---
+
+    def query_movie_ids(
+        self,
+        user: User,
+        genre: Optional[str] = None,
+        status: Optional[str] = None,
+        order_by: str = "title",
+        descending: bool = False
+    ) -> List[str]:
+        if order_by not in SORT_KEYS:
+            raise ValueError(f"Nieznany klucz sortowania: {order_by}")
+
+        where = ["user_id = ?"]
+        params: List[Any] = [user.id]
+        if genre is not None:
+            where.append("genre = ?")
+            params.append(genre)
+        if status is not None:
+            where.append("substr(status, 1, length(?)) = ?")
+            params.extend([status, status])
+
+        column = ORDER_COLUMNS[order_by]
+        direction = "DESC" if descending else "ASC"
+        sql = (f"SELECT id FROM movies WHERE {' AND '.join(where)} "
+               f"ORDER BY {column} IS NULL, {column} {direction}, position")
+        with self._lock:
+            return [row[0] for row in self.connection.execute(sql, params)]
+
+    def movie_statistics(self, user: User, top_n: int = 3) -> Dict[str, Any]:
+        with self._lock:
+            totals = self.connection.execute(
+                "SELECT COUNT(*), AVG(rating), "
+                "SUM(CASE WHEN lower(status) LIKE 'obejrzano%' THEN 1 ELSE 0 END) "
+                "FROM movies WHERE user_id = ?", (user.id,)
+            ).fetchone()
+            genres = self.connection.execute(
+                "SELECT genre, COUNT(*) FROM movies WHERE user_id = ? AND genre IS NOT NULL AND genre != '' "
+                "GROUP BY genre ORDER BY MIN(position)", (user.id,)
+            ).fetchall()
+            top = self.connection.execute(
+                "SELECT id FROM movies WHERE user_id = ? AND rating IS NOT NULL "
+                "ORDER BY rating DESC, position LIMIT ?", (user.id, top_n)
+            ).fetchall()
+        count, average, watched = totals[0], totals[1], totals[2] or 0
+        return {
+            "count": count,
+            "average_rating": average,
+            "genres": {genre: n for genre, n in genres},
+            "watched": watched,
+            "unwatched": count - watched,
+            "top_rated": [row[0] for row in top],
+        }
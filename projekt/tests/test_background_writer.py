@@ -0,0 +1,136 @@
+from models.movie import Movie
+from models.user import User
+from storage.background_writer import BackgroundWriter
+from storage.base import StorageBackend
+from storage.json_storage import JsonStorage
+
+
+def movie(title):
+    return Movie(title, "Reżyser", 2000, "Dramat", "Do obejrzenia", None, "")
+
+
+class RecordingBackend(StorageBackend):
+    # zapamiętuje wywołania zamiast zapisywać
+    def __init__(self):
+        self.calls = []
+
+    def load_users(self):
+        return []
+
+    def save_users(self, users):
+        self.calls.append(("save_users", [user.username for user in users]))
+
+    def save_user(self, user):
+        self.calls.append(("save_user", user.username))
+
+    def delete_user(self, user):
+        self.calls.append(("delete_user", user.username))
+
+    def save_movie(self, user, movie):
+        self.calls.append(("save_movie", movie.title))
+
+    def delete_movie(self, user, movie_id):
+        self.calls.append(("delete_movie", movie_id))
+
+    def write_batch(self, users, movies, deleted_movies, deleted_users):
+        self.calls.append(("batch",))
+        super().write_batch(users, movies, deleted_movies, deleted_users)
+
+
+def writer(backend):
+    # długie opóźnienie - wszystko, co zgłoszone przed flush, trafia do jednego zapisu
+    return BackgroundWriter(backend, delay=60, max_delay=60)
+
+
+def test_changes_queued_after_full_save_are_written(tmp_path):
+    storage = writer(JsonStorage(tmp_path / "users.json"))
+    user = User("ala", "haslo")
+    storage.save_users([user])
+    added = movie("Po pełnym zapisie")
+    user.movies.append(added)
+    storage.save_movie(user, added)
+    storage.save_user(User("bob", "haslo"))
+    storage.flush()
+    storage.close()
+
+    users = JsonStorage(tmp_path / "users.json").load_users()
+    assert [u.username for u in users] == ["ala", "bob"]
+    assert [m.title for m in users[0].movies] == ["Po pełnym zapisie"]
+
+
+def test_full_save_discards_earlier_pending_changes():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    storage.save_movie(user, movie("Przed"))
+    storage.save_users([user])
+    storage.flush()
+    storage.close()
+    assert backend.calls == [("save_users", ["ala"])]
+
+
+def test_repeated_saves_are_coalesced():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    m = movie("A")
+    for rating in range(5):
+        m.rating = rating
+        storage.save_movie(user, m)
+    storage.save_user(user)
+    storage.save_user(user)
+    storage.flush()
+    storage.close()
+    assert storage.requested_writes == 7
+    assert storage.performed_writes == 1
+    assert backend.calls == [("batch",), ("save_user", "ala"), ("save_movie", "A")]
+
+
+def test_delete_cancels_pending_save():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    m = movie("A")
+    storage.save_movie(user, m)
+    storage.delete_movie(user, m.id)
+    storage.flush()
+    storage.close()
+    assert backend.calls == [("batch",), ("delete_movie", m.id)]
+
+
+def test_snapshot_is_taken_when_change_is_queued():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    m = movie("Przed")
+    storage.save_movie(user, m)
+    m.title = "Po"
+    storage.flush()
+    storage.close()
+    assert ("save_movie", "Przed") in backend.calls
+
+
+def test_import_batch_is_queued_once_and_later_edit_wins():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    movies = [movie(f"Film {i}") for i in range(3)]
+    storage.save_movies(user, movies)
+    movies[1].title = "Poprawiony"
+    storage.save_movie(user, movies[1])
+    storage.flush()
+    storage.close()
+    assert storage.requested_writes == 2
+    assert backend.calls == [("batch",), ("save_movie", "Film 0"), ("save_movie", "Film 1"),
+                             ("save_movie", "Film 2"), ("save_movie", "Poprawiony")]
+
+
+def test_delete_user_drops_pending_import():
+    backend = RecordingBackend()
+    storage = writer(backend)
+    user = User("ala", "haslo")
+    storage.save_movies(user, [movie("A")])
+    storage.delete_user(user)
+    storage.flush()
+    storage.close()
+    assert backend.calls == [("batch",), ("delete_user", "ala")]
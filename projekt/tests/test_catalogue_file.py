@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from exceptions.exceptions import WrongFileLoading
+from storage.catalogue_file import BinaryCatalogue, compile_catalogue, compiled_path_for
+from utils.trigram_index import TrigramIndex
+
+MOVIES = [
+    {"title": "Obcy", "director": "Ridley Scott", "year": 1979, "comments": [{"user": "ala", "comment": "!"}]},
+    {"title": "Żywot Briana", "director": "Terry Jones", "year": "1979"},
+    {"title": "Bez roku", "director": "Nikt", "year": "dawno"},
+    {"title": "Bez reżysera"},
+]
+
+
+def write_json(path, movies):
+    path.write_text(json.dumps(movies, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    with BinaryCatalogue(compile_catalogue(write_json(tmp_path / "movies.json", MOVIES))) as catalogue:
+        yield catalogue
+
+
+def test_records_titles_and_years_round_trip(catalogue):
+    assert len(catalogue) == len(MOVIES)
+    assert list(catalogue) == MOVIES
+    assert catalogue[1] == MOVIES[1]
+    assert list(catalogue.titles()) == [m["title"] for m in MOVIES]
+    assert [catalogue.year(i) for i in range(len(MOVIES))] == [1979, 1979, None, None]
+    assert catalogue.label(1) == "Żywot Briana (1979)"
+    assert catalogue.label(2) == "Bez roku ()"
+    with pytest.raises(IndexError):
+        catalogue[len(MOVIES)]
+
+
+def test_open_for_recompiles_when_json_is_newer(tmp_path):
+    json_file = write_json(tmp_path / "movies.json", MOVIES)
+    with BinaryCatalogue.open_for(json_file) as catalogue:
+        assert len(catalogue) == len(MOVIES)
+    write_json(json_file, MOVIES[:1])
+    compiled = compiled_path_for(json_file)
+    stamp = compiled.stat().st_mtime
+    os.utime(json_file, (stamp + 10, stamp + 10))
+    with BinaryCatalogue.open_for(json_file) as catalogue:
+        assert list(catalogue) == MOVIES[:1]
+
+
+@pytest.mark.parametrize("content", [b"", b"MOVIECAT", b"NOTACATALOGUE" + b"\0" * 64])
+def test_damaged_file_is_rejected(tmp_path, content):
+    path = tmp_path / "movies.moviecat"
+    path.write_bytes(content)
+    with pytest.raises(WrongFileLoading):
+        BinaryCatalogue(path)
+
+
+def test_fingerprint_follows_record_content(tmp_path):
+    def fingerprint(movies, name):
+        with BinaryCatalogue(compile_catalogue(write_json(tmp_path / f"{name}.json", movies))) as catalogue:
+            return catalogue.fingerprint()
+
+    same = fingerprint(MOVIES, "a")
+    assert same == fingerprint(MOVIES, "b")
+    changed = [dict(MOVIES[0], director="Inny")] + MOVIES[1:]
+    assert fingerprint(changed, "c") != same
+
+
+def test_saved_trigram_index_is_reused_until_catalogue_changes(tmp_path, monkeypatch):
+    json_file = write_json(tmp_path / "movies.json", MOVIES)
+    with BinaryCatalogue.open_for(json_file) as catalogue:
+        built = TrigramIndex.load_or_build(json_file, catalogue)
+        assert built.fingerprint == catalogue.fingerprint()
+        assert built.search("obcyy")[0][0] == 0
+
+        rebuilt = []
+        monkeypatch.setattr(TrigramIndex, "build", lambda self, movies: rebuilt.append(movies))
+        loaded = TrigramIndex.load_or_build(json_file, catalogue)
+        assert rebuilt == []
+        assert loaded.search("zywot") == built.search("zywot")
+        monkeypatch.undo()
+
+    write_json(json_file, [dict(MOVIES[0], director="Inny")] + MOVIES[1:])
+    stamp = compiled_path_for(json_file).stat().st_mtime
+    os.utime(json_file, (stamp + 10, stamp + 10))
+    with BinaryCatalogue.open_for(json_file) as catalogue:
+        index = TrigramIndex.load_or_build(json_file, catalogue)
+        assert index.fingerprint == catalogue.fingerprint() != built.fingerprint
+        assert index.search("inny")[0][0] == 0
@@ -0,0 +1,48 @@
+import pytest
+
+from utils.chart_renderer import ChartRenderer
+from utils.charts import GenreChart, StatusChart
+
+
+@pytest.fixture
+def renderer():
+    renderer = ChartRenderer(max_workers=1, cache_size=2)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_same_data_and_size_is_served_from_cache(renderer):
+    image = renderer.render(StatusChart, (3, 1), 200, 150).result(timeout=30)
+    assert (image.width, image.height) == (200, 150)
+    assert len(image.rgba) == 200 * 150 * 4
+
+    again = renderer.render(StatusChart, (3, 1), 200, 150)
+    assert again.done()
+    assert again.result() is image
+    assert (renderer.hits, renderer.misses) == (1, 1)
+
+
+def test_key_depends_on_chart_data_and_size():
+    key = ChartRenderer.cache_key(StatusChart, (3, 1), 200, 150)
+    assert key == ChartRenderer.cache_key(StatusChart, (3, 1), 200, 150)
+    assert key != ChartRenderer.cache_key(StatusChart, (3, 2), 200, 150)
+    assert key != ChartRenderer.cache_key(StatusChart, (3, 1), 201, 150)
+    assert key != ChartRenderer.cache_key(GenreChart, (3, 1), 200, 150)
+
+
+def test_least_recently_used_image_is_evicted(renderer):
+    keys = []
+    for data in ((1, 0), (2, 0), (3, 0)):
+        renderer.render(StatusChart, data, 100, 100).result(timeout=30)
+        keys.append(ChartRenderer.cache_key(StatusChart, data, 100, 100))
+    assert renderer.cached(keys[0]) is None
+    assert renderer.cached(keys[1]) is not None
+    assert renderer.cached(keys[2]) is not None
+
+
+def test_identical_requests_in_flight_share_one_render(renderer):
+    first = renderer.render(GenreChart, (("Dramat", 2),), 100, 100)
+    second = renderer.render(GenreChart, (("Dramat", 2),), 100, 100)
+    first.result(timeout=30)
+    assert second.result(timeout=30) is first.result()
+    assert renderer.misses == 1
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from utils.charts import Chart, GenreChart, RatingsChart, StatusChart
+
+
+def pixels(chart):
+    return np.asarray(chart.figure.canvas.buffer_rgba()).copy()
+
+
+def test_chart_is_abstract():
+    with pytest.raises(TypeError):
+        Chart()
+
+
+def test_same_titles_update_bars_in_place():
+    chart = RatingsChart()
+    chart.apply((("A", "B"), (5.0, 6.0)))
+    bars = chart._bars
+    chart.apply((("A", "B"), (7.0, 8.0)))
+    assert chart._bars is bars
+    assert [bar.get_width() for bar in bars] == [7.0, 8.0]
+
+    chart.apply((("A", "C"), (7.0, 8.0)))
+    assert chart._bars is not bars
+
+
+def test_pie_update_matches_fresh_pie():
+    updated = GenreChart().apply((("Dramat", 1), ("Horror", 3)))
+    wedges = updated._wedges
+    updated.apply((("Dramat", 2), ("Horror", 2)))
+    fresh = GenreChart().apply((("Dramat", 2), ("Horror", 2)))
+    assert updated._wedges is wedges
+    for mine, theirs in zip(updated._wedges, fresh._wedges):
+        assert mine.theta1 == pytest.approx(theirs.theta1)
+        assert mine.theta2 == pytest.approx(theirs.theta2)
+    assert [p.get_text() for p in updated._percents] == [p.get_text() for p in fresh._percents]
+
+
+def test_blitted_update_draws_the_same_image_as_a_full_draw():
+    blitted = StatusChart(blit=True)
+    FigureCanvasAgg(blitted.figure)
+    blitted.resize(320, 240)
+    blitted.apply((4, 3)).draw()
+    blitted.apply((5, 2)).draw()
+    assert not blitted._layout_changed
+
+    full = StatusChart()
+    FigureCanvasAgg(full.figure)
+    full.resize(320, 240)
+    full.apply((4, 3))
+    full.apply((5, 2)).draw()
+    assert np.array_equal(pixels(blitted), pixels(full))
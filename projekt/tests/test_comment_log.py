@@ -0,0 +1,48 @@
+from storage.comment_log import CommentLog, catalogue_key
+
+MOVIE = {"title": "Obcy", "year": 1979, "comments": [{"user": "ala", "comment": "z katalogu"}]}
+
+
+def comment(n):
+    return {"user": "bob", "comment": f"komentarz {n}", "date": "2026-01-01"}
+
+
+def test_comments_survive_reopening(tmp_path):
+    log = CommentLog(tmp_path / "movies.comments.jsonl")
+    key = catalogue_key(MOVIE)
+    for n in range(3):
+        log.append(key, comment(n))
+    log.append(catalogue_key({"title": "Inny", "year": 2000}), comment("x"))
+
+    reopened = CommentLog(tmp_path / "movies.comments.jsonl")
+    assert len(reopened) == 4
+    assert reopened.count(key) == 3
+    assert reopened.comments(key, 1, 1) == [comment(1)]
+    assert catalogue_key({"title": "OBCY", "year": 1979}) == key
+
+
+def test_page_puts_embedded_comments_first(tmp_path):
+    log = CommentLog(tmp_path / "movies.comments.jsonl")
+    for n in range(3):
+        log.append(catalogue_key(MOVIE), comment(n))
+
+    assert log.page(MOVIE, 0, 2) == ([MOVIE["comments"][0], comment(0)], 4)
+    assert log.page(MOVIE, 2, 2) == ([comment(1), comment(2)], 4)
+    assert log.page(MOVIE, 4, 2) == ([], 4)
+    assert log.merged(MOVIE)["comments"] == MOVIE["comments"] + [comment(n) for n in range(3)]
+    assert MOVIE["comments"] == [{"user": "ala", "comment": "z katalogu"}]
+    assert log.merged({"title": "Bez komentarzy"}) == {"title": "Bez komentarzy"}
+
+
+def test_torn_last_line_is_skipped_and_next_comment_starts_a_new_line(tmp_path):
+    path = tmp_path / "movies.comments.jsonl"
+    log = CommentLog(path)
+    key = catalogue_key(MOVIE)
+    log.append(key, comment(0))
+    with open(path, "ab") as f:
+        f.write(b'{"movie": "obcy|1979", "user": "bo')
+
+    log = CommentLog(path)
+    assert log.count(key) == 1
+    log.append(key, comment(1))
+    assert CommentLog(path).comments(key) == [comment(0), comment(1)]
@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+
+from exceptions.exceptions import ExportCancelled
+from models.movie import Movie
+from utils.compression import CODECS, GZIP, PLAIN, codec_for, compressed_name, get_codec
+from utils.file_operations import FileOperations
+
+
+def movies(n=5):
+    return [Movie(f"Film {i}", "Reżyser", 2000 + i, "Dramat", "Do obejrzenia", i, "opis, z przecinkiem")
+            for i in range(n)]
+
+
+def test_codec_is_chosen_by_suffix():
+    assert codec_for("filmy.csv.gz") is GZIP
+    assert codec_for("filmy.csv") is PLAIN
+    assert compressed_name("filmy.csv", GZIP).name == "filmy.csv.gz"
+    assert compressed_name("filmy.csv.gz", GZIP).name == "filmy.csv.gz"
+    with pytest.raises(ValueError):
+        get_codec("lz4")
+
+
+@pytest.mark.skipif("zstd" in CODECS, reason="pakiet zstandard jest zainstalowany")
+def test_zstd_falls_back_to_gzip_without_zstandard():
+    assert get_codec("zstd") is GZIP
+    with pytest.raises(ValueError):
+        codec_for("filmy.csv.zst")
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_compressed_export_matches_plain_export(tmp_path, codec):
+    plain = FileOperations.export_to_csv(movies(), tmp_path / "plain.csv")
+    packed = FileOperations.export_to_csv(movies(), tmp_path / "packed.csv", codec=codec, chunk_size=2)
+    data = packed.read_bytes()
+    if codec == "gzip":
+        data = gzip.decompress(data)
+    elif codec == "zstd":
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    assert data == plain.read_bytes()
+
+
+def test_csv_export_can_be_imported_back(tmp_path):
+    path = FileOperations.export_to_csv(movies(), tmp_path / "filmy.csv")
+    imported = [Movie.from_record(record) for record in FileOperations.iter_records(str(path))]
+    assert [(m.title, m.year, m.description, float(m.rating or 0)) for m in imported] == \
+           [(m.title, m.year, m.description, float(m.rating or 0)) for m in movies()]
+
+
+def test_progress_is_reported_per_chunk(tmp_path):
+    seen = []
+    FileOperations.export_to_txt(movies(5), tmp_path / "filmy.txt", chunk_size=2, progress=seen.append)
+    assert seen == [2, 4, 5]
+
+
+def test_cancelled_export_keeps_previous_file(tmp_path):
+    target = tmp_path / "filmy.csv"
+    target.write_text("poprzedni eksport", encoding="utf-8")
+    seen = []
+    with pytest.raises(ExportCancelled):
+        FileOperations.export_to_csv(movies(5), target, chunk_size=2, progress=seen.append,
+                                     cancelled=lambda: len(seen) == 1)
+    assert target.read_text(encoding="utf-8") == "poprzedni eksport"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["filmy.csv"]
@@ -0,0 +1,92 @@
+import json
+import threading
+
+from models.movie import Movie
+from models.user import User
+from storage.json_storage import JsonStorage
+from utils.journal import Journal
+
+
+def make_storage(tmp_path):
+    storage = JsonStorage(tmp_path / "users.json", use_journal=True)
+    user = User("ala", "haslo")
+    storage.save_users([user])
+    return storage, user
+
+
+def movie(title):
+    return Movie(title, "Reżyser", 2000, "Dramat", "Do obejrzenia", None, "")
+
+
+def titles(storage):
+    return [[m.title for m in user.movies] for user in storage.load_users()]
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    storage, user = make_storage(tmp_path)
+    storage.save_movie(user, movie("A"))
+    storage.save_movie(user, movie("B"))
+    # awaria w trakcie zapisu: ostatni rekord urwany, bez końca linii
+    with open(storage.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op":"movie","user_id":"')
+
+    assert [r["data"]["title"] for r in Journal.read(storage.journal.path)] == ["A", "B"]
+    assert titles(JsonStorage(tmp_path / "users.json", use_journal=True)) == [["A", "B"]]
+
+
+def test_torn_line_cut_inside_utf8_character(tmp_path):
+    storage, user = make_storage(tmp_path)
+    storage.save_movie(user, movie("A"))
+    with open(storage.journal.path, "ab") as f:
+        f.write('{"op":"movie","data":{"title":"Ż'.encode("utf-8")[:-1])
+
+    assert titles(JsonStorage(tmp_path / "users.json", use_journal=True)) == [["A"]]
+
+
+def test_append_after_torn_line_is_replayed(tmp_path):
+    storage, user = make_storage(tmp_path)
+    storage.save_movie(user, movie("A"))
+    with open(storage.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op":"movie","user_id":"')
+
+    # kolejne uruchomienie dopisuje dalej - nowy rekord nie może skleić się z urwanym
+    reopened = JsonStorage(tmp_path / "users.json", use_journal=True)
+    user = reopened.load_users()[0]
+    reopened.save_movie(user, movie("C"))
+
+    assert titles(JsonStorage(tmp_path / "users.json", use_journal=True)) == [["A", "C"]]
+
+
+def test_compaction_keeps_appends_made_while_it_runs(tmp_path, monkeypatch):
+    storage, user = make_storage(tmp_path)
+    before = [movie(f"przed {i}") for i in range(5)]
+    for m in before:
+        storage.save_movie(user, m)
+
+    started, release = threading.Event(), threading.Event()
+    write_snapshot = storage._write_snapshot
+
+    def slow_write_snapshot(user_data):
+        started.set()
+        release.wait(5)
+        write_snapshot(user_data)
+
+    monkeypatch.setattr(storage, "_write_snapshot", slow_write_snapshot)
+    storage.compact_journal()
+    assert started.wait(5)
+
+    # kompaktowanie stoi w połowie - nowe zmiany trafiają do świeżego dziennika
+    for i in range(3):
+        storage.save_movie(user, movie(f"w trakcie {i}"))
+    storage.delete_movie(user, before[0].id)
+    assert list(storage.journal.pending_files()) == [storage.journal.rotated_path, storage.journal.path]
+
+    release.set()
+    storage.wait_for_compaction()
+
+    assert not storage.journal.rotated_path.exists()
+    assert [r["op"] for r in Journal.read(storage.journal.path)] == ["movie"] * 3 + ["movie_delete"]
+    with open(tmp_path / "users.json", encoding="utf-8") as f:
+        assert [m["title"] for m in json.load(f)[0]["movies"]] == [m.title for m in before]
+    expected = [m.title for m in before[1:]] + [f"w trakcie {i}" for i in range(3)]
+    assert titles(JsonStorage(tmp_path / "users.json", use_journal=True)) == [expected]
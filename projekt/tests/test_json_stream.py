@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from utils.json_stream import iter_json_array
+
+
+def parse(tmp_path, text, chunk_size=64 * 1024):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return list(iter_json_array(path, chunk_size))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[]", []),
+    (" \n[ ]\n ", []),
+    ("[1, 2.5, -3e2, true, null]", [1, 2.5, -300.0, True, None]),
+    ('[{"a": [1, {"b": "]"}]}, "x,y"]', [{"a": [1, {"b": "]"}]}, "x,y"]),
+    ("[1]  \n\t", [1]),
+])
+def test_valid_arrays(tmp_path, text, expected):
+    assert parse(tmp_path, text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "[1,]",
+    "[1 2]",
+    "[,1]",
+    "[1,,2]",
+    "[1",
+    "[1,",
+    "",
+    "{}",
+    "[1] trailing",
+    "[1]]",
+    "[1] [2]",
+])
+def test_invalid_arrays(tmp_path, text):
+    with pytest.raises(json.JSONDecodeError):
+        parse(tmp_path, text)
+
+
+def test_trailing_data_after_a_full_chunk(tmp_path):
+    # śmieci daleko za ']' - w kolejnym fragmencie pliku
+    with pytest.raises(json.JSONDecodeError):
+        parse(tmp_path, "[1]" + " " * (64 * 1024) + "x")
+
+
+def test_elements_crossing_the_chunk_boundary(tmp_path):
+    # elementy większe niż fragment i liczby ucięte na granicy ("-1." z "-1.5")
+    data = ["x" * (64 * 1024 + 7), -1.5, {"opis": "ż" * 70_000}, 123456789, "koniec"]
+    text = json.dumps(data, ensure_ascii=False)
+    assert parse(tmp_path, text) == data
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert parse(tmp_path, json.dumps(data[1:2] + data[3:]), chunk_size) == data[1:2] + data[3:]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 16])
+def test_every_split_point_matches_json_load(tmp_path, chunk_size):
+    data = [{"title": "Film", "year": 1999, "rating": -7.25, "tags": ["a", "b"]}, 10, -0.5, "]", []]
+    text = json.dumps(data, indent=2)
+    assert parse(tmp_path, text, chunk_size) == json.loads(text)
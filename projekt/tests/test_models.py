@@ -0,0 +1,45 @@
+import pytest
+
+from models.movie import Movie
+from models.user import User
+
+
+def test_movie_has_no_instance_dict():
+    movie = Movie("Obcy", "Ridley Scott", 1979, "Horror", "Do obejrzenia", 9, "")
+    assert not hasattr(movie, "__dict__")
+    with pytest.raises(AttributeError):
+        movie.unknown = 1
+
+
+def test_categorical_fields_are_interned():
+    # napisy złożone w czasie działania - bez internowania byłyby różnymi obiektami
+    genre = "".join(["Hor", "ror"])
+    first = Movie("A", "".join(["Rid", "ley"]), 1979, genre, "Do obejrzenia", None, "")
+    second = Movie("B", "".join(["Rid", "ley"]), 1980, "".join(["Ho", "rror"]), "Do obejrzenia", None, "")
+    assert first.genre is second.genre
+    assert first.director is second.director
+
+
+def test_comments_are_created_lazily_and_round_trip():
+    movie = Movie("Obcy", "Ridley Scott", 1979, "Horror", "Do obejrzenia", 9, "opis")
+    assert not movie.has_comments
+    assert movie.to_dict()["comments"] == []
+
+    movie.add_comment("ala", "świetny")
+    copy = Movie.from_dict(movie.to_dict())
+    assert copy.to_dict() == movie.to_dict()
+    assert copy.comments == [{"user": "ala", "comment": "świetny"}]
+
+
+def test_user_without_movies_record_loads_collection_lazily():
+    user = User("ala", "haslo")
+    user.movies.append(Movie("Obcy", "Ridley Scott", 1979, "Horror", "Do obejrzenia", 9, ""))
+
+    unloaded = User.from_dict(user.to_dict(include_movies=False))
+    assert not unloaded.movies_loaded
+    calls = []
+    unloaded.set_movie_loader(lambda: calls.append(1) or [Movie.from_dict(m.to_dict()) for m in user.movies])
+    assert [m.title for m in unloaded.movies] == ["Obcy"]
+    assert [m.title for m in unloaded.movies] == ["Obcy"]
+    assert calls == [1]
+    assert unloaded.to_dict() == user.to_dict()
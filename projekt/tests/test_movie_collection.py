@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from models.movie import Movie
+from models.movie_collection import MovieCollection
+from storage.base import movie_statistics
+
+
+def movies():
+    rows = [
+        ("Obcy", 1979, "Horror", "Obejrzano: 2024-01-02", 9),
+        ("Akira", 1988, "Animacja", "Do obejrzenia", None),
+        ("Diuna", 2021, "Sci-Fi", "Obejrzano: 2023-05-01", 7.5),
+        ("Blade Runner", "", "Sci-Fi", "Do obejrzenia", 9),
+        ("Cisza", 2016, "", "Obejrzano", 6),
+    ]
+    return [Movie(title, "Reżyser", year, genre, status, rating, "") for title, year, genre, status, rating in rows]
+
+
+def assert_matches_python(collection):
+    expected = movie_statistics(collection.movies)
+    assert len(collection) == expected["count"]
+    if expected["average_rating"] is None:
+        assert collection.average_rating() is None
+    else:
+        assert collection.average_rating() == pytest.approx(expected["average_rating"])
+    assert collection.genre_counts() == expected["genres"]
+    assert collection.watched_count() == expected["watched"]
+    assert collection.unwatched_count() == expected["unwatched"]
+    assert [m.id for m in collection.top_rated()] == expected["top_rated"]
+
+
+def test_vectorized_statistics_match_python_statistics():
+    collection = MovieCollection(movies())
+    assert_matches_python(collection)
+    assert math.isnan(collection.years[3])
+    assert [m.title for m in collection.watched_rated()] == ["Obcy", "Diuna", "Cisza"]
+
+
+def test_columns_follow_changes_and_grow_past_initial_capacity():
+    collection = MovieCollection(movies())
+    many = [Movie(f"Film {i}", "Reżyser", 2000, "Dramat", "Do obejrzenia", i % 11, "")
+            for i in range(MovieCollection.INITIAL_CAPACITY * 2)]
+    collection.extend(many[:10])
+    for movie in many[10:]:
+        collection.append(movie)
+    collection.remove_at(0)
+    changed = collection.movies[0]
+    changed.rating = 10
+    changed.status = "Obejrzano"
+    collection.refresh(changed)
+    assert_matches_python(collection)
+
+
+def test_empty_collection():
+    collection = MovieCollection()
+    assert_matches_python(collection)
+    assert collection.top_rated() == []
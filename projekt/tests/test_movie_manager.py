@@ -0,0 +1,137 @@
+import math
+from copy import copy
+
+import pytest
+
+from exceptions.exceptions import DuplicateMovieError, ImportCancelled, NotSuchAnId
+from managers.movieManager import ImportReport, MovieManager
+from models.movie import Movie
+from models.movie_collection import MovieCollection
+
+
+def movie(title, year=2000, rating=None, genre="Dramat"):
+    return Movie(title, "Reżyser", year, genre, "Do obejrzenia", rating, "")
+
+
+def manager_with(*titles):
+    manager = MovieManager()
+    manager.load_movies([movie(title) for title in titles])
+    return manager
+
+
+def assert_rows_match(collection):
+    assert {m.id: row for row, m in enumerate(collection.movies)} == collection._rows
+
+
+def test_collection_rows_follow_every_change():
+    collection = MovieCollection([movie("A"), movie("B")])
+    assert_rows_match(collection)
+    collection.append(movie("C"))
+    collection.extend([movie("D"), movie("E")])
+    assert_rows_match(collection)
+    collection.remove_at(1)
+    assert_rows_match(collection)
+    collection.replace_at(0, movie("F"))
+    assert_rows_match(collection)
+    assert [m.title for m in collection.movies] == ["F", "C", "D", "E"]
+
+
+def test_delete_and_replace_use_row_of_current_movie():
+    manager = manager_with("A", "B", "C", "D")
+    b, c = manager.movies[1], manager.movies[2]
+    manager.delete_movie(b.id)
+    assert [m.title for m in manager.movies] == ["A", "C", "D"]
+
+    changed = copy(c)
+    changed.rating = 9
+    manager.replace_movie(changed)
+    assert manager.movies[1] is changed
+    assert manager.collection.ratings[1] == 9
+    assert manager.get_movie_by_id(c.id) is changed
+
+
+def test_refresh_updates_the_right_row_after_removal():
+    manager = manager_with("A", "B", "C")
+    manager.delete_movie(manager.movies[0].id)
+    last = manager.movies[-1]
+    manager.update_rating(last.id, 7)
+    assert math.isnan(manager.collection.ratings[0])
+    assert manager.collection.ratings[1] == 7
+    assert manager.stats.average_rating() == 7
+
+
+def test_add_movie_uses_title_and_year_as_duplicate_key():
+    manager = manager_with("Diuna")
+    manager.add_movie(movie("diuna", year=2021))
+    with pytest.raises(DuplicateMovieError):
+        manager.add_movie(movie("DIUNA", year=2000))
+    assert len(manager.movies) == 2
+
+
+def test_add_movies_drops_duplicates_and_invalid_records():
+    manager = manager_with("Diuna")
+    report = manager.add_movies([
+        {"title": "diuna", "year": 2000, "director": "Reżyser"},                  # już na liście
+        {"title": "Diuna", "year": 2021, "director": "Reżyser"},
+        {"title": "Diuna", "year": "2021", "director": "Reżyser"},                # powtórzony w imporcie
+        {"title": "Bez roku", "year": "dawno", "director": "Reżyser"},
+        {"title": "Zły status", "status": "Porzucony", "director": "Reżyser"},
+        {"year": 1999, "director": "Reżyser"},
+    ])
+    assert report == ImportReport(added=1, duplicates=2, invalid=3)
+    assert [m.title for m in manager.movies] == ["Diuna", "Diuna"]
+    assert manager.find_movies_by_director("Reżyser")[0] is manager.movies[0]
+    assert_rows_match(manager.collection)
+
+
+def test_read_records_reports_progress_per_batch_and_can_be_cancelled():
+    records = [{"title": f"Film {i}", "director": "Reżyser"} for i in range(5)]
+    seen = []
+    movies, invalid = MovieManager.read_records(records, batch_size=2, progress=seen.append)
+    assert (len(movies), invalid) == (5, 0)
+    assert seen == [2, 4, 5]
+
+    with pytest.raises(ImportCancelled):
+        MovieManager.read_records(records, batch_size=2, progress=seen.append, cancelled=lambda: len(seen) > 3)
+
+
+def test_indexes_follow_updates_and_deletes():
+    manager = MovieManager()
+    manager.load_movies([movie("Diuna"), movie("Diuna", year=2021), movie("Obcy")])
+    first, second, alien = manager.movies
+
+    assert manager.find_movie_by_title("DIUNA") is first
+    assert manager.get_movie_by_id(alien.id) is alien
+    assert manager.find_movies_by_director("reżyser") == [first, second, alien]
+
+    manager.update_title(first.id, "Diuna: część pierwsza")
+    assert manager.find_movie_by_title("diuna") is second
+    assert manager.find_movie_by_title("diuna: część pierwsza") is first
+
+    manager.update_director(alien.id, "Ridley Scott")
+    assert manager.find_movie_by_director("ridley scott") is alien
+    assert manager.find_movies_by_director("Reżyser") == [first, second]
+
+    manager.delete_movie(second.id)
+    assert manager.find_movie_by_title("Diuna") is None
+    with pytest.raises(NotSuchAnId):
+        manager.get_movie_by_id(second.id)
+    with pytest.raises(NotSuchAnId):
+        manager.delete_movie(second.id)
+
+
+@pytest.mark.parametrize("name, content", [
+    ("filmy.csv", "﻿Tytuł,Reżyser,Rok,Nieznana\nObcy,Ridley Scott,1979,x\n\nAkira,Katsuhiro Otomo,1988,y\n"),
+    ("filmy.jsonl", '{"title": "Obcy", "director": "Ridley Scott", "year": 1979}\n\n'
+                    '{"title": "Akira", "director": "Katsuhiro Otomo", "year": "1988"}\n'),
+    ("filmy.json", '[{"title": "Obcy", "director": "Ridley Scott", "year": 1979},'
+                   ' {"title": "Akira", "director": "Katsuhiro Otomo", "year": 1988}]'),
+])
+def test_import_file_reads_every_supported_format(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    manager = MovieManager()
+    manager.load_movies([movie("obcy", year=1979)])
+    report = manager.import_file(str(path))
+    assert report == ImportReport(added=1, duplicates=1, invalid=0)
+    assert [(m.title, m.year) for m in manager.movies] == [("obcy", 1979), ("Akira", 1988)]
@@ -0,0 +1,81 @@
+import pytest
+
+from exceptions.exceptions import WrongFileLoading
+from models.movie import Movie
+from utils.file_operations import EXPORT_CHUNK_SIZE, FileOperations
+
+
+def sample_movies():
+    commented = Movie("Obcy", "Ridley Scott", 1979, "Horror", "Obejrzano: 2024-01-02", 9.5, "opis", "2024-01-02")
+    commented.add_comment("ala", "świetny ✓")
+    return [
+        commented,
+        Movie("Żywot Briana", "Terry Jones", "1979", "Komedia", "Do obejrzenia", None, ""),
+        Movie("Bez roku", "Nikt", "", "", "Do obejrzenia", 0, ""),
+        Movie("Daleka przyszłość", "Nikt", 10 ** 12, "Sci-Fi", "Do obejrzenia", None, ""),
+    ]
+
+
+def as_dicts(movies):
+    return [movie.to_dict() for movie in movies]
+
+
+@pytest.mark.parametrize("save, load, suffix", [
+    (FileOperations.save_to_binary, FileOperations.iter_movies_from_binary, ".movies"),
+    (FileOperations.save_to_json_lines, FileOperations.iter_movies_from_json_lines, ".jsonl"),
+])
+def test_round_trip_and_append(tmp_path, save, load, suffix):
+    path = str(tmp_path / f"filmy{suffix}")
+    movies = sample_movies()
+    save(movies[:2], path)
+    save(movies[2:], path, append=True)
+    loaded = list(load(path))
+    assert as_dicts(loaded) == as_dicts(movies)
+    assert type(loaded[3].year) is int
+    assert loaded[1].year == "1979"
+
+
+def test_truncated_binary_file_is_rejected(tmp_path):
+    path = tmp_path / "filmy.movies"
+    FileOperations.save_to_binary(sample_movies(), str(path))
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(WrongFileLoading):
+        list(FileOperations.iter_movies_from_binary(str(path)))
+
+
+@pytest.mark.parametrize("content", [b"", b"NOTMOVIES\0\0"])
+def test_foreign_binary_file_is_rejected(tmp_path, content):
+    path = tmp_path / "filmy.movies"
+    path.write_bytes(content)
+    with pytest.raises(WrongFileLoading):
+        list(FileOperations.iter_movies_from_binary(str(path)))
+
+
+def broken_movie():
+    movie = Movie("Zepsuty", "Nikt", 2000, "", "Do obejrzenia", None, "")
+    movie.rating = "dziesięć"
+    return movie
+
+
+def many_then_broken():
+    # więcej filmów niż jedna paczka zapisu - część pliku jest już zapisana, gdy trafia się błąd
+    return sample_movies() * (EXPORT_CHUNK_SIZE // 4 + 1) + [broken_movie()]
+
+
+def test_failed_write_leaves_previous_file(tmp_path):
+    path = tmp_path / "filmy.movies"
+    FileOperations.save_to_binary(sample_movies()[:1], str(path))
+    before = path.read_bytes()
+    with pytest.raises(WrongFileLoading):
+        FileOperations.save_to_binary(many_then_broken(), str(path))
+    assert path.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["filmy.movies"]
+
+
+def test_failed_append_is_truncated(tmp_path):
+    path = tmp_path / "filmy.movies"
+    FileOperations.save_to_binary(sample_movies()[:1], str(path))
+    before = path.read_bytes()
+    with pytest.raises(WrongFileLoading):
+        FileOperations.save_to_binary(many_then_broken(), str(path), append=True)
+    assert path.read_bytes() == before
@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from exceptions.exceptions import SearchCancelled
+from utils.search_engine import SearchEngine
+from utils.search_pipeline import SearchPipeline
+
+
+@pytest.fixture
+def engine():
+    engine = SearchEngine()
+    for doc, (title, genre) in enumerate([
+        ("Dramat w Pradze", "Dramat"), ("Drapieżca", "Akcja"), ("Obcy", "Horror"), ("Dracula", "Horror"),
+    ]):
+        engine.add(doc, {"title": title, "genre": genre})
+    return engine
+
+
+@pytest.fixture
+def pipeline(engine):
+    pipeline = SearchPipeline(lambda query, within, cancelled: engine.search(query, within=within,
+                                                                             cancelled=cancelled))
+    yield pipeline
+    pipeline.shutdown()
+
+
+@pytest.mark.parametrize("previous, query, expected", [
+    (None, "dra", False),
+    ("", "dra", False),
+    ("dra", "dramat", True),
+    ("Dra", "dramat w", True),
+    ("dramat", "dra", False),
+    ("obcy", "dramat", False),
+])
+def test_refines(previous, query, expected):
+    assert SearchPipeline.refines(previous, query) is expected
+
+
+def test_longer_query_searches_only_previous_results(pipeline, engine):
+    first = pipeline.submit("dra").result(timeout=5)
+    assert sorted(first) == [0, 1, 3]
+    assert pipeline.submit("dramat").result(timeout=5) == engine.search("dramat")
+    assert pipeline.metrics[-1].candidates == len(first)
+    assert pipeline.refined == 1
+
+    pipeline.invalidate()
+    pipeline.submit("dramat w").result(timeout=5)
+    assert pipeline.metrics[-1].candidates == -1
+    assert pipeline.refined == 1
+
+
+def test_newer_query_cancels_running_and_waiting_ones():
+    started = threading.Event()
+    release = threading.Event()
+
+    def search(query, within, cancelled):
+        if query == "pierwsze":
+            started.set()
+            release.wait(5)
+            if cancelled():
+                raise SearchCancelled(query)
+        return [query]
+
+    pipeline = SearchPipeline(search)
+    running = pipeline.submit("pierwsze")
+    assert started.wait(5)
+    waiting = pipeline.submit("drugie")
+    latest = pipeline.submit("trzecie")
+    release.set()
+
+    assert latest.result(timeout=5) == ["trzecie"]
+    with pytest.raises(SearchCancelled):
+        running.result(timeout=5)
+    with pytest.raises(CancelledError):
+        waiting.result(timeout=5)
+    assert pipeline.completed == 1
+    assert pipeline.cancelled == 2
+    pipeline.shutdown()
+
+
+def test_cancel_discards_result_of_running_query():
+    started = threading.Event()
+    release = threading.Event()
+    pipeline = SearchPipeline(lambda query, within, cancelled: started.set() or release.wait(5) and [query])
+    future = pipeline.submit("obcy")
+    assert started.wait(5)
+    pipeline.cancel()
+    release.set()
+    # wyszukiwanie nie sprawdzało cancelled(), ale jego wynik i tak jest odrzucony
+    with pytest.raises(SearchCancelled):
+        future.result(timeout=5)
+    assert pipeline._last_results is None
+    pipeline.shutdown()
@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+
+from models.movie import Movie
+from models.user import User
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SQLiteStorage
+
+BACKENDS = {
+    "json": lambda path: JsonStorage(path / "users.json"),
+    "journal": lambda path: JsonStorage(path / "users.json", use_journal=True),
+    "shards": lambda path: JsonStorage(path / "users.json", sharded=True),
+    "sqlite": lambda path: SQLiteStorage(path / "users.db"),
+}
+
+
+def movie(title, year=2000):
+    return Movie(title, "Reżyser", year, "Dramat", "Do obejrzenia", None, "")
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def reopen(request, tmp_path):
+    opened = []
+
+    def open_backend():
+        backend = BACKENDS[request.param](tmp_path)
+        opened.append(backend)
+        return backend
+
+    yield open_backend
+    for backend in opened:
+        backend.close()
+
+
+def titles(users, username):
+    user = next(u for u in users if u.username == username)
+    return [m.title for m in user.movies]
+
+
+def test_save_users_round_trip(reopen):
+    alice, bob = User("ala", "haslo"), User("bob", "haslo")
+    alice.movies.extend([movie("A"), movie("B")])
+    reopen().save_users([alice, bob])
+
+    users = reopen().load_users()
+    assert [u.username for u in users] == ["ala", "bob"]
+    assert titles(users, "ala") == ["A", "B"]
+    assert titles(users, "bob") == []
+
+
+def test_write_batch_applies_every_kind_of_change(reopen):
+    alice, bob = User("ala", "haslo"), User("bob", "haslo")
+    kept, removed = movie("Zostaje"), movie("Usunięty")
+    alice.movies.extend([kept, removed])
+    reopen().save_users([alice, bob])
+
+    kept.rating = 8
+    added = movie("Nowy")
+    reopen().write_batch([alice], [(alice, kept), (alice, added)], [(alice, removed.id)], [bob])
+
+    users = reopen().load_users()
+    assert [u.username for u in users] == ["ala"]
+    assert titles(users, "ala") == ["Zostaje", "Nowy"]
+    assert float(users[0].movies[0].rating) == 8
+
+
+def test_sqlite_write_batch_is_one_transaction(tmp_path):
+    storage = SQLiteStorage(tmp_path / "users.db")
+    alice = User("ala", "haslo")
+    ghost = User("duch", "haslo")   # nie zapisany - film narusza klucz obcy
+    with pytest.raises(sqlite3.IntegrityError):
+        storage.write_batch([alice], [(alice, movie("A")), (ghost, movie("B"))], [], [])
+    assert storage.load_users() == []
+    assert storage.load_movies(alice.id) == []
+    storage.close()
+
+
+def catalogue_user():
+    user = User("ala", "haslo")
+    rows = [
+        ("Obcy", 1979, "Horror", "Obejrzano: 2024-01-02", 9, "2024-01-02"),
+        ("akira", 1988, "Animacja", "Do obejrzenia", None, None),
+        ("Diuna", 2021, "Sci-Fi", "Obejrzano: 2023-05-01", 7.5, "2023-05-01"),
+        ("Blade Runner", None, "Sci-Fi", "Do obejrzenia", 8, None),
+        ("Cisza", 2016, "Dramat", "Obejrzano: 2022-11-30", 6, "2022-11-30"),
+    ]
+    for title, year, genre, status, rating, watch_date in rows:
+        user.movies.append(Movie(title, "Reżyser", year if year is not None else "", genre, status, rating, "",
+                                 watch_date))
+    return user
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"genre": "Sci-Fi"},
+    {"status": "Obejrzano"},
+    {"order_by": "year", "descending": True},
+    {"order_by": "rating"},
+    {"order_by": "rating", "descending": True},
+    {"order_by": "watch_date", "status": "Obejrzano"},
+])
+def test_sqlite_queries_match_python_queries(tmp_path, query):
+    user = catalogue_user()
+    storage = SQLiteStorage(tmp_path / "users.db")
+    storage.save_users([user])
+    expected = JsonStorage(tmp_path / "users.json").query_movie_ids(user, **query)
+    assert storage.query_movie_ids(user, **query) == expected
+    storage.close()
+
+
+def test_sqlite_statistics_match_python_statistics(tmp_path):
+    user = catalogue_user()
+    storage = SQLiteStorage(tmp_path / "users.db")
+    storage.save_users([user])
+    expected = JsonStorage(tmp_path / "users.json").movie_statistics(user)
+    result = storage.movie_statistics(user)
+    assert result.pop("average_rating") == pytest.approx(expected.pop("average_rating"))
+    assert result == expected
+    assert expected["watched"] == 3
+    storage.close()
+
+
+def test_unknown_sort_key_is_rejected(tmp_path):
+    storage = SQLiteStorage(tmp_path / "users.db")
+    with pytest.raises(ValueError):
+        storage.query_movie_ids(User("ala", "haslo"), order_by="director")
+    storage.close()
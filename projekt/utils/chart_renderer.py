@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Type
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from utils.charts import Chart
+
+
+class RenderedImage(NamedTuple):
+    width: int
+    height: int
+    rgba: bytes
+
+
+# Rysuje wykresy (backend Agg) w puli wątków do bufora RGBA. Wyniki są zapamiętywane
+# pod skrótem danych wejściowych, więc powrót do tych samych danych nie wymaga rysowania.
+class ChartRenderer:
+    def __init__(self, max_workers: int = 2, cache_size: int = 64) -> None:
+        self.cache_size: int = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart-render")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, RenderedImage]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        # każdy wątek ma własne figury - obiekty matplotlib nie są współdzielone między wątkami
+        self._local = threading.local()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def cache_key(chart_class: Type[Chart], data: Tuple[Any, ...], width: int, height: int) -> str:
+        payload = repr((chart_class.__name__, width, height, data)).encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()
+
+    def cached(self, key: str) -> Optional[RenderedImage]:
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+            return image
+
+    def render(self, chart_class: Type[Chart], data: Tuple[Any, ...], width: int, height: int) -> Future:
+        key = self.cache_key(chart_class, data, width, height)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                future: Future = Future()
+                future.set_result(image)
+                return future
+            # ten sam obraz już się rysuje - nie zlecamy go drugi raz
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            self.misses += 1
+            future = self._executor.submit(self._render, key, chart_class, data, width, height)
+            self._pending[key] = future
+            return future
+
+    def _chart(self, chart_class: Type[Chart]) -> Chart:
+        charts = getattr(self._local, "charts", None)
+        if charts is None:
+            charts = self._local.charts = {}
+        chart = charts.get(chart_class)
+        if chart is None:
+            chart = charts[chart_class] = chart_class(blit=True)
+            FigureCanvasAgg(chart.figure)
+        return chart
+
+    def _render(self, key: str, chart_class: Type[Chart], data: Tuple[Any, ...],
+                width: int, height: int) -> RenderedImage:
+        try:
+            chart = self._chart(chart_class)
+            chart.resize(width, height)
+            chart.apply(data).draw()
+            buffer = np.asarray(chart.figure.canvas.buffer_rgba())
+            image = RenderedImage(buffer.shape[1], buffer.shape[0], buffer.tobytes())
+            with self._lock:
+                self._cache[key] = image
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return image
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,238 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+from matplotlib.artist import Artist
+from matplotlib.figure import Figure
+
+from utils.stats_aggregator import StatsAggregator
+
+PIE_START_ANGLE = 140
+PIE_LABEL_DISTANCE = 1.1
+PIE_PCT_DISTANCE = 0.6
+
+
+# Wykres z trwałą figurą: kolejne aktualizacje zmieniają istniejące elementy (wysokości
+# słupków, kąty wycinków, tekst) zamiast budować figurę od nowa. Z blit=True zmienione
+# elementy są dorysowywane na zapamiętane tło, o ile układ osi się nie zmienił.
+# data() robi z agregatów niezmienną krotkę - można ją przekazać do innego wątku i haszować.
+class Chart(ABC):
+    figsize: Optional[Tuple[float, float]] = None
+
+    def __init__(self, blit: bool = False) -> None:
+        self.figure = Figure(figsize=self.figsize)
+        self.ax = self.figure.add_subplot()
+        self.blit: bool = blit
+        self._dynamic: List[Artist] = []
+        self._background = None
+        self._layout_changed: bool = True
+        self._draw_canvas = None
+
+    @classmethod
+    @abstractmethod
+    def data(cls, stats: StatsAggregator) -> Tuple[Any, ...]:
+        pass
+
+    @abstractmethod
+    def apply(self, data: Tuple[Any, ...]) -> "Chart":
+        pass
+
+    def update(self, stats: StatsAggregator) -> "Chart":
+        return self.apply(self.data(stats))
+
+    def resize(self, width: int, height: int) -> None:
+        # rozmiar w pikselach przy bieżącym dpi figury
+        dpi = self.figure.dpi
+        if tuple(self.figure.get_size_inches()) != (width / dpi, height / dpi):
+            self.figure.set_size_inches(width / dpi, height / dpi)
+            self._relayout()
+
+    def _set_dynamic(self, artists: List[Artist]) -> None:
+        # elementy zmieniane przy aktualizacji; przy blitowaniu rysowane osobno na tle
+        self._dynamic = list(artists)
+        if self._dynamic and self.ax.axison and self.ax.get_frame_on():
+            # ramka osi leży nad słupkami - rysujemy ją razem z nimi, żeby nie została zamalowana
+            self._dynamic.extend(self.ax.spines.values())
+        for artist in self._dynamic:
+            artist.set_animated(self.blit)
+
+    def _relayout(self) -> None:
+        self._layout_changed = True
+
+    def _draw_dynamic(self) -> None:
+        for artist in self._dynamic:
+            self.figure.draw_artist(artist)
+
+    def _on_draw(self, event) -> None:
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_dynamic()
+
+    def draw(self) -> None:
+        canvas = self.figure.canvas
+        if not (self.blit and canvas.supports_blit):
+            canvas.draw()
+            return
+        if self._draw_canvas is not canvas:
+            # nowe tło przy każdym pełnym rysowaniu (także po zmianie rozmiaru okna)
+            canvas.mpl_connect("draw_event", self._on_draw)
+            self._draw_canvas = canvas
+            self._layout_changed = True
+        if self._layout_changed or self._background is None:
+            canvas.draw()
+            self._layout_changed = False
+            return
+        canvas.restore_region(self._background)
+        self._draw_dynamic()
+        canvas.blit(self.figure.bbox)
+
+    def _show_message(self, text: str) -> None:
+        self.ax.clear()
+        self.ax.text(0.5, 0.5, text, ha="center", va="center", transform=self.ax.transAxes)
+        self.ax.axis("off")
+        self._set_dynamic([])
+        self._relayout()
+
+
+class RatingsChart(Chart):
+    def __init__(self, blit: bool = False) -> None:
+        super().__init__(blit)
+        self._titles: Optional[List[str]] = None
+        self._bars = None
+
+    @classmethod
+    def data(cls, stats: StatsAggregator) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+        collection = stats.collection
+        mask = collection.watched_mask() & collection.rated_mask()
+        return tuple(m.title for m in collection.select(mask)), tuple(collection.ratings[mask].tolist())
+
+    def apply(self, data: Tuple[Tuple[str, ...], Tuple[float, ...]]) -> "RatingsChart":
+        titles: List[str] = list(data[0])
+        ratings: List[float] = list(data[1])
+
+        if not titles:
+            if self._titles != []:
+                self._show_message("Brak ocenionych obejrzanych filmów")
+                self._titles = []
+            return self
+
+        limit = max(10.0, max(ratings))
+        if titles == self._titles and limit == self.ax.get_xlim()[1]:
+            for bar, rating in zip(self._bars, ratings):
+                bar.set_width(rating)
+            return self
+
+        self.ax.clear()
+        self._bars = self.ax.barh(titles, ratings, color="#4CAF50")
+        self.ax.set_xlim(0, limit)
+        self.ax.set_xlabel("Ocena")
+        self.ax.set_title("Oceny obejrzanych filmów")
+        self._titles = titles
+        self._set_dynamic(self._bars.patches)
+        self._relayout()
+        return self
+
+
+class GenreChart(Chart):
+    def __init__(self, blit: bool = False) -> None:
+        super().__init__(blit)
+        self._genres: Optional[List[str]] = None
+        self._wedges = []
+        self._labels = []
+        self._percents = []
+
+    @classmethod
+    def data(cls, stats: StatsAggregator) -> Tuple[Tuple[str, int], ...]:
+        return tuple(stats.genre_counts().items())
+
+    def apply(self, data: Tuple[Tuple[str, int], ...]) -> "GenreChart":
+        count = dict(data)
+
+        if not count:
+            if self._genres != []:
+                self._show_message("Brak danych o gatunkach")
+                self._genres = []
+            return self
+
+        genres = list(count.keys())
+        if genres != self._genres:
+            self.ax.clear()
+            self._wedges, self._labels, self._percents = self.ax.pie(
+                count.values(), labels=genres, autopct="%1.1f%%", startangle=PIE_START_ANGLE,
+                labeldistance=PIE_LABEL_DISTANCE, pctdistance=PIE_PCT_DISTANCE
+            )
+            self.ax.set_title("Filmy wg gatunku")
+            self._genres = genres
+            self._set_dynamic(self._wedges + self._labels + self._percents)
+            self._relayout()
+            return self
+
+        # te same gatunki - przesuwamy kąty wycinków i pozycje opisów jak Axes.pie
+        total = sum(count.values())
+        theta1 = PIE_START_ANGLE / 360
+        for genre, wedge, label, percent in zip(genres, self._wedges, self._labels, self._percents):
+            fraction = count[genre] / total
+            theta2 = theta1 + fraction
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+            middle = math.pi * (theta1 + theta2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((PIE_LABEL_DISTANCE * x, PIE_LABEL_DISTANCE * y))
+            label.set_horizontalalignment("left" if x > 0 else "right")
+            percent.set_position((PIE_PCT_DISTANCE * x, PIE_PCT_DISTANCE * y))
+            percent.set_text(f"{100 * fraction:1.1f}%")
+            theta1 = theta2
+        return self
+
+
+class StatusChart(Chart):
+    def __init__(self, blit: bool = False) -> None:
+        super().__init__(blit)
+        self._bars = self.ax.bar(["Obejrzane", "Do obejrzenia"], [0, 0], color=["#2196F3", "#FFC107"])
+        self.ax.set_title("Status filmów")
+        self.ax.set_ylabel("Liczba filmów")
+        self._set_dynamic(self._bars.patches)
+
+    @classmethod
+    def data(cls, stats: StatsAggregator) -> Tuple[int, int]:
+        return stats.watched_count(), stats.unwatched_count()
+
+    def apply(self, data: Tuple[int, int]) -> "StatusChart":
+        values = data
+        for bar, value in zip(self._bars, values):
+            bar.set_height(value)
+
+        # skala zmienia się skokowo, żeby pojedyncze zmiany nie wymuszały pełnego rysowania
+        top = self.ax.get_ylim()[1]
+        highest = max(max(values), 1)
+        if highest > top or highest < top / 4:
+            self.ax.set_ylim(0, highest * 1.5)
+            self._relayout()
+        return self
+
+
+class TopRatedChart(Chart):
+    figsize = (6, 3)
+    TOP_N: int = 3
+
+    def __init__(self, blit: bool = False) -> None:
+        super().__init__(blit)
+        self.ax.axis("off")
+        self._text = self.ax.text(0.5, 0.5, "", ha="center", va="center", fontsize=12, wrap=True,
+                                  transform=self.ax.transAxes)
+        self._set_dynamic([self._text])
+
+    @classmethod
+    def data(cls, stats: StatsAggregator) -> Tuple[Tuple[str, str, str], ...]:
+        return tuple((m.title, str(m.year), str(m.rating)) for m in stats.top_rated(cls.TOP_N))
+
+    def apply(self, data: Tuple[Tuple[str, str, str], ...]) -> "TopRatedChart":
+        if data:
+            lines = [
+                f"{i + 1}. {title} ({year}) – {rating}/10"
+                for i, (title, year, rating) in enumerate(data)
+            ]
+            msg = f"Top {self.TOP_N} filmy:\n" + "\n".join(lines)
+        else:
+            msg = "Brak filmów z oceną"
+        self._text.set_text(msg)
+        return self
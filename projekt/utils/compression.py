@@ -0,0 +1,67 @@
+import gzip
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, NamedTuple, Union
+
+# zstd jest opcjonalny - bez pakietu zstandard pliki .zst zapisujemy przez gzip z biblioteki standardowej
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Codec(NamedTuple):
+    name: str
+    suffix: str                                  # rozszerzenie dopisywane do nazwy pliku, np. ".gz"
+    wrap: Callable[[BinaryIO], BinaryIO]         # strumień kompresujący zapis do otwartego pliku binarnego
+
+
+def _plain(f: BinaryIO) -> BinaryIO:
+    return f
+
+
+def _gzip(f: BinaryIO) -> BinaryIO:
+    return gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6)
+
+
+def _zstd(f: BinaryIO) -> BinaryIO:
+    return zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False)
+
+
+PLAIN = Codec("none", "", _plain)
+GZIP = Codec("gzip", ".gz", _gzip)
+
+CODECS: Dict[str, Codec] = {PLAIN.name: PLAIN, GZIP.name: GZIP}
+if zstandard is not None:
+    CODECS["zstd"] = Codec("zstd", ".zst", _zstd)
+
+
+def register_codec(codec: Codec) -> None:
+    CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    if name == "zstd" and name not in CODECS:
+        return GZIP
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Nieznany kodek kompresji: {name}")
+
+
+def codec_for(filename: Union[str, Path]) -> Codec:
+    # kodek po rozszerzeniu pliku (filmy.csv.gz -> gzip), bez rozpoznanego rozszerzenia - bez kompresji
+    suffix = Path(filename).suffix.lower()
+    for codec in CODECS.values():
+        if codec.suffix and codec.suffix == suffix:
+            return codec
+    if suffix == ".zst":
+        raise ValueError("Kompresja zstd wymaga pakietu zstandard")
+    return PLAIN
+
+
+def compressed_name(filename: Union[str, Path], codec: Codec) -> Path:
+    # nazwa pliku z rozszerzeniem kodeka (np. po zastąpieniu zstd przez gzip)
+    filename = Path(filename)
+    if codec.suffix and filename.suffix.lower() != codec.suffix:
+        return filename.with_name(filename.name + codec.suffix)
+    return filename
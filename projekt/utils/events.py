@@ -0,0 +1,79 @@
+from collections import defaultdict
+from typing import Callable, DefaultDict, List, NamedTuple, Optional, Tuple, Type
+
+from models.movie import Movie
+from models.user import User
+
+MOVIE_FIELDS = ("title", "director", "year", "genre", "status", "rating", "description", "watch_date", "comments")
+
+
+# --- zdarzenia kolekcji filmów (publikuje MovieManager) ---
+
+class MovieAdded(NamedTuple):
+    user: Optional[User]
+    movie: Movie
+
+
+class MoviesAdded(NamedTuple):
+    # import wielu filmów naraz - jedno zdarzenie (i jeden zapis) zamiast MovieAdded dla każdego
+    user: Optional[User]
+    movies: List[Movie]
+
+
+class MovieRemoved(NamedTuple):
+    user: Optional[User]
+    movie: Movie
+
+
+class MovieChanged(NamedTuple):
+    # fields - nazwy zmienionych pól; przy podmianie całego filmu (edycja) - MOVIE_FIELDS
+    user: Optional[User]
+    movie: Movie
+    fields: Tuple[str, ...]
+
+
+class MoviesReloaded(NamedTuple):
+    # cała kolekcja wczytana od nowa - subskrybenci przebudowują swój stan (pełne odświeżenie)
+    user: Optional[User]
+    movies: List[Movie]
+
+
+# --- zdarzenia kont (publikuje UserManager) ---
+
+class UserAdded(NamedTuple):
+    user: User
+
+
+class UserRemoved(NamedTuple):
+    user: User
+
+
+class UserChanged(NamedTuple):
+    user: User
+    fields: Tuple[str, ...]
+
+
+Handler = Callable[[NamedTuple], None]
+
+
+# Prosta szyna zdarzeń w obrębie procesu: handlery są wywoływane synchronicznie,
+# w kolejności subskrypcji, dla dokładnego typu zdarzenia.
+class EventBus:
+    def __init__(self) -> None:
+        self._handlers: DefaultDict[type, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, event_type: Type, handler: Handler) -> None:
+        # ponowna subskrypcja tego samego handlera nic nie zmienia
+        handlers = self._handlers[event_type]
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, event_type: Type, handler: Handler) -> None:
+        handlers = self._handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event: NamedTuple) -> None:
+        # kopia listy - handler może się w trakcie wypisać
+        for handler in list(self._handlers.get(type(event), ())):
+            handler(event)
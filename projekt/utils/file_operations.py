@@ -1,9 +1,31 @@
 import json
 import csv
-from typing import List, Optional, Union
+import io
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
-from exceptions.exceptions import WrongFileLoading
+from exceptions.exceptions import ExportCancelled, WrongFileLoading
 from models.movie import Movie
+from utils.compression import Codec, codec_for, compressed_name, get_codec
+from utils import movie_records
+from utils.json_stream import iter_json_array
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+# nagłówki CSV (jak w export_to_csv albo nazwy pól) -> pola rekordu
+CSV_FIELDS = {
+    "tytuł": "title", "title": "title",
+    "reżyser": "director", "director": "director",
+    "rok": "year", "year": "year",
+    "gatunek": "genre", "genre": "genre",
+    "status": "status",
+    "ocena": "rating", "rating": "rating",
+    "opis": "description", "description": "description",
+    "data obejrzenia": "watch_date", "watch_date": "watch_date",
+}
 
 
 class FileOperations:
@@ -22,49 +44,211 @@ class FileOperations:
 
     @staticmethod
     def load_from_json(filename: str) -> Union[List[dict], None]:
+        return list(FileOperations.iter_json(filename))
+
+    @staticmethod
+    def iter_json(filename: str) -> Iterator[dict]:
+        # rekordy parsowane po jednym - można przerwać w dowolnym momencie
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return data
+            yield from iter_json_array(filename)
         except FileNotFoundError:
             raise FileNotFoundError(f"Plik {filename} nie został znaleziony")
         except json.JSONDecodeError as e:
             raise WrongFileLoading(f"Nieprawidłowy format JSON: {e}")
 
     @staticmethod
-    def export_to_csv(movies: List[Movie], filename: str) -> None:
+    def iter_movies_from_json(filename: str) -> Iterator[Movie]:
+        for data in FileOperations.iter_json(filename):
+            yield Movie.from_dict(data)
+
+    @staticmethod
+    def save_to_json_lines(movies: Iterable[Movie], filename: str, append: bool = False) -> None:
+        # jeden film w wierszu, bez wcięć - plik można czytać strumieniowo i dopisywać do niego
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Tytuł', 'Reżyser', 'Rok', 'Gatunek', 'Status', 'Ocena', 'Opis'])
-
-                for movie in movies:
-                    writer.writerow([
-                        movie.title,
-                        movie.director,
-                        movie.year,
-                        movie.genre,
-                        movie.status,
-                        movie.rating,
-                        movie.description
-                    ])
+            iterator = iter(movies)
+            with open(filename, 'a' if append else 'w', encoding='utf-8') as f:
+                for chunk in iter(lambda: list(islice(iterator, EXPORT_CHUNK_SIZE)), []):
+                    f.write("".join(
+                        json.dumps(movie.to_dict(), ensure_ascii=False, separators=(',', ':')) + "\n"
+                        for movie in chunk
+                    ))
+        except OSError as e:
+            raise WrongFileLoading(f"Błąd podczas zapisywania do JSON Lines: {e}")
 
-        except Exception as e:
+    @staticmethod
+    def iter_movies_from_json_lines(filename: str) -> Iterator[Movie]:
+        for data in FileOperations.iter_json_lines(filename):
+            yield Movie.from_dict(data)
+
+    @staticmethod
+    def save_to_binary(movies: Iterable[Movie], filename: str, append: bool = False) -> None:
+        # zwarty format binarny (utils.movie_records); przy dopisywaniu nagłówek już jest w pliku.
+        # Nowy plik powstaje pod nazwą tymczasową, a nieudane dopisywanie jest obcinane do
+        # poprzedniej długości - błąd (np. filmu, którego nie da się zakodować) nie zostawia połowy pliku
+        target = filename if append else f"{filename}.tmp"
+        try:
+            with open(target, 'ab' if append else 'wb') as f:
+                start = f.tell()
+                try:
+                    if start == 0:
+                        movie_records.write_header(f)
+                    movie_records.write_movies(f, movies, EXPORT_CHUNK_SIZE)
+                except BaseException:
+                    if append:
+                        f.truncate(start)
+                    raise
+            if not append:
+                os.replace(target, filename)
+        except BaseException as e:
+            if not append and os.path.exists(target):
+                os.remove(target)
+            if isinstance(e, OSError):
+                raise WrongFileLoading(f"Błąd podczas zapisywania pliku binarnego: {e}")
+            raise
+
+    @staticmethod
+    def iter_movies_from_binary(filename: str) -> Iterator[Movie]:
+        try:
+            with open(filename, 'rb', buffering=1 << 16) as f:
+                yield from movie_records.read_movies(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Plik {filename} nie został znaleziony")
+
+    @staticmethod
+    def iter_json_lines(filename: str) -> Iterator[dict]:
+        # JSON Lines: jeden rekord w wierszu, puste wiersze pomijane
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Plik {filename} nie został znaleziony")
+        except json.JSONDecodeError as e:
+            raise WrongFileLoading(f"Nieprawidłowy format JSON w wierszu {line_no}: {e}")
+
+    @staticmethod
+    def iter_csv(filename: str) -> Iterator[Dict[str, Any]]:
+        # kolumny rozpoznawane po nagłówku, nieznane pomijane; rok z liczbami zamieniany na int
+        try:
+            with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return
+                columns = [(i, CSV_FIELDS[name.strip().casefold()]) for i, name in enumerate(header)
+                           if name.strip().casefold() in CSV_FIELDS]
+                for row in reader:
+                    if not row:
+                        continue
+                    record = {field: row[i] for i, field in columns if i < len(row)}
+                    year = record.get("year", "")
+                    if year.isdigit():
+                        record["year"] = int(year)
+                    yield record
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Plik {filename} nie został znaleziony")
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise WrongFileLoading(f"Nieprawidłowy plik CSV: {e}")
+
+    @staticmethod
+    def iter_records(filename: str) -> Iterator[Dict[str, Any]]:
+        # import: format rozpoznawany po rozszerzeniu pliku
+        suffix = Path(filename).suffix.lower()
+        if suffix == '.csv':
+            return FileOperations.iter_csv(filename)
+        if suffix in ('.jsonl', '.ndjson'):
+            return FileOperations.iter_json_lines(filename)
+        if suffix == '.json':
+            return FileOperations.iter_json(filename)
+        raise WrongFileLoading(f"Nieobsługiwany format importu: {suffix or filename}")
+
+    @staticmethod
+    def export_movies(
+        movies: Iterable[Movie],
+        filename: Union[str, Path],
+        format_chunk: Callable[[List[Movie]], str],
+        header: str = "",
+        codec: Optional[Union[str, Codec]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None
+    ) -> Path:
+        # filmy pobierane z iteratora paczkami; każda paczka to jeden napis i jeden zapis do pliku
+        # (przez kodek kompresji). Plik powstaje pod nazwą tymczasową i podmienia docelowy dopiero
+        # po zapisaniu całości - przerwany albo anulowany eksport nie zostawia połowy pliku.
+        if codec is None:
+            codec = codec_for(filename)
+        elif isinstance(codec, str):
+            codec = get_codec(codec)
+        filename = compressed_name(filename, codec)
+        tmp_file = filename.with_name(filename.name + ".tmp")
+        written = 0
+        try:
+            with open(tmp_file, 'wb') as f:
+                stream = codec.wrap(f)
+                try:
+                    if header:
+                        stream.write(header.encode('utf-8'))
+                    iterator = iter(movies)
+                    while True:
+                        if cancelled is not None and cancelled():
+                            raise ExportCancelled(str(filename))
+                        chunk = list(islice(iterator, chunk_size))
+                        if not chunk:
+                            break
+                        stream.write(format_chunk(chunk).encode('utf-8'))
+                        written += len(chunk)
+                        if progress is not None:
+                            progress(written)
+                finally:
+                    if stream is not f:
+                        stream.close()
+            os.replace(tmp_file, filename)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        return filename
+
+    @staticmethod
+    def csv_chunk(movies: List[Movie]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            (movie.title, movie.director, movie.year, movie.genre, movie.status, movie.rating, movie.description)
+            for movie in movies
+        )
+        return buffer.getvalue()
+
+    @staticmethod
+    def txt_chunk(movies: List[Movie]) -> str:
+        return "".join(
+            f"Tytuł: {movie.title}\n"
+            f"Reżyser: {movie.director}\n"
+            f"Rok: {movie.year}\n"
+            f"Gatunek: {movie.genre}\n"
+            f"Status: {movie.status}\n"
+            f"Ocena: {movie.rating}\n"
+            f"Opis: {movie.description}\n"
+            f"Data obejrzenia: {movie.watch_date}\n"
+            + "-" * 40 + "\n"
+            for movie in movies
+        )
+
+    @staticmethod
+    def export_to_csv(movies: Iterable[Movie], filename: Union[str, Path], **options: Any) -> Path:
+        # options: codec, chunk_size, progress, cancelled - jak w export_movies
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(['Tytuł', 'Reżyser', 'Rok', 'Gatunek', 'Status', 'Ocena', 'Opis'])
+        try:
+            return FileOperations.export_movies(movies, filename, FileOperations.csv_chunk,
+                                                header=buffer.getvalue(), **options)
+        except (OSError, ValueError, csv.Error) as e:
             raise WrongFileLoading(f"Błąd podczas eksportu do CSV: {e}")
 
     @staticmethod
-    def export_to_txt(movies: List[Movie], filename: str) -> None:
+    def export_to_txt(movies: Iterable[Movie], filename: Union[str, Path], **options: Any) -> Path:
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                for movie in movies:
-                    f.write(f"Tytuł: {movie.title}\n")
-                    f.write(f"Reżyser: {movie.director}\n")
-                    f.write(f"Rok: {movie.year}\n")
-                    f.write(f"Gatunek: {movie.genre}\n")
-                    f.write(f"Status: {movie.status}\n")
-                    f.write(f"Ocena: {movie.rating}\n")
-                    f.write(f"Opis: {movie.description}\n")
-                    f.write(f"Data obejrzenia: {movie.watch_date}\n")
-                    f.write("-" * 40 + "\n")
-        except Exception as e:
+            return FileOperations.export_movies(movies, filename, FileOperations.txt_chunk, **options)
+        except (OSError, ValueError) as e:
             raise WrongFileLoading(f"Błąd podczas eksportu do TXT: {e}")
@@ -0,0 +1,71 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+
+# dziennik zmian w formacie JSON Lines - jeden rekord na linię, tylko dopisywanie
+class Journal:
+    def __init__(self, path: Union[str, Path], fsync: bool = True) -> None:
+        self.path: Path = Path(path)
+        self.rotated_path: Path = self.path.with_name(self.path.name + ".compacting")
+        self.fsync: bool = fsync
+
+    def append(self, record: Dict[str, Any]) -> int:
+        return self.append_many((record,))
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        # paczka rekordów (np. import) - jeden zapis i jedno fsync zamiast jednego na rekord
+        lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+        data = lines.encode("utf-8")
+        with open(self.path, "a+b") as f:
+            # po awarii plik może kończyć się urwanym rekordem - nowy zaczynamy od nowej linii,
+            # inaczej skleiłby się z urwanym i przepadł przy odczycie
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            return f.tell()
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def rotate(self) -> Optional[Path]:
+        # przenosi bieżący dziennik na bok, nowe rekordy trafiają do pustego pliku
+        if self.rotated_path.exists() or not self.path.exists():
+            return None
+        os.replace(self.path, self.rotated_path)
+        return self.rotated_path
+
+    def pending_files(self) -> Iterator[Path]:
+        # kolejność ma znaczenie: najpierw dziennik w trakcie kompaktowania, potem bieżący
+        for path in (self.rotated_path, self.path):
+            if path.exists():
+                yield path
+
+    def clear(self) -> None:
+        for path in (self.rotated_path, self.path):
+            if path.exists():
+                os.remove(path)
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        # odczyt binarny - urwany rekord może kończyć się w połowie znaku UTF-8
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # rekord urwany przez awarię nie został potwierdzony (brak fsync) - pomijamy
+                    # tylko jego, rekordy dopisane po ponownym uruchomieniu są w kolejnych liniach
+                    print(f"Pominięto uszkodzony rekord dziennika {path}")
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+_WHITESPACE = " \t\n\r"
+_SEPARATORS = _WHITESPACE + ",]"
+
+
+def iter_json_array(filename: Union[str, Path], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    # Zwraca kolejne elementy tablicy JSON zapisanej w pliku, wczytując go kawałkami.
+    # W pamięci jest naraz co najwyżej jeden element i jeden fragment pliku.
+    decoder = json.JSONDecoder()
+    with open(filename, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+        expect_value = True
+        after_comma = False
+
+        def read_more(size: int) -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                if not read_more(chunk_size):
+                    raise json.JSONDecodeError("Niekompletna tablica JSON", buffer, pos)
+                continue
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise json.JSONDecodeError("Oczekiwano tablicy JSON", buffer, pos)
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                if after_comma:
+                    raise json.JSONDecodeError("Przecinek przed ']'", buffer, pos)
+                # jak json.load: po tablicy mogą być już tylko białe znaki
+                pos += 1
+                while True:
+                    rest = buffer[pos:].lstrip(_WHITESPACE)
+                    if rest:
+                        raise json.JSONDecodeError("Dane po zakończeniu tablicy", buffer, len(buffer) - len(rest))
+                    pos = len(buffer)
+                    if not read_more(chunk_size):
+                        return
+            if char == ",":
+                if expect_value:
+                    raise json.JSONDecodeError("Nieoczekiwany przecinek", buffer, pos)
+                expect_value = True
+                after_comma = True
+                pos += 1
+                continue
+            if not expect_value:
+                raise json.JSONDecodeError("Oczekiwano ',' lub ']'", buffer, pos)
+
+            size = chunk_size
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # liczba mogła zostać ucięta na granicy fragmentu ("-1." z "-1.5") -
+                    # element jest kompletny dopiero, gdy za nim stoi separator
+                    if eof or (end < len(buffer) and buffer[end] in _SEPARATORS):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # element nie mieści się w buforze - dokładamy coraz większe fragmenty
+                if not read_more(size):
+                    continue
+                size *= 2
+
+            pos = end
+            expect_value = False
+            after_comma = False
+            yield value
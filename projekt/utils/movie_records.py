@@ -0,0 +1,124 @@
+import json
+import math
+import struct
+from typing import BinaryIO, Iterable, Iterator
+
+from exceptions.exceptions import WrongFileLoading
+from models.movie import Movie
+
+# Zwarty zapis binarny filmów (plik .movies):
+#   nagłówek (MAGIC, wersja) | rekord | rekord | ...
+# Rekord to długość (uint32) i treść: stała część (długości napisów, rok, ocena, flagi)
+# oraz napisy UTF-8 jeden za drugim. Długość przed każdym rekordem pozwala czytać plik
+# strumieniowo, pomijać rekordy i dopisywać nowe na końcu.
+MAGIC = b"MOVIEREC"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sH")
+LENGTH = struct.Struct("<I")
+# długości: id, tytuł, reżyser, gatunek, status, opis, data obejrzenia, rok (tekst), komentarze (JSON)
+RECORD = struct.Struct("<9IidB")
+STRINGS = 9
+
+YEAR_IS_INT = 1
+HAS_RATING = 2
+# rok całkowity spoza zakresu int32 - zapisany jako tekst, odczytywany z powrotem jako int
+YEAR_INT_AS_TEXT = 4
+YEAR_MIN, YEAR_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def encode_movie(movie: Movie) -> bytes:
+    year = movie.year
+    flags = 0
+    year_text = ""
+    if type(year) is int and YEAR_MIN <= year <= YEAR_MAX:
+        flags |= YEAR_IS_INT
+    elif type(year) is int:
+        flags |= YEAR_INT_AS_TEXT
+        year_text, year = str(year), 0
+    else:
+        # rok z formularza bywa napisem - zapisujemy go bez zmian
+        year_text, year = "" if year is None else str(year), 0
+    rating = movie.rating
+    if rating is not None and rating != "":
+        flags |= HAS_RATING
+        try:
+            rating = float(rating)
+        except (TypeError, ValueError):
+            raise WrongFileLoading(f"Nie można zapisać filmu '{movie.title}': ocena {rating!r} nie jest liczbą")
+    else:
+        rating = math.nan
+    strings = [
+        s.encode("utf-8") for s in (
+            movie.id, movie.title, movie.director or "", movie.genre or "", movie.status or "",
+            movie.description or "", movie.watch_date or "", year_text,
+            json.dumps(movie.comments, ensure_ascii=False, separators=(",", ":")) if movie.has_comments else ""
+        )
+    ]
+    try:
+        body = RECORD.pack(*map(len, strings), year, rating, flags) + b"".join(strings)
+    except struct.error as e:
+        raise WrongFileLoading(f"Nie można zapisać filmu '{movie.title}': {e}")
+    return LENGTH.pack(len(body)) + body
+
+
+def decode_movie(body: bytes) -> Movie:
+    *lengths, year, rating, flags = RECORD.unpack_from(body, 0)
+    offset = RECORD.size
+    strings = []
+    for length in lengths:
+        strings.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    movie_id, title, director, genre, status, description, watch_date, year_text, comments = strings
+    if flags & YEAR_INT_AS_TEXT:
+        year = int(year_text)
+    elif not flags & YEAR_IS_INT:
+        year = year_text
+    movie = Movie(
+        title, director, year, genre, status,
+        rating if flags & HAS_RATING else None, description, watch_date, movie_id=movie_id
+    )
+    movie.comments = json.loads(comments) if comments else None
+    return movie
+
+
+def write_header(f: BinaryIO) -> None:
+    f.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+
+def write_movies(f: BinaryIO, movies: Iterable[Movie], chunk_size: int = 1000) -> int:
+    # rekordy łączone w paczki - jeden zapis na paczkę
+    count = 0
+    chunk = []
+    for movie in movies:
+        chunk.append(encode_movie(movie))
+        if len(chunk) >= chunk_size:
+            f.write(b"".join(chunk))
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        f.write(b"".join(chunk))
+        count += len(chunk)
+    return count
+
+
+def read_movies(f: BinaryIO) -> Iterator[Movie]:
+    try:
+        magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+    except struct.error:
+        raise WrongFileLoading("Plik jest pusty albo uszkodzony")
+    if magic != MAGIC or version != VERSION:
+        raise WrongFileLoading("Nieobsługiwany format pliku filmów")
+    while True:
+        prefix = f.read(LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) < LENGTH.size:
+            raise WrongFileLoading("Niekompletny rekord na końcu pliku")
+        (length,) = LENGTH.unpack(prefix)
+        body = f.read(length)
+        if len(body) < length:
+            raise WrongFileLoading("Niekompletny rekord na końcu pliku")
+        try:
+            yield decode_movie(body)
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise WrongFileLoading(f"Uszkodzony rekord filmu: {e}")
@@ -0,0 +1,255 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Collection, Dict, Hashable, Iterable, List, Optional
+
+from exceptions.exceptions import SearchCancelled
+from models.movie import Movie
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class SearchEngine:
+    # waga pola - dopasowanie w tytule liczy się bardziej niż w opisie
+    FIELD_WEIGHTS: Dict[str, float] = {
+        "title": 5.0,
+        "director": 3.0,
+        "genre": 2.0,
+        "description": 1.0,
+        "comments": 0.5,
+    }
+    EXACT_BONUS: float = 2.0
+    # co ile dokumentów/tokenów sprawdzamy, czy wyszukiwanie nie zostało anulowane
+    CANCEL_CHECK_EVERY: int = 512
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_tokens: Dict[Hashable, Dict[str, float]] = {}
+        self._doc_order: Dict[Hashable, int] = {}
+        self._documents: Dict[Hashable, Any] = {}
+        self._vocabulary: List[str] = []
+        self._counter: int = 0
+        # suma długości list dokumentów - średnia liczba tokenów dokumentu do szacowania kosztu zawężania
+        self._postings_total: int = 0
+        # wyszukiwanie może działać w wątku roboczym, a indeks jest zmieniany z wątku GUI
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def tokenize(text: Any) -> List[str]:
+        if not text:
+            return []
+        return _TOKEN_RE.findall(str(text).casefold())
+
+    @staticmethod
+    def movie_fields(movie: Movie) -> Dict[str, str]:
+        return {
+            "title": movie.title,
+            "director": movie.director,
+            "genre": movie.genre,
+            "description": movie.description,
+            "comments": " ".join(c.get("comment", "") for c in movie.comments) if movie.has_comments else "",
+        }
+
+    @staticmethod
+    def sample_fields(data: Dict[str, Any]) -> Dict[str, str]:
+        comments = data.get("comments") or []
+        return {
+            "title": data.get("title", ""),
+            "director": data.get("director", ""),
+            "genre": data.get("genre", ""),
+            "description": data.get("description", ""),
+            "comments": " ".join(c.get("comment", "") for c in comments),
+        }
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_tokens
+
+    def get(self, doc_id: Hashable) -> Any:
+        return self._documents.get(doc_id)
+
+    def add(self, doc_id: Hashable, fields: Dict[str, str], document: Any = None) -> None:
+        with self._lock:
+            if doc_id in self._doc_tokens:
+                self.remove(doc_id)
+
+            weights: Dict[str, float] = {}
+            for field, text in fields.items():
+                weight = self.FIELD_WEIGHTS.get(field, 1.0)
+                for token in set(self.tokenize(text)):
+                    weights[token] = weights.get(token, 0.0) + weight
+
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    insort(self._vocabulary, token)
+                postings[doc_id] = weight
+
+            self._doc_tokens[doc_id] = weights
+            self._postings_total += len(weights)
+            self._documents[doc_id] = document
+            self._doc_order[doc_id] = self._counter
+            self._counter += 1
+
+    def update(self, doc_id: Hashable, fields: Dict[str, str], document: Any = None) -> None:
+        with self._lock:
+            order = self._doc_order.get(doc_id)
+            self.add(doc_id, fields, document)
+            if order is not None:
+                self._doc_order[doc_id] = order
+
+    def remove(self, doc_id: Hashable) -> None:
+        with self._lock:
+            weights = self._doc_tokens.pop(doc_id, None)
+            if weights is None:
+                return
+            self._postings_total -= len(weights)
+            self._doc_order.pop(doc_id, None)
+            self._documents.pop(doc_id, None)
+            for token in weights:
+                postings = self._postings[token]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[token]
+                    del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._doc_tokens.clear()
+            self._doc_order.clear()
+            self._documents.clear()
+            self._vocabulary.clear()
+            self._counter = 0
+            self._postings_total = 0
+
+    def add_movie(self, movie: Movie) -> None:
+        self.add(movie.id, self.movie_fields(movie), movie)
+
+    def update_movie(self, movie: Movie) -> None:
+        self.update(movie.id, self.movie_fields(movie), movie)
+
+    def remove_movie(self, movie: Movie) -> None:
+        self.remove(movie.id)
+
+    def index_movies(self, movies: Iterable[Movie]) -> None:
+        for movie in movies:
+            self.add_movie(movie)
+
+    def _expand(self, term: str) -> Iterable[str]:
+        start = bisect_left(self._vocabulary, term)
+        for i in range(start, len(self._vocabulary)):
+            token = self._vocabulary[i]
+            if not token.startswith(term):
+                break
+            yield token
+
+    # Wyszukiwanie nie trzyma blokady przez całe zapytanie: pod blokadą są tylko krótkie odczyty
+    # (tokeny z prefiksem, kopia listy dokumentów tokenu, porcja rankingu), a liczenie wyników
+    # już bez niej - add/update/remove z wątku GUI nie czekają na koniec wyszukiwania.
+
+    def _score_term(self, term: str, candidates: Optional[Collection[Hashable]],
+                    cancelled: Optional[Callable[[], bool]] = None) -> Dict[Hashable, float]:
+        with self._lock:
+            tokens = list(self._expand(term))
+        scores: Dict[Hashable, float] = {}
+        for i, token in enumerate(tokens):
+            if cancelled is not None and i % self.CANCEL_CHECK_EVERY == 0 and cancelled():
+                raise SearchCancelled(term)
+            with self._lock:
+                postings = self._postings.get(token)
+                postings = postings.copy() if postings is not None else {}
+            bonus = self.EXACT_BONUS if token == term else 1.0
+            for doc_id, weight in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                score = weight * bonus
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def _score_docs(self, term: str, candidates: Iterable[Hashable],
+                    cancelled: Optional[Callable[[], bool]] = None) -> Dict[Hashable, float]:
+        # zawężanie: zamiast list dokumentów tokenu przeglądamy tokeny wskazanych dokumentów;
+        # słownik tokenów dokumentu nie zmienia się po dodaniu (update wstawia nowy), więc bez blokady
+        scores: Dict[Hashable, float] = {}
+        for i, doc_id in enumerate(candidates):
+            if cancelled is not None and i % self.CANCEL_CHECK_EVERY == 0 and cancelled():
+                raise SearchCancelled(term)
+            weights = self._doc_tokens.get(doc_id)
+            if weights is None:
+                continue
+            best = 0.0
+            for token, weight in weights.items():
+                if token.startswith(term):
+                    score = weight * (self.EXACT_BONUS if token == term else 1.0)
+                    if score > best:
+                        best = score
+            if best:
+                scores[doc_id] = best
+        return scores
+
+    def _score_within(self, term: str, within: Collection[Hashable],
+                      cancelled: Optional[Callable[[], bool]]) -> Dict[Hashable, float]:
+        # przeglądanie dokumentów opłaca się tylko, gdy jest ich mało w porównaniu z listami tokenu
+        with self._lock:
+            scan_cost = len(within) * self._postings_total / max(len(self._doc_tokens), 1)
+            postings_cost = sum(len(self._postings[token]) for token in self._expand(term))
+        if scan_cost < postings_cost:
+            return self._score_docs(term, within, cancelled)
+        return self._score_term(term, within if isinstance(within, (set, dict)) else set(within), cancelled)
+
+    def _rank_keys(self, totals: Dict[Hashable, float],
+                   cancelled: Optional[Callable[[], bool]]) -> Dict[Hashable, tuple]:
+        # klucze rankingu porcjami pod blokadą; dokumenty usunięte w trakcie wyszukiwania odpadają
+        keys: Dict[Hashable, tuple] = {}
+        items = list(totals.items())
+        for start in range(0, len(items), self.CANCEL_CHECK_EVERY):
+            if cancelled is not None and cancelled():
+                raise SearchCancelled()
+            with self._lock:
+                order = self._doc_order
+                for doc_id, score in items[start:start + self.CANCEL_CHECK_EVERY]:
+                    position = order.get(doc_id)
+                    if position is not None:
+                        keys[doc_id] = (-score, position)
+        return keys
+
+    def search(self, query: str, limit: Optional[int] = None, within: Optional[Collection[Hashable]] = None,
+               cancelled: Optional[Callable[[], bool]] = None) -> List[Hashable]:
+        # within - szukaj tylko wśród tych dokumentów (np. wyników krótszego zapytania);
+        # cancelled - sprawdzane w trakcie, True przerywa wyszukiwanie wyjątkiem SearchCancelled
+        terms = self.tokenize(query)
+        if not terms:
+            with self._lock:
+                order = self._doc_order
+                order = dict(order) if within is None else {d: order[d] for d in within if d in order}
+            results = sorted(order, key=order.__getitem__)
+            return results[:limit] if limit is not None else results
+
+        # najpierw najrzadszy termin, żeby kolejne przecinały jak najmniejszy zbiór
+        with self._lock:
+            terms = sorted(set(terms), key=lambda t: len(self._postings.get(t, ())))
+
+        totals: Optional[Dict[Hashable, float]] = None
+        for term in terms:
+            candidates = totals if totals is not None else within
+            if candidates is None:
+                scores = self._score_term(term, None, cancelled)
+            else:
+                scores = self._score_within(term, candidates, cancelled)
+            if not scores:
+                return []
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc_id: totals[doc_id] + score for doc_id, score in scores.items()}
+
+        keys = self._rank_keys(totals, cancelled)
+        if limit is not None:
+            return heapq.nsmallest(limit, keys, key=keys.__getitem__)
+        return sorted(keys, key=keys.__getitem__)
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Collection, Deque, Dict, Hashable, List, NamedTuple, Optional
+
+from exceptions.exceptions import SearchCancelled
+from utils.search_engine import SearchEngine
+
+# search(query, within, cancelled) -> wyniki; within to wyniki poprzedniego zapytania albo None
+SearchFunction = Callable[[str, Optional[Collection[Hashable]], Callable[[], bool]], List[Hashable]]
+
+
+class SearchMetrics(NamedTuple):
+    query: str
+    latency_ms: float     # od zlecenia do wyniku (z czasem oczekiwania w kolejce)
+    run_ms: float         # samo wyszukiwanie
+    candidates: int       # liczba przeszukanych dokumentów przy zawężaniu, -1 = cały indeks
+    results: int
+    cancelled: bool
+
+
+# Wyszukiwanie w tle dla pola "szukaj podczas pisania". Każde nowe zapytanie unieważnia
+# poprzednie (czekające nie startuje, trwające przerywa się przy najbliższym sprawdzeniu),
+# a zapytanie, które tylko wydłuża poprzednie, przeszukuje jego wyniki zamiast całego indeksu.
+class SearchPipeline:
+    def __init__(self, search: SearchFunction, history_size: int = 200) -> None:
+        self._search = search
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._generation: int = 0
+        self._pending: Optional[Future] = None
+        # ostatnie ukończone zapytanie - baza do zawężania
+        self._last_query: Optional[str] = None
+        self._last_results: Optional[List[Hashable]] = None
+
+        self.metrics: Deque[SearchMetrics] = deque(maxlen=history_size)
+        self.completed: int = 0
+        self.cancelled: int = 0
+        self.refined: int = 0
+
+    @staticmethod
+    def refines(previous: Optional[str], query: str) -> bool:
+        # dopisanie znaków na końcu tylko zawęża wynik: ostatni termin staje się dłuższy
+        # (mniej tokenów pasuje jako prefiks) albo dochodzi nowy termin (kolejny warunek AND)
+        if previous is None or not SearchEngine.tokenize(previous):
+            return False
+        return query.casefold().startswith(previous.casefold())
+
+    def submit(self, query: str) -> Future:
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._pending is not None and self._pending.cancel():
+                self.cancelled += 1
+            future = self._executor.submit(self._run, generation, query, time.perf_counter())
+            self._pending = future
+            return future
+
+    def cancel(self) -> None:
+        # np. pole wyczyszczone - żaden czekający ani trwający wynik nie jest już potrzebny
+        with self._lock:
+            self._generation += 1
+            if self._pending is not None and self._pending.cancel():
+                self.cancelled += 1
+            self._pending = None
+
+    def invalidate(self) -> None:
+        # dane się zmieniły - poprzednie wyniki nie mogą służyć do zawężania
+        with self._lock:
+            self._last_query = None
+            self._last_results = None
+
+    def _run(self, generation: int, query: str, submitted: float) -> List[Hashable]:
+        cancelled = lambda: generation != self._generation
+        started = time.perf_counter()
+        with self._lock:
+            within = self._last_results if self.refines(self._last_query, query) else None
+        try:
+            if cancelled():
+                raise SearchCancelled(query)
+            results = self._search(query, within, cancelled)
+        except SearchCancelled:
+            self._record(query, submitted, started, within, 0, True)
+            raise
+        with self._lock:
+            if generation != self._generation:
+                stale = True
+            else:
+                stale = False
+                self._last_query = query
+                self._last_results = results
+        self._record(query, submitted, started, within, len(results), stale)
+        if stale:
+            raise SearchCancelled(query)
+        return results
+
+    def _record(self, query: str, submitted: float, started: float, within: Optional[Collection[Hashable]],
+                results: int, cancelled: bool) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            self.metrics.append(SearchMetrics(
+                query=query,
+                latency_ms=(finished - submitted) * 1000,
+                run_ms=(finished - started) * 1000,
+                candidates=len(within) if within is not None else -1,
+                results=results,
+                cancelled=cancelled,
+            ))
+            if cancelled:
+                self.cancelled += 1
+            else:
+                self.completed += 1
+                if within is not None:
+                    self.refined += 1
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            latencies = sorted(m.latency_ms for m in self.metrics if not m.cancelled)
+            summary: Dict[str, float] = {
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "refined": self.refined,
+            }
+        if latencies:
+            summary["mean_ms"] = sum(latencies) / len(latencies)
+            summary["p50_ms"] = latencies[len(latencies) // 2]
+            summary["p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            summary["max_ms"] = latencies[-1]
+        return summary
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
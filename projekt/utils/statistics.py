@@ -1,108 +1,56 @@
-from typing import Optional, List
+from typing import Optional, List, Union
 from matplotlib.figure import Figure
-from collections import Counter
-from matplotlib import pyplot as plt
 
 from models.user import User
 from models.movie import Movie
+from models.movie_collection import MovieCollection
+from utils.charts import GenreChart, RatingsChart, StatusChart, TopRatedChart
+from utils.stats_aggregator import StatsAggregator
 
-class Statistics:
-
-    @staticmethod
-    def plot_ratings_per_movie(user: User) -> Figure:
-        watched: List[Movie] = [m for m in user.movies if m.status.lower().startswith("obejrzano") and m.rating is not None]
-        titles: List[str] = [m.title for m in watched]
-        ratings: List[float] = [float(m.rating) for m in watched]
+# wykresy przyjmują użytkownika albo (bez przeliczania) agregaty utrzymywane przez MovieManager.stats;
+# GUI trzyma własne obiekty z utils.charts i aktualizuje je w miejscu
+MovieSource = Union[User, StatsAggregator]
 
-        fig, ax = plt.subplots()
-        if titles:
-            ax.barh(titles, ratings, color="#4CAF50")
-            ax.set_xlabel("Ocena")
-            ax.set_title("Oceny obejrzanych filmów")
-        else:
-            ax.text(0.5, 0.5, "Brak ocenionych obejrzanych filmów", ha="center", va="center", transform=ax.transAxes)
-            ax.axis("off")
 
-        plt.close(fig)
-        return fig
+class Statistics:
 
     @staticmethod
-    def plot_movies_by_genre(user: User) -> Figure:
-        genres: List[str] = [m.genre for m in user.movies if m.genre]
-        count: Counter = Counter(genres)
-
-        fig, ax = plt.subplots()
-        if count:
-            ax.pie(count.values(), labels=count.keys(), autopct="%1.1f%%", startangle=140)
-            ax.set_title("Filmy wg gatunku")
-        else:
-            ax.text(0.5, 0.5, "Brak danych o gatunkach", ha="center", va="center", transform=ax.transAxes)
-            ax.axis("off")
-        plt.close(fig)
-        return fig
+    def _aggregates(source: MovieSource) -> StatsAggregator:
+        if isinstance(source, StatsAggregator):
+            return source
+        return StatsAggregator(MovieCollection(source.movies))
 
     @staticmethod
-    def plot_watched_vs_unwatched(user: User) -> Figure:
-        watched: int = sum(1 for m in user.movies if m.status.lower() == "obejrzano")
-        unwatched: int = sum(1 for m in user.movies if m.status.lower() != "obejrzano")
-
-        fig, ax = plt.subplots()
-        ax.bar(["Obejrzane", "Do obejrzenia"], [watched, unwatched], color=["#2196F3", "#FFC107"])
-        ax.set_title("Status filmów")
-        ax.set_ylabel("Liczba filmów")
-        plt.close(fig)
-        return fig
+    def plot_ratings_per_movie(source: MovieSource) -> Figure:
+        return RatingsChart().update(Statistics._aggregates(source)).figure
 
     @staticmethod
-    def plot_top_rated_text(user: User) -> Figure:
-        rated: List[Movie] = [m for m in user.movies if m.rating is not None]
-        fig, ax = plt.subplots(figsize=(6, 3))
+    def plot_movies_by_genre(source: MovieSource) -> Figure:
+        return GenreChart().update(Statistics._aggregates(source)).figure
 
-        if rated:
-            top_movies = sorted(rated, key=lambda m: float(m.rating), reverse=True)[:3]
-            lines = [
-                f"{i + 1}. {m.title} ({m.year}) – {m.rating}/10"
-                for i, m in enumerate(top_movies)
-            ]
-            msg = "Top 3 filmy:\n" + "\n".join(lines)
-        else:
-            msg = "Brak filmów z oceną"
+    @staticmethod
+    def plot_watched_vs_unwatched(source: MovieSource) -> Figure:
+        return StatusChart().update(Statistics._aggregates(source)).figure
 
-        ax.text(0.5, 0.5, msg, ha="center", va="center", fontsize=12, wrap=True, transform=ax.transAxes)
-        ax.axis("off")
-        plt.tight_layout()
-        plt.close(fig)
-        plt.close(fig)
-        return fig
+    @staticmethod
+    def plot_top_rated_text(source: MovieSource) -> Figure:
+        return TopRatedChart().update(Statistics._aggregates(source)).figure
 
     @staticmethod
-    def get_top_rated_movie(user: User) -> Optional[Movie]:
-        rated: List[Movie] = [m for m in user.movies if m.rating is not None]
-        if not rated:
-            return None
-        return max(rated, key=lambda m: float(m.rating))
+    def get_top_rated_movie(source: MovieSource) -> Optional[Movie]:
+        top_movies: List[Movie] = Statistics._aggregates(source).top_rated(1)
+        return top_movies[0] if top_movies else None
 
     @staticmethod
-    def get_top_rated_movies_summary(user: User, top_n: int = 3) -> str:
-        rated: List[Movie] = [m for m in user.movies if m.rating is not None]
-        if not rated:
+    def get_top_rated_movies_summary(source: MovieSource, top_n: int = 3) -> str:
+        top_movies: List[Movie] = Statistics._aggregates(source).top_rated(top_n)
+        if not top_movies:
             return "Brak ocenionych filmów"
 
-        top_movies = sorted(rated, key=lambda m: float(m.rating), reverse=True)[:top_n]
-
         lines = [f"{i + 1}. {m.title} ({m.year}) – {m.rating}/10" for i, m in enumerate(top_movies)]
         summary = "Top najwyżej oceniane filmy:\n" + "\n".join(lines)
         return summary
 
     @staticmethod
-    def get_average_rating(user: User) -> Optional[float]:
-        ratings = [float(m.rating) for m in user.movies if m.rating is not None]
-        if not ratings:
-            return None
-        return sum(ratings) / len(ratings)
-
-
-
-
-
-
+    def get_average_rating(source: MovieSource) -> Optional[float]:
+        return Statistics._aggregates(source).average_rating()
@@ -0,0 +1,103 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.movie import Movie
+from models.movie_collection import STATUS_WATCHED, CollectionListener, MovieCollection, RowValues
+
+
+# Agregaty statystyk aktualizowane przy każdej zmianie kolekcji zamiast liczenia od zera:
+# suma i liczba ocen, liczniki gatunków i statusów oraz posortowany ranking ocen.
+class StatsAggregator(CollectionListener):
+    def __init__(self, collection: MovieCollection) -> None:
+        self.collection: MovieCollection = collection
+        self.rating_sum: float = 0.0
+        self.rating_count: int = 0
+        self.genres: Counter = Counter()
+        self.watched: int = 0
+        self.total: int = 0
+        # ranking: (-ocena, numer kolejny, film); numer zachowuje kolejność z listy przy remisach
+        self._top: List[Tuple[float, int, Movie]] = []
+        self._order: Dict[int, int] = {}
+        self._sequence = count()
+        collection.subscribe(self)
+
+    # --- obserwator kolekcji ---
+
+    def collection_reset(self, collection: MovieCollection) -> None:
+        # pełne przeliczenie (wczytanie kolekcji) - wektorowo na kolumnach NumPy
+        movies = collection.movies
+        ratings = collection.ratings
+        rated = np.flatnonzero(collection.rated_mask())
+        self.rating_sum = float(ratings[rated].sum())
+        self.rating_count = int(rated.size)
+        self.genres = Counter(collection.genre_counts())
+        self.watched = collection.watched_count()
+        self.total = len(collection)
+        # numer kolejny = pozycja na liście, więc remisy w rankingu zachowują kolejność listy
+        self._order = {id(movie): row for row, movie in enumerate(movies)}
+        self._sequence = count(self.total)
+        ranking = rated[np.argsort(-ratings[rated], kind="stable")]
+        rows = ranking.tolist()
+        self._top = list(zip((-ratings[ranking]).tolist(), rows, [movies[row] for row in rows]))
+
+    def collection_changed(self, old: Optional[RowValues], new: Optional[RowValues], row: int) -> None:
+        order = None
+        if old is not None:
+            order = self._remove(old)
+        if new is not None:
+            self._add(new, order)
+
+    def _add(self, values: RowValues, order: Optional[int]) -> None:
+        if order is None:
+            order = next(self._sequence)
+        self._order[id(values.movie)] = order
+        self.total += 1
+        if values.status == STATUS_WATCHED:
+            self.watched += 1
+        if values.genre:
+            self.genres[values.genre] += 1
+        if values.rating is not None:
+            self.rating_sum += values.rating
+            self.rating_count += 1
+            insort(self._top, (-values.rating, order, values.movie))
+
+    def _remove(self, values: RowValues) -> int:
+        order = self._order.pop(id(values.movie))
+        self.total -= 1
+        if values.status == STATUS_WATCHED:
+            self.watched -= 1
+        if values.genre:
+            self.genres[values.genre] -= 1
+            if not self.genres[values.genre]:
+                del self.genres[values.genre]
+        if values.rating is not None:
+            self.rating_sum -= values.rating
+            self.rating_count -= 1
+            del self._top[bisect_left(self._top, (-values.rating, order))]
+            if not self.rating_count:
+                # brak ocen - zerujemy sumę, żeby nie zostawał błąd zaokrągleń
+                self.rating_sum = 0.0
+        return order
+
+    # --- odczyt ---
+
+    def average_rating(self) -> Optional[float]:
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def genre_counts(self) -> Dict[str, int]:
+        return dict(self.genres)
+
+    def watched_count(self) -> int:
+        return self.watched
+
+    def unwatched_count(self) -> int:
+        return self.total - self.watched
+
+    def top_rated(self, n: int = 3) -> List[Movie]:
+        return [movie for _, _, movie in self._top[:n]]
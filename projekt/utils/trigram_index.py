@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from exceptions.exceptions import WrongFileLoading
+
+# litery, których NFKD nie rozkłada na literę bazową + znak diakrytyczny
+_EXTRA_FOLD = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss"})
+
+
+class TrigramIndex:
+    FORMAT_VERSION: int = 1
+    FIELDS: Tuple[str, ...] = ("title", "director")
+
+    def __init__(self) -> None:
+        # trigram -> lista (numer dokumentu, numer pola)
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        # liczba trigramów w każdym polu każdego dokumentu
+        self._sizes: List[List[int]] = []
+        self.fingerprint: str = ""
+
+    @staticmethod
+    def normalize(text: Any) -> str:
+        text = unicodedata.normalize("NFKD", str(text or "").casefold().translate(_EXTRA_FOLD))
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+    @classmethod
+    def trigrams(cls, text: Any) -> Set[str]:
+        result: Set[str] = set()
+        for word in cls.normalize(text).split():
+            padded = f"  {word} "
+            for i in range(len(padded) - 2):
+                result.add(padded[i:i + 3])
+        return result
+
+    @classmethod
+    def compute_fingerprint(cls, movies: Sequence[Dict[str, Any]]) -> str:
+        digest = hashlib.sha1()
+        for movie in movies:
+            for field in cls.FIELDS:
+                digest.update(str(movie.get(field, "")).encode("utf-8"))
+                digest.update(b"\x1f")
+            digest.update(b"\x1e")
+        return digest.hexdigest()
+
+    @classmethod
+    def catalogue_fingerprint(cls, movies: Sequence[Dict[str, Any]]) -> str:
+        # BinaryCatalogue podaje własny skrót (z bajtów rekordów) - sprawdzenie aktualności
+        # zapisanego indeksu nie dekoduje drugi raz całego katalogu
+        fingerprint = getattr(movies, "fingerprint", None)
+        return fingerprint() if callable(fingerprint) else cls.compute_fingerprint(movies)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def build(self, movies: Sequence[Dict[str, Any]]) -> None:
+        self._postings = {}
+        self._sizes = []
+        for doc, movie in enumerate(movies):
+            sizes = []
+            for field_no, field in enumerate(self.FIELDS):
+                grams = self.trigrams(movie.get(field, ""))
+                sizes.append(len(grams))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append((doc, field_no))
+            self._sizes.append(sizes)
+        self.fingerprint = self.catalogue_fingerprint(movies)
+
+    def search(self, query: str, limit: int = 20, threshold: float = 0.3) -> List[Tuple[int, float]]:
+        grams = self.trigrams(query)
+        if not grams:
+            return []
+
+        common: Dict[Tuple[int, int], int] = {}
+        for gram in grams:
+            for posting in self._postings.get(gram, ()):
+                common[posting] = common.get(posting, 0) + 1
+
+        scores: Dict[int, float] = {}
+        query_size = len(grams)
+        for (doc, field_no), shared in common.items():
+            field_size = self._sizes[doc][field_no]
+            # średnia z podobieństwa Dice'a i stopnia pokrycia zapytania -
+            # krótkie zapytanie wpisane z błędem nadal trafia w długi tytuł
+            dice = 2.0 * shared / (query_size + field_size)
+            coverage = shared / query_size
+            score = (dice + coverage) / 2
+            if score > scores.get(doc, 0.0):
+                scores[doc] = score
+
+        ranked = sorted(
+            ((doc, score) for doc, score in scores.items() if score >= threshold),
+            key=lambda pair: (-pair[1], pair[0])
+        )
+        return ranked[:limit]
+
+    @staticmethod
+    def index_path_for(catalogue_path: Path) -> Path:
+        catalogue_path = Path(catalogue_path)
+        return catalogue_path.with_name(catalogue_path.stem + ".trigrams.json")
+
+    def save(self, filename: Path) -> None:
+        data = {
+            "version": self.FORMAT_VERSION,
+            "fields": list(self.FIELDS),
+            "fingerprint": self.fingerprint,
+            "sizes": self._sizes,
+            "postings": {gram: [doc * len(self.FIELDS) + field_no for doc, field_no in postings]
+                         for gram, postings in self._postings.items()},
+        }
+        tmp_file = f"{filename}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, filename)
+        except OSError as e:
+            raise WrongFileLoading(f"Błąd podczas zapisywania indeksu trigramów: {e}")
+
+    @classmethod
+    def load(cls, filename: Path) -> "TrigramIndex":
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise WrongFileLoading(f"Nie udało się wczytać indeksu trigramów: {e}")
+
+        if data.get("version") != cls.FORMAT_VERSION or tuple(data.get("fields", ())) != cls.FIELDS:
+            raise WrongFileLoading("Nieobsługiwana wersja indeksu trigramów")
+
+        width = len(cls.FIELDS)
+        index = cls()
+        index.fingerprint = data["fingerprint"]
+        index._sizes = data["sizes"]
+        index._postings = {gram: [divmod(code, width) for code in codes]
+                           for gram, codes in data["postings"].items()}
+        return index
+
+    @classmethod
+    def load_or_build(cls, catalogue_path: Path, movies: Sequence[Dict[str, Any]]) -> "TrigramIndex":
+        index_path = cls.index_path_for(catalogue_path)
+        if os.path.exists(index_path):
+            try:
+                index = cls.load(index_path)
+                if index.fingerprint == cls.catalogue_fingerprint(movies):
+                    return index
+            except WrongFileLoading as e:
+                print(f"Indeks trigramów zostanie przebudowany: {e}")
+
+        index = cls()
+        index.build(movies)
+        try:
+            index.save(index_path)
+        except WrongFileLoading as e:
+            print(e)
+        return index
+
+
+if __name__ == "__main__":
+    # Uruchomienie (z katalogu projekt): python -m utils.trigram_index [ścieżka do katalogu]
+    import sys
+
+    from storage.catalogue_file import BinaryCatalogue
+
+    base_dir = Path(__file__).resolve().parent.parent
+    catalogue = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / "data" / "sample_movies.json"
+    # ten sam skrót co przy wczytywaniu w GUI (z pliku .moviecat), więc indeks nie będzie przebudowywany
+    with BinaryCatalogue.open_for(catalogue) as movies:
+        trigram_index = TrigramIndex()
+        trigram_index.build(movies)
+        trigram_index.save(TrigramIndex.index_path_for(catalogue))
+        print(f"Zapisano indeks trigramów dla {len(movies)} filmów do {TrigramIndex.index_path_for(catalogue)}")
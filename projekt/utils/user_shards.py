@@ -0,0 +1,78 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from exceptions.exceptions import WrongFileLoading
+from models.movie import Movie
+
+
+# układ katalogu: index.json (użytkownicy bez filmów) + movies/<id użytkownika>.json
+class UserShardStore:
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory: Path = Path(directory)
+        self.index_file: Path = self.directory / "index.json"
+        self.movies_dir: Path = self.directory / "movies"
+
+    def exists(self) -> bool:
+        return self.index_file.exists()
+
+    def shard_path(self, user_id: str) -> Path:
+        return self.movies_dir / f"{user_id}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: Any) -> None:
+        tmp_file = path.with_name(path.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+    def read_index(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            raise WrongFileLoading(f"Nieprawidłowy format indeksu użytkowników: {e}")
+
+    def write_index(self, user_data: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_atomic(self.index_file, user_data)
+
+    def read_movie_data(self, user_id: str) -> List[Dict[str, Any]]:
+        path = self.shard_path(user_id)
+        if not path.exists():
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            raise WrongFileLoading(f"Nieprawidłowy format kolekcji użytkownika {user_id}: {e}")
+
+    def read_movies(self, user_id: str) -> List[Movie]:
+        return [Movie.from_dict(m) for m in self.read_movie_data(user_id)]
+
+    def write_movie_data(self, user_id: str, movie_data: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.movies_dir, exist_ok=True)
+        self._write_atomic(self.shard_path(user_id), movie_data)
+
+    def write_movies(self, user_id: str, movies: List[Movie]) -> None:
+        self.write_movie_data(user_id, [movie.to_dict() for movie in movies])
+
+    def delete_movies(self, user_id: str) -> None:
+        path = self.shard_path(user_id)
+        if path.exists():
+            os.remove(path)
+
+    def migrate(self, user_data: List[Dict[str, Any]]) -> None:
+        # jednorazowy podział pełnego users.json na indeks i kolekcje użytkowników
+        os.makedirs(self.movies_dir, exist_ok=True)
+        index = []
+        for data in user_data:
+            data = dict(data)
+            movies = data.pop("movies", [])
+            with open(self.shard_path(data["id"]), "w", encoding="utf-8") as f:
+                json.dump(movies, f, ensure_ascii=False, indent=2)
+            index.append(data)
+        self.write_index(index)